@@ -0,0 +1,297 @@
+"""
+Vectorized aggregation of ensemble predictions.
+Stacks ensemble members into NumPy arrays (log-odds for binary questions, a members x options
+probability matrix for multiple choice, a members x percentiles matrix or a members x 201-point
+CDF grid for numeric questions) and pools them in one pass with the mean, median, trimmed mean,
+geometric mean of odds, optionally weighted per member.
+"""
+
+import logging
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from forecasting_tools import NumericDistribution, NumericQuestion, Percentile
+
+logger = logging.getLogger(__name__)
+
+MEAN = "mean"
+MEDIAN = "median"
+TRIMMED_MEAN = "trimmed_mean"
+GEOMETRIC_MEAN_ODDS = "geometric_mean_odds"
+METHODS = (MEAN, MEDIAN, TRIMMED_MEAN, GEOMETRIC_MEAN_ODDS)
+
+STANDARD_PERCENTILES = np.array([0.1, 0.2, 0.4, 0.6, 0.8, 0.9])
+
+# Probabilities are clipped away from 0 and 1 before taking log-odds
+_EPSILON = 1e-6
+
+
+def get_aggregation_method() -> str:
+    """
+    Pooling method for ensemble members, configured by ENSEMBLE_AGGREGATION (default mean).
+    """
+    method = os.getenv('ENSEMBLE_AGGREGATION', MEAN).lower()
+    if method not in METHODS:
+        logger.warning(f"Unknown ENSEMBLE_AGGREGATION '{method}', using {MEAN}")
+        return MEAN
+    return method
+
+
+def get_ensemble_weights(member_keys: Sequence[str]) -> Optional[np.ndarray]:
+    """
+    Per-member weights from ENSEMBLE_WEIGHTS (e.g. "forecaster1=2,forecaster3=0.5").
+
+    Members not listed get weight 1. Returns None when no weights are configured.
+    """
+    configured = os.getenv('ENSEMBLE_WEIGHTS', '').strip()
+    if not configured:
+        return None
+    weights: Dict[str, float] = {}
+    for item in configured.split(','):
+        key, _, value = item.partition('=')
+        try:
+            weights[key.strip()] = float(value)
+        except ValueError:
+            logger.warning(f"Ignoring malformed ENSEMBLE_WEIGHTS entry '{item}'")
+    return np.array([weights.get(key, 1.0) for key in member_keys], dtype=float)
+
+
+def _normalized_weights(count: int, weights: Optional[Sequence[float]]) -> np.ndarray:
+    if weights is None:
+        return np.full(count, 1.0 / count)
+    weights = np.asarray(weights, dtype=float)
+    if weights.shape != (count,) or np.any(weights < 0) or weights.sum() <= 0:
+        raise ValueError(f"Need {count} non-negative weights with a positive sum, got {weights}")
+    return weights / weights.sum()
+
+
+def _logit(probabilities: np.ndarray) -> np.ndarray:
+    clipped = np.clip(probabilities, _EPSILON, 1 - _EPSILON)
+    return np.log(clipped / (1 - clipped))
+
+
+def _sigmoid(log_odds: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-log_odds))
+
+
+def _weighted_median(matrix: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    order = np.argsort(matrix, axis=0)
+    sorted_values = np.take_along_axis(matrix, order, axis=0)
+    cumulative = np.cumsum(weights[order], axis=0)
+    # First member whose cumulative weight reaches half, per column
+    index = np.argmax(cumulative >= 0.5 - 1e-12, axis=0)
+    return sorted_values[index, np.arange(matrix.shape[1])]
+
+
+def _trimmed_mean(matrix: np.ndarray, weights: np.ndarray, trim_fraction: float) -> np.ndarray:
+    count = matrix.shape[0]
+    cut = int(np.floor(count * trim_fraction))
+    if cut == 0 or count - 2 * cut < 1:
+        return weights @ matrix
+    order = np.argsort(matrix, axis=0)[cut:count - cut]
+    kept_values = np.take_along_axis(matrix, order, axis=0)
+    kept_weights = weights[order]
+    return (kept_values * kept_weights).sum(axis=0) / kept_weights.sum(axis=0)
+
+
+def pool(
+    matrix: Any,
+    method: str = MEAN,
+    weights: Optional[Sequence[float]] = None,
+    trim_fraction: float = 0.1,
+) -> np.ndarray:
+    """
+    Pool a members x values matrix column-wise into one row.
+
+    Args:
+        matrix: One row per ensemble member
+        method: One of METHODS; geometric_mean_odds expects probabilities in [0, 1]
+        weights: Optional per-member weights (normalized here)
+        trim_fraction: Share of members dropped at each end for trimmed_mean
+    """
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=float))
+    weights = _normalized_weights(matrix.shape[0], weights)
+    if method == MEAN:
+        return weights @ matrix
+    if method == MEDIAN:
+        return _weighted_median(matrix, weights)
+    if method == TRIMMED_MEAN:
+        return _trimmed_mean(matrix, weights, trim_fraction)
+    if method == GEOMETRIC_MEAN_ODDS:
+        return _sigmoid(weights @ _logit(matrix))
+    raise ValueError(f"Unknown aggregation method '{method}', expected one of {METHODS}")
+
+
+def aggregate_binary(
+    probabilities: Sequence[float],
+    method: Optional[str] = None,
+    weights: Optional[Sequence[float]] = None,
+) -> float:
+    """
+    Pool binary probabilities; median and trimmed mean are taken in log-odds space.
+    """
+    method = method or get_aggregation_method()
+    values = np.asarray(probabilities, dtype=float).reshape(-1, 1)
+    if method in (MEDIAN, TRIMMED_MEAN):
+        return float(_sigmoid(pool(_logit(values), method, weights))[0])
+    return float(pool(values, method, weights)[0])
+
+
+def _normalize_name(name: str) -> str:
+    return re.sub(r'[^\w]+', ' ', str(name)).strip().lower()
+
+
+def option_matrix(predictions: List[Any], options: List[str]) -> np.ndarray:
+    """
+    Members x options probability matrix from dicts or PredictedOptionList objects.
+
+    Option names are matched exactly, then case- and punctuation-insensitively, through one
+    lookup table instead of pairwise substring matching. Unmatched options get 0; rows are
+    renormalized and members with no usable probabilities are dropped.
+    """
+    columns = {option: i for i, option in enumerate(options)}
+    normalized_columns = {_normalize_name(option): i for i, option in enumerate(options)}
+    rows = []
+    for prediction in predictions:
+        if isinstance(prediction, dict):
+            items = prediction.items()
+        elif hasattr(prediction, 'predicted_options'):
+            items = [(o.option_name, o.probability) for o in prediction.predicted_options]
+        else:
+            logger.warning(f"Skipping unsupported multiple choice prediction of type {type(prediction).__name__}")
+            continue
+        row = np.zeros(len(options))
+        for name, probability in items:
+            column = columns.get(name)
+            if column is None:
+                column = normalized_columns.get(_normalize_name(name))
+            if column is not None:
+                row[column] = float(probability)
+        rows.append(row)
+    if not rows:
+        return np.empty((0, len(options)))
+    matrix = np.vstack(rows)
+    totals = matrix.sum(axis=1)
+    matrix = matrix[totals > 0] / totals[totals > 0, None]
+    return matrix
+
+
+def aggregate_multiple_choice(
+    predictions: List[Any],
+    options: List[str],
+    method: Optional[str] = None,
+    weights: Optional[Sequence[float]] = None,
+) -> Dict[str, float]:
+    """
+    Pool multiple choice predictions into {option: probability} summing to 1.
+
+    Falls back to equal probabilities if no prediction is usable.
+    """
+    method = method or get_aggregation_method()
+    matrix = option_matrix(predictions, options)
+    if matrix.shape[0] == 0:
+        return {option: 1.0 / len(options) for option in options}
+    if weights is not None and len(weights) != matrix.shape[0]:
+        logger.warning("Dropping ensemble weights: some multiple choice predictions were unusable")
+        weights = None
+    pooled = pool(matrix, method, weights)
+    total = pooled.sum()
+    pooled = pooled / total if total > 0 else np.full(len(options), 1.0 / len(options))
+    return dict(zip(options, pooled.tolist()))
+
+
+def percentile_matrix(predictions: List[Any], levels: np.ndarray = STANDARD_PERCENTILES) -> np.ndarray:
+    """
+    Members x levels matrix of declared percentile values; members missing a level are dropped.
+    """
+    rows = []
+    for prediction in predictions:
+        declared = getattr(prediction, 'declared_percentiles', prediction)
+        if not isinstance(declared, list):
+            continue
+        by_level = {round(p.percentile, 6): p.value for p in declared if hasattr(p, 'percentile')}
+        row = [by_level.get(round(float(level), 6)) for level in levels]
+        if None in row:
+            logger.warning("Skipping numeric prediction without all standard percentiles")
+            continue
+        rows.append(row)
+    return np.array(rows, dtype=float).reshape(-1, len(levels))
+
+
+def cdf_matrix(predictions: List[NumericDistribution]) -> tuple:
+    """
+    Members x grid-points CDF matrix, with the shared grid of values.
+
+    All members must come from the same question so their CDF grids line up.
+    """
+    cdfs = [prediction.cdf for prediction in predictions]
+    values = np.array([point.value for point in cdfs[0]], dtype=float)
+    matrix = np.array([[point.percentile for point in cdf] for cdf in cdfs], dtype=float)
+    return matrix, values
+
+
+def _default_percentiles(question: NumericQuestion) -> List[Percentile]:
+    span = question.upper_bound - question.lower_bound
+    return [
+        Percentile(percentile=0.1, value=question.lower_bound),
+        Percentile(percentile=0.2, value=question.lower_bound + span * 0.2),
+        Percentile(percentile=0.4, value=question.lower_bound + span * 0.4),
+        Percentile(percentile=0.6, value=question.lower_bound + span * 0.6),
+        Percentile(percentile=0.8, value=question.lower_bound + span * 0.8),
+        Percentile(percentile=0.9, value=question.upper_bound),
+    ]
+
+
+def aggregate_numeric(
+    predictions: List[Any],
+    question: NumericQuestion,
+    method: Optional[str] = None,
+    weights: Optional[Sequence[float]] = None,
+    space: Optional[str] = None,
+) -> NumericDistribution:
+    """
+    Pool numeric predictions into one distribution.
+
+    Args:
+        predictions: NumericDistribution objects or lists of Percentile
+        question: The question the predictions answer
+        method: One of METHODS (default from ENSEMBLE_AGGREGATION)
+        weights: Optional per-member weights
+        space: "percentiles" pools the values at each declared percentile (quantile averaging);
+            "cdf" pools the members' 201-point CDFs and reads the standard percentiles off the
+            result. Defaults to NUMERIC_AGGREGATION_SPACE, else percentiles.
+    """
+    method = method or get_aggregation_method()
+    space = space or os.getenv('NUMERIC_AGGREGATION_SPACE', 'percentiles').lower()
+
+    if space == 'cdf':
+        distributions = [p for p in predictions if isinstance(p, NumericDistribution)]
+        if distributions:
+            if weights is not None and len(distributions) != len(predictions):
+                weights = None
+            matrix, values = cdf_matrix(distributions)
+            pooled_cdf = np.maximum.accumulate(np.clip(pool(matrix, method, weights), 0, 1))
+            pooled_values = np.interp(STANDARD_PERCENTILES, pooled_cdf, values)
+        else:
+            pooled_values = None
+    else:
+        matrix = percentile_matrix(predictions)
+        if weights is not None and len(weights) != matrix.shape[0]:
+            logger.warning("Dropping ensemble weights: some numeric predictions were unusable")
+            weights = None
+        # Geometric pooling of odds is meaningless for raw values, so it pools them by the mean
+        value_method = MEAN if method == GEOMETRIC_MEAN_ODDS else method
+        pooled_values = pool(matrix, value_method, weights) if matrix.shape[0] else None
+
+    if pooled_values is None:
+        return NumericDistribution.from_question(_default_percentiles(question), question)
+
+    pooled_values = np.maximum.accumulate(pooled_values)
+    percentile_list = [
+        Percentile(percentile=float(level), value=float(value))
+        for level, value in zip(STANDARD_PERCENTILES, pooled_values)
+    ]
+    return NumericDistribution.from_question(percentile_list, question)
@@ -0,0 +1,49 @@
+"""
+Small asyncio helpers shared across the bot.
+"""
+
+import asyncio
+import weakref
+
+
+class LoopLocalSemaphore:
+    """
+    Semaphore that keeps one asyncio.Semaphore per running event loop.
+
+    asyncio primitives bind to the loop they are first awaited on, so a semaphore created at
+    import time (e.g. as a class attribute) breaks once a second asyncio.run() reuses it.
+    This wrapper creates the underlying semaphore lazily inside whichever loop is running,
+    so it can safely be declared at module or class level.
+    """
+
+    def __init__(self, value: int = 1):
+        self._value = value
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def _get(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._value)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    def locked(self) -> bool:
+        return self._get().locked()
+
+    async def acquire(self) -> bool:
+        return await self._get().acquire()
+
+    def release(self) -> None:
+        self._get().release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return None
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
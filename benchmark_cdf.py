@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for CDF construction in main_with_no_framework.py.
+
+Compares the original pure-Python generate_continuous_cdf (kept below as the reference)
+with the vectorized generate_continuous_cdfs, one forecast at a time and as one batch,
+and checks that both produce the same CDFs.
+
+    python benchmark_cdf.py --forecasts 500 --repeats 3
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from main_with_no_framework import generate_continuous_cdf, generate_continuous_cdfs
+
+CDF_SIZE = 201
+
+
+def reference_generate_continuous_cdf(
+    percentile_values: dict,
+    question_type: str,
+    open_upper_bound: bool,
+    open_lower_bound: bool,
+    upper_bound: float,
+    lower_bound: float,
+    zero_point: float | None,
+    cdf_size: int,
+) -> list[float]:
+    """
+    Returns: list[float]: A list of 201 float values representing the CDF.
+    """
+
+    percentile_max = max(float(key) for key in percentile_values.keys())
+    percentile_min = min(float(key) for key in percentile_values.keys())
+    range_min = lower_bound
+    range_max = upper_bound
+    range_size = range_max - range_min
+    buffer = 1 if range_size > 100 else 0.01 * range_size
+
+    # Adjust any values that are exactly at the bounds
+    for percentile, value in list(percentile_values.items()):
+        if not open_lower_bound and value <= range_min + buffer:
+            percentile_values[percentile] = range_min + buffer
+        if not open_upper_bound and value >= range_max - buffer:
+            percentile_values[percentile] = range_max - buffer
+
+    # Set cdf values outside range
+    if open_upper_bound:
+        if range_max > percentile_values[percentile_max]:
+            percentile_values[int(100 - (0.5 * (100 - percentile_max)))] = range_max
+    else:
+        percentile_values[100] = range_max
+
+    # Set cdf values outside range
+    if open_lower_bound:
+        if range_min < percentile_values[percentile_min]:
+            percentile_values[int(0.5 * percentile_min)] = range_min
+    else:
+        percentile_values[0] = range_min
+
+    sorted_percentile_values = dict(sorted(percentile_values.items()))
+
+    # Normalize percentile keys
+    normalized_percentile_values = {}
+    for key, value in sorted_percentile_values.items():
+        percentile = float(key) / 100
+        normalized_percentile_values[percentile] = value
+
+
+    value_percentiles = {
+        value: key for key, value in normalized_percentile_values.items()
+    }
+
+    # function for log scaled questions
+    def generate_cdf_locations(range_min, range_max, zero_point):
+        if zero_point is None:
+            scale = lambda x: range_min + (range_max - range_min) * x
+        else:
+            deriv_ratio = (range_max - zero_point) / (range_min - zero_point)
+            scale = lambda x: range_min + (range_max - range_min) * (
+                deriv_ratio**x - 1
+            ) / (deriv_ratio - 1)
+        return [scale(x) for x in np.linspace(0, 1, cdf_size)]
+
+    cdf_xaxis = generate_cdf_locations(range_min, range_max, zero_point)
+
+    def linear_interpolation(x_values, xy_pairs):
+        # Sort the xy_pairs by x-values
+        sorted_pairs = sorted(xy_pairs.items())
+
+        # Extract sorted x and y values
+        known_x = [pair[0] for pair in sorted_pairs]
+        known_y = [pair[1] for pair in sorted_pairs]
+
+        # Initialize the result list
+        y_values = []
+
+        for x in x_values:
+            # Check if x is exactly in the known x values
+            if x in known_x:
+                y_values.append(known_y[known_x.index(x)])
+            else:
+                # Find the indices of the two nearest known x-values
+                i = 0
+                while i < len(known_x) and known_x[i] < x:
+                    i += 1
+
+                list_index_2 = i
+
+                # If x is outside the range of known x-values, use the nearest endpoint
+                if i == 0:
+                    y_values.append(known_y[0])
+                elif i == len(known_x):
+                    y_values.append(known_y[-1])
+                else:
+                    # Perform linear interpolation
+                    x0, x1 = known_x[i - 1], known_x[i]
+                    y0, y1 = known_y[i - 1], known_y[i]
+
+                    # Linear interpolation formula
+                    y = y0 + (x - x0) * (y1 - y0) / (x1 - x0)
+                    y_values.append(y)
+
+        return y_values
+
+    continuous_cdf = linear_interpolation(cdf_xaxis, value_percentiles)
+    return continuous_cdf
+
+
+
+def make_forecasts(count: int, seed: int = 0) -> list[dict]:
+    """
+    Random question setups (linear and log scaled, open and closed bounds) with
+    increasing percentile values inside and around the range.
+    """
+    rng = np.random.default_rng(seed)
+    forecasts = []
+    for i in range(count):
+        lower = float(rng.uniform(0, 100))
+        upper = lower + float(rng.uniform(10, 10_000))
+        values = np.sort(rng.uniform(lower - 0.1 * (upper - lower), upper * 1.1, 6))
+        forecasts.append({
+            "percentile_values": dict(zip([10, 20, 40, 60, 80, 90], values.tolist())),
+            "open_upper_bound": bool(i % 2),
+            "open_lower_bound": bool(i % 3),
+            "upper_bound": upper,
+            "lower_bound": lower,
+            "zero_point": lower - float(rng.uniform(1, 50)) if i % 4 == 0 else None,
+        })
+    return forecasts
+
+
+def run_reference(forecasts: list[dict]) -> np.ndarray:
+    return np.array([
+        reference_generate_continuous_cdf(
+            dict(f["percentile_values"]), "numeric", f["open_upper_bound"], f["open_lower_bound"],
+            f["upper_bound"], f["lower_bound"], f["zero_point"], CDF_SIZE,
+        )
+        for f in forecasts
+    ])
+
+
+def run_single(forecasts: list[dict]) -> np.ndarray:
+    return np.array([
+        generate_continuous_cdf(
+            f["percentile_values"], "numeric", f["open_upper_bound"], f["open_lower_bound"],
+            f["upper_bound"], f["lower_bound"], f["zero_point"], CDF_SIZE,
+        )
+        for f in forecasts
+    ])
+
+
+def run_batch(forecasts: list[dict]) -> np.ndarray:
+    return generate_continuous_cdfs(
+        [f["percentile_values"] for f in forecasts],
+        [f["open_upper_bound"] for f in forecasts],
+        [f["open_lower_bound"] for f in forecasts],
+        [f["upper_bound"] for f in forecasts],
+        [f["lower_bound"] for f in forecasts],
+        [f["zero_point"] for f in forecasts],
+        CDF_SIZE,
+    )
+
+
+def best_time(function, forecasts: list[dict], repeats: int) -> tuple[float, np.ndarray]:
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(forecasts)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark CDF construction")
+    parser.add_argument("--forecasts", type=int, default=500, help="Number of forecasts to build CDFs for")
+    parser.add_argument("--repeats", type=int, default=3, help="Timing repeats (best is reported)")
+    args = parser.parse_args()
+
+    forecasts = make_forecasts(args.forecasts)
+    reference_time, reference = best_time(run_reference, forecasts, args.repeats)
+    single_time, single = best_time(run_single, forecasts, args.repeats)
+    batch_time, batch = best_time(run_batch, forecasts, args.repeats)
+
+    max_difference = max(np.abs(reference - single).max(), np.abs(reference - batch).max())
+    print(f"📊 {args.forecasts} forecasts x {CDF_SIZE} points, best of {args.repeats}")
+    print(f"   reference (pure Python): {reference_time * 1000:9.1f} ms")
+    print(f"   vectorized, one by one:  {single_time * 1000:9.1f} ms ({reference_time / single_time:.1f}x)")
+    print(f"   vectorized, one batch:   {batch_time * 1000:9.1f} ms ({reference_time / batch_time:.1f}x)")
+    print(f"   max difference from reference: {max_difference:.2e}")
+    if max_difference > 1e-9:
+        print("❌ Vectorized CDFs differ from the reference implementation")
+        return 1
+    print("✅ Vectorized CDFs match the reference implementation")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
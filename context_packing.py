@@ -0,0 +1,168 @@
+"""
+Token-budgeted context packing for prompts.
+Fits articles, research text and forecaster reasonings into a per-model token budget,
+ranking and trimming what goes in and reporting how many tokens were used.
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from rate_limiter import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+TRUNCATION_MARKER = "[...]"
+
+# Context budgets in tokens for the material packed into one prompt (not the whole context window)
+DEFAULT_CONTEXT_BUDGET = 6000
+FREE_MODEL_CONTEXT_BUDGET = 4000
+
+
+def count_tokens(text: Any) -> int:
+    """
+    Approximate token count, consistent with the rate limiter's budgeting.
+    """
+    return estimate_tokens(text) if text else 0
+
+
+def get_context_budget(model: Optional[str] = None) -> int:
+    """
+    Token budget for packed context in prompts sent to model.
+
+    Free-tier models get a smaller budget since they tend to have shorter context windows
+    and slower throughput. Configured by CONTEXT_BUDGET_TOKENS and CONTEXT_BUDGET_TOKENS_FREE.
+    """
+    if model and str(model).endswith(":free"):
+        return int(os.getenv('CONTEXT_BUDGET_TOKENS_FREE', str(FREE_MODEL_CONTEXT_BUDGET)))
+    return int(os.getenv('CONTEXT_BUDGET_TOKENS', str(DEFAULT_CONTEXT_BUDGET)))
+
+
+def parse_publish_date(value: Any) -> Optional[datetime]:
+    """
+    Parse an article publish date in the formats our sources return, or None if unknown.
+    """
+    if not value:
+        return None
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        pass
+    for date_format in ('%B %d, %Y %I:%M %p', '%B %d, %Y', '%b %d, %Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut text to about max_tokens, preferring to end on a paragraph or sentence boundary.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    max_chars = max(0, max_tokens * 4 - len(TRUNCATION_MARKER) - 1)
+    cut = text[:max_chars]
+    for boundary in ("\n\n", "\n", ". "):
+        position = cut.rfind(boundary)
+        if position > max_chars // 2:
+            cut = cut[:position + (1 if boundary == ". " else 0)]
+            break
+    return f"{cut.rstrip()} {TRUNCATION_MARKER}"
+
+
+class PackedContext:
+    """
+    Result of packing: the text to embed and an account of what fit.
+    """
+
+    def __init__(self, text: str, tokens_used: int, budget: int, included: int, dropped: int, truncated: int):
+        self.text = text
+        self.tokens_used = tokens_used
+        self.budget = budget
+        self.included = included
+        self.dropped = dropped
+        self.truncated = truncated
+
+    def describe(self) -> str:
+        return (
+            f"{self.tokens_used}/{self.budget} tokens, {self.included} included, "
+            f"{self.truncated} truncated, {self.dropped} dropped"
+        )
+
+
+def pack_articles(
+    articles: List[Dict[str, Any]],
+    budget: int,
+    format_article: Callable[[int, Dict[str, Any]], str],
+    min_partial_tokens: int = 60,
+) -> PackedContext:
+    """
+    Pack the most relevant, most recent articles into budget tokens.
+
+    Articles are ranked by relevance_score, then publish date (newest first). Whole articles are
+    added while they fit; the first one that does not fit is truncated into the remaining space
+    if at least min_partial_tokens remain, and the rest are dropped.
+
+    Args:
+        articles: Articles to pack
+        budget: Token budget for the packed text
+        format_article: Renders (position starting at 1, article) as prompt text
+        min_partial_tokens: Smallest remainder worth filling with a truncated article
+    """
+    ranked = sorted(
+        articles,
+        key=lambda a: (a.get('relevance_score', 3), parse_publish_date(a.get('publish_date')) or datetime.min),
+        reverse=True,
+    )
+    parts: List[str] = []
+    used = 0
+    truncated = 0
+    for article in ranked:
+        text = format_article(len(parts) + 1, article)
+        tokens = count_tokens(text) + 1
+        if used + tokens <= budget:
+            parts.append(text)
+            used += tokens
+            continue
+        remaining = budget - used
+        if remaining >= min_partial_tokens:
+            parts.append(truncate_to_tokens(text, remaining - 1))
+            used += count_tokens(parts[-1]) + 1
+            truncated += 1
+        break
+    return PackedContext("\n\n".join(parts), used, budget, len(parts), len(ranked) - len(parts), truncated)
+
+
+def pack_text(text: str, budget: int) -> PackedContext:
+    """
+    Fit a single block of text (e.g. research) into budget tokens.
+    """
+    tokens = count_tokens(text)
+    if tokens <= budget:
+        return PackedContext(text or "", tokens, budget, 1 if text else 0, 0, 0)
+    packed = truncate_to_tokens(text, budget)
+    return PackedContext(packed, count_tokens(packed), budget, 1, 0, 1)
+
+
+def pack_sections(sections: List[str], budget: int) -> List[str]:
+    """
+    Fit several texts (e.g. forecaster reasonings) into budget tokens between them.
+
+    Each section gets an equal share; sections shorter than their share hand the unused
+    tokens on to the longer ones, and only sections still over their share are truncated.
+    """
+    if not sections:
+        return []
+    remaining_budget = budget
+    shares: Dict[int, int] = {}
+    pending = sorted(range(len(sections)), key=lambda i: count_tokens(sections[i]))
+    while pending:
+        share = remaining_budget // len(pending)
+        index = pending.pop(0)
+        shares[index] = min(count_tokens(sections[index]), share)
+        remaining_budget -= shares[index]
+    return [truncate_to_tokens(section, shares[i]) for i, section in enumerate(sections)]
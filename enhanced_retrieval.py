@@ -1,8 +1,11 @@
 import asyncio
+import hashlib
 import logging
 import os
+import re
+import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from forecasting_tools import (
     AskNewsSearcher,
@@ -13,8 +16,151 @@ from forecasting_tools import (
 )
 from forecasting_tools.helpers.metaculus_api import MetaculusQuestion
 
+from context_packing import get_context_budget, pack_articles, parse_publish_date
+from fallback_llm import FallbackLLM
+from near_duplicates import collapse_near_duplicates
+from rate_limiter import get_rate_limiter, is_rate_limit_error
+from research_store import ResearchStore, get_research_store
+from stage_profiler import profile_call
+
 logger = logging.getLogger(__name__)
 
+RELEVANCE_SCALE = clean_indents("""
+    Please rate the relevance of the article to the question, at the scale of 1-6
+    1 – irrelevant
+    2 – slightly relevant
+    3 – somewhat relevant
+    4 – relevant
+    5 – highly relevant
+    6 – most relevant
+    
+    Guidelines:
+    - You don't need to access any external sources. Just consider the information provided.
+    - Focus on the content of the article, not the title.
+    - If the text content is an error message about JavaScript, paywall, cookies or other technical issues, output a score of 1.
+""")
+
+_STOPWORDS = {
+    'the', 'and', 'for', 'are', 'was', 'were', 'will', 'would', 'with', 'that', 'this', 'than', 'from',
+    'have', 'has', 'had', 'been', 'before', 'after', 'what', 'when', 'which', 'who', 'whom', 'how',
+    'any', 'all', 'not', 'its', 'their', 'there', 'they', 'into', 'more', 'most', 'over', 'under',
+    'between', 'about', 'does', 'did', 'can', 'could', 'should', 'may', 'might', 'least', 'each',
+}
+
+
+# Start of an AskNews response that is an error or auth failure rather than news
+_ASKNEWS_ERROR_RESPONSE = re.compile(
+    r'^\W*(?:error\b|exception\b|unauthori[sz]ed\b|forbidden\b|invalid api key|authentication failed|'
+    r'(?:http\s*)?(?:401|403|429|5\d\d)\b)',
+    re.IGNORECASE,
+)
+
+# Auth or configuration failures; these won't clear up on the next query, unlike 429s and network errors
+_ASKNEWS_AUTH_FAILURE = re.compile(
+    r'\b(?:401|403)\b|unauthori[sz]ed|forbidden|invalid api key|authentication|'
+    r'credentials?\b|client[_ ](?:id|secret)',
+    re.IGNORECASE,
+)
+
+
+def _is_asknews_auth_failure(error: Any) -> bool:
+    """
+    Whether an AskNews exception or error response means no query will succeed, so AskNews
+    should be skipped for every question until its availability TTL passes.
+    """
+    if isinstance(error, BaseException):
+        status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+        if status in (401, 403) or type(error).__name__ in ("AuthenticationError", "PermissionDeniedError"):
+            return True
+    return _ASKNEWS_AUTH_FAILURE.search(str(error)) is not None
+
+
+def _content_words(text: str) -> set:
+    """
+    Lowercased words of 3+ characters in text, excluding common stopwords.
+    """
+    return {word for word in re.findall(r'[a-z0-9]{3,}', text.lower()) if word not in _STOPWORDS}
+
+
+class SearcherRegistry:
+    """
+    Process-wide cache of search clients and their availability.
+
+    Searcher instances are built once and reused across questions. Availability is learned
+    from real searches instead of a probe query: an auth or configuration failure marks the source
+    unavailable for availability_ttl seconds, after which it is tried again.
+    """
+
+    def __init__(self, availability_ttl: float = 600):
+        self.availability_ttl = availability_ttl
+        self._searchers: Dict[Any, Any] = {}
+        self._unavailable_until: Dict[str, float] = {}
+
+    def is_available(self, source: str) -> bool:
+        return time.monotonic() >= self._unavailable_until.get(source, 0.0)
+
+    def mark_available(self, source: str) -> None:
+        if self._unavailable_until.pop(source, None) is not None:
+            logger.info(f"{source} is available again")
+
+    def mark_unavailable(self, source: str, reason: Any) -> None:
+        self._unavailable_until[source] = time.monotonic() + self.availability_ttl
+        logger.warning(f"{source} unavailable ({reason}); skipping it for {self.availability_ttl:.0f}s")
+
+    def get_asknews(self) -> Optional[AskNewsSearcher]:
+        """
+        Shared AskNewsSearcher, or None while AskNews is marked unavailable.
+        """
+        if not self.is_available("asknews"):
+            return None
+        if "asknews" not in self._searchers:
+            try:
+                self._searchers["asknews"] = AskNewsSearcher()
+            except Exception as e:
+                self.mark_unavailable("asknews", e)
+                return None
+        return self._searchers["asknews"]
+
+    def get_smart_searcher(self, num_sites_per_search: int) -> Optional[SmartSearcher]:
+        """
+        Shared SmartSearcher for this result count, or None without a real EXA API key
+        or while it is marked unavailable.
+        """
+        exa_key = os.getenv('EXA_API_KEY', '')
+        if not exa_key or exa_key == '1234567890':  # Check if it's a real API key
+            return None
+        if not self.is_available("smart-searcher"):
+            return None
+        key = ("smart-searcher", num_sites_per_search)
+        if key not in self._searchers:
+            try:
+                self._searchers[key] = SmartSearcher(
+                    model="openrouter/openai/gpt-4o-mini",
+                    temperature=0,
+                    num_searches_to_run=1,  # Reduced for faster testing
+                    num_sites_per_search=num_sites_per_search,
+                    use_advanced_filters=False,
+                )
+                logger.info("SmartSearcher initialized successfully")
+            except Exception as e:
+                self.mark_unavailable("smart-searcher", e)
+                return None
+        return self._searchers[key]
+
+
+# Global instance shared by every EnhancedRetrievalSystem in the process
+_searcher_registry_instance: Optional[SearcherRegistry] = None
+
+
+def get_searcher_registry() -> SearcherRegistry:
+    """
+    Get the global searcher registry (availability TTL from SEARCHER_AVAILABILITY_TTL, default 600s).
+    """
+    global _searcher_registry_instance
+    if _searcher_registry_instance is None:
+        _searcher_registry_instance = SearcherRegistry(float(os.getenv('SEARCHER_AVAILABILITY_TTL', '600')))
+    return _searcher_registry_instance
+
 
 class EnhancedRetrievalSystem:
     """
@@ -22,12 +168,84 @@ class EnhancedRetrievalSystem:
     as described in the "Approaching Human-Level Forecasting with Language Models" paper.
     """
     
-    def __init__(self, llm: GeneralLlm):
+    # Search queries generated per (question id, question text hash), shared across instances
+    _query_cache: Dict[Tuple[Any, str], List[str]] = {}
+
+    def __init__(
+        self,
+        llm: GeneralLlm,
+        rating_concurrency: Optional[int] = None,
+        rating_batch_size: Optional[int] = None,
+        min_lexical_overlap: Optional[int] = None,
+    ):
+        """
+        Initialize the retrieval system.
+
+        Args:
+            llm: LLM used for query generation, relevance rating and summarization
+            rating_concurrency: Max relevance rating calls in flight (default from RELEVANCE_RATING_CONCURRENCY, 5)
+            rating_batch_size: Articles rated per prompt; 1 rates each article separately
+                (default from RELEVANCE_RATING_BATCH_SIZE, 1)
+            min_lexical_overlap: Content words an article must share with the question to be sent
+                for rating; 0 disables the pre-filter (default from RELEVANCE_MIN_OVERLAP, 1)
+        """
         self.llm = llm
+        self.rating_concurrency = max(1, rating_concurrency or int(os.getenv('RELEVANCE_RATING_CONCURRENCY', '5')))
+        self.rating_batch_size = max(1, rating_batch_size or int(os.getenv('RELEVANCE_RATING_BATCH_SIZE', '1')))
+        self.min_lexical_overlap = min_lexical_overlap if min_lexical_overlap is not None else int(os.getenv('RELEVANCE_MIN_OVERLAP', '1'))
+        # Articles whose estimated title + summary similarity reaches this are collapsed; 0 disables
+        self.near_duplicate_threshold = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.6'))
+        # Retrieval fan-out: queries searched per question, and per-source concurrency and timeouts
+        self.max_queries = int(os.getenv('RETRIEVAL_MAX_QUERIES', '6'))
+        self.source_concurrency = {
+            "asknews": max(1, int(os.getenv('ASKNEWS_CONCURRENCY', '2'))),
+            "smart-searcher": max(1, int(os.getenv('SMART_SEARCHER_CONCURRENCY', '2'))),
+        }
+        self.source_timeouts = {
+            "asknews": float(os.getenv('ASKNEWS_TIMEOUT', '30')),
+            "smart-searcher": float(os.getenv('SMART_SEARCHER_TIMEOUT', '90')),
+        }
+
+    async def _invoke_llm(self, prompt: str) -> str:
+        """
+        Invoke the retrieval LLM through the shared rate limiter.
+        FallbackLLM already limits each model attempt, so only plain GeneralLlm calls are wrapped here.
+        """
+        if isinstance(self.llm, FallbackLLM):
+            return await self.llm.invoke(prompt)
+        async with get_rate_limiter().limit(self.llm.model, prompt):
+            return await self.llm.invoke(prompt)
     
     async def generate_search_queries(self, question: MetaculusQuestion) -> List[str]:
         """
         Generate multiple search queries using query expansion techniques.
+
+        Results are cached per (question id, question text hash) for the life of the process,
+        so retries of run_research do not regenerate them. With QUERY_GENERATION_COMBINED=true
+        both query sets come from a single prompt instead of two concurrent ones.
+        """
+        cache_key = (
+            getattr(question, 'id_of_question', None) or question.page_url,
+            hashlib.sha256((question.question_text or "").encode("utf-8")).hexdigest(),
+        )
+        if cache_key in self._query_cache:
+            logger.info(f"Reusing cached search queries for {question.page_url}")
+            return list(self._query_cache[cache_key])
+
+        if os.getenv('QUERY_GENERATION_COMBINED', 'false').lower() == 'true':
+            queries = await self._generate_combined_search_queries(question)
+        else:
+            queries = await self._generate_expansion_and_decomposition_queries(question)
+
+        # Combine and deduplicate queries, keeping direct queries first
+        all_queries = list(dict.fromkeys(q for q in queries if q))
+        if all_queries:
+            self._query_cache[cache_key] = all_queries
+        return list(all_queries)
+
+    async def _generate_expansion_and_decomposition_queries(self, question: MetaculusQuestion) -> List[str]:
+        """
+        Run the direct query expansion and sub-question decomposition prompts concurrently.
         """
         # Method 1: Direct query expansion
         direct_prompt = clean_indents(f"""
@@ -67,17 +285,50 @@ class EnhancedRetrievalSystem:
             {{ Insert the queries here. Use semicolons to separate the queries. }}
         """)
         
-        # Get queries from both methods
-        direct_response = await self.llm.invoke(direct_prompt)
-        decomposition_response = await self.llm.invoke(decomposition_prompt)
+        # Get queries from both methods concurrently
+        direct_response, decomposition_response = await asyncio.gather(
+            self._invoke_llm(direct_prompt),
+            self._invoke_llm(decomposition_prompt),
+        )
         
         # Extract queries from responses
         direct_queries = self._extract_queries_from_response(direct_response)
         decomposition_queries = self._extract_queries_from_response(decomposition_response)
-        
-        # Combine and deduplicate queries
-        all_queries = list(set(direct_queries + decomposition_queries))
-        return all_queries
+        return direct_queries + decomposition_queries
+
+    async def _generate_combined_search_queries(self, question: MetaculusQuestion) -> List[str]:
+        """
+        Generate both query sets (direct expansion and sub-question decomposition) in one LLM call.
+        """
+        combined_prompt = clean_indents(f"""
+            I will provide you with a forecasting question and the background information for the question.
+            I will then ask you to generate short search queries (up to 10 words each) that I'll use to find articles on Google News to help answer the question.
+            
+            Question: {question.question_text}
+            Background: {question.background_info}
+            
+            Task:
+            - First, generate exactly 3 direct search queries that gather information that could influence the forecast.
+            - Then write down sub-questions, and use them to steer exactly 3 more search queries.
+            
+            Your response should take the following structure:
+            Thoughts:
+            {{ Insert your thinking and sub-questions here. }}
+            
+            Direct Search Queries:
+            {{ Insert the 3 direct queries here on one line. Use semicolons to separate the queries. }}
+            
+            Sub-question Search Queries:
+            {{ Insert the 3 sub-question queries here on one line. Use semicolons to separate the queries. }}
+        """)
+        response = await self._invoke_llm(combined_prompt)
+
+        queries: List[str] = []
+        for label in ("Direct Search Queries:", "Sub-question Search Queries:"):
+            if label in response:
+                section = response.split(label, 1)[1].strip().split("\n", 1)[0]
+                queries.extend(q.strip().strip('"\'') for q in section.split(";") if q.strip())
+        return queries or self._extract_queries_from_response(response)
     
     def _extract_queries_from_response(self, response: str) -> List[str]:
         """
@@ -106,67 +357,40 @@ class EnhancedRetrievalSystem:
     async def retrieve_articles(self, queries: List[str], max_articles_per_query: int = 5) -> List[Dict[str, Any]]:
         """
         Retrieve articles using multiple search APIs with fallback options.
-        """
-        all_articles = []
 
-        # Try to use AskNewsSearcher (may fail due to API key issues)
-        asknews_available = False
-        try:
-            asknews_searcher = AskNewsSearcher()
-            # Test with a simple query first
-            test_result = await asknews_searcher.get_formatted_news_async("test")
-            if "error" not in test_result.lower() and "unauthorized" not in test_result.lower():
-                asknews_available = True
-                logger.info("AskNews API is available")
-            else:
-                logger.warning("AskNews API returned error response, will use fallback")
-        except Exception as e:
-            logger.warning(f"AskNews API not available: {e}")
-
-        # Use SmartSearcher (more reliable) - but only if EXA API key is available
-        smart_searcher = None
-        exa_key = os.getenv('EXA_API_KEY', '')
-        if exa_key and exa_key != '1234567890':  # Check if it's a real API key
-            try:
-                smart_searcher = SmartSearcher(
-                    model="openrouter/openai/gpt-4o-mini",
-                    temperature=0,
-                    num_searches_to_run=1,  # Reduced for faster testing
-                    num_sites_per_search=max_articles_per_query,
-                    use_advanced_filters=False,
-                )
-                logger.info("SmartSearcher initialized successfully")
-            except Exception as e:
-                logger.warning(f"SmartSearcher not available: {e}")
-        else:
-            logger.info("EXA API key not available, skipping SmartSearcher")
+        Every (query, source) pair for the first max_queries queries is searched concurrently,
+        with at most source_concurrency searches in flight per source and each search bounded
+        by that source's timeout. Articles are deduplicated by URL as results arrive.
+        """
+        searchers = get_searcher_registry()
+        asknews_searcher = searchers.get_asknews()
+        smart_searcher = searchers.get_smart_searcher(max_articles_per_query)
+        if smart_searcher is None:
+            logger.info("SmartSearcher not available, skipping it")
 
-        # Retrieve from available sources
-        for query in queries[:2]:  # Limit to top 2 queries for faster testing
-            try:
-                # Get articles from AskNews if available
-                if asknews_available:
-                    try:
-                        asknews_articles = await asknews_searcher.get_formatted_news_async(query)
-                        parsed_asknews = self._parse_asknews_response(asknews_articles)
-                        all_articles.extend(parsed_asknews)
-                        logger.info(f"Got {len(parsed_asknews)} articles from AskNews for query: {query}")
-                    except Exception as e:
-                        logger.warning(f"Error retrieving from AskNews for query '{query}': {e}")
-
-                # Get articles from SmartSearcher if available
-                if smart_searcher:
-                    try:
-                        smart_prompt = f"Find recent news articles about: {query}"
-                        smart_articles = await smart_searcher.invoke(smart_prompt)
-                        parsed_smart = self._parse_smart_response(smart_articles)
-                        all_articles.extend(parsed_smart)
-                        logger.info(f"Got {len(parsed_smart)} articles from SmartSearcher for query: {query}")
-                    except Exception as e:
-                        logger.warning(f"Error retrieving from SmartSearcher for query '{query}': {e}")
+        source_limiters = {source: asyncio.Semaphore(limit) for source, limit in self.source_concurrency.items()}
+        tasks = []
+        for query in queries[:self.max_queries]:
+            if asknews_searcher is not None:
+                tasks.append(asyncio.create_task(self._search_asknews(asknews_searcher, query, source_limiters["asknews"])))
+            if smart_searcher is not None:
+                tasks.append(asyncio.create_task(self._search_smart(smart_searcher, query, source_limiters["smart-searcher"])))
 
-            except Exception as e:
-                logger.warning(f"Error processing query '{query}': {e}")
+        # Deduplicate articles by URL as each search completes
+        unique_articles: Dict[str, Dict[str, Any]] = {}
+        try:
+            for completed in asyncio.as_completed(tasks):
+                for article in await completed:
+                    url = article.get('url', '')
+                    if url and url not in unique_articles:
+                        unique_articles[url] = article
+                    elif not url:  # Keep articles without URLs (fallback content)
+                        unique_articles[f"article_{len(unique_articles)}"] = article
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        all_articles = list(unique_articles.values())
 
         # If no articles retrieved, create fallback content based on the queries
         if not all_articles:
@@ -183,18 +407,62 @@ class EnhancedRetrievalSystem:
                 })
             return fallback_content
 
-        # Deduplicate articles by URL
-        unique_articles = {}
-        for article in all_articles:
-            url = article.get('url', '')
-            if url and url not in unique_articles:
-                unique_articles[url] = article
-            elif not url:  # Keep articles without URLs (fallback content)
-                unique_articles[f"article_{len(unique_articles)}"] = article
-
-        result = list(unique_articles.values())
-        logger.info(f"Total unique articles retrieved: {len(result)}")
-        return result
+        logger.info(f"Total unique articles retrieved: {len(all_articles)} from {len(tasks)} searches")
+        return all_articles
+
+    async def _search_asknews(self, searcher: AskNewsSearcher, query: str, limiter: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        searchers = get_searcher_registry()
+        async with limiter:
+            if not searchers.is_available("asknews"):
+                return []
+            try:
+                async with get_rate_limiter().limit("asknews", query):
+                    response = await asyncio.wait_for(
+                        searcher.get_formatted_news_async(query), timeout=self.source_timeouts["asknews"]
+                    )
+            except asyncio.TimeoutError:
+                logger.warning(f"AskNews timed out after {self.source_timeouts['asknews']}s for query: {query}")
+                return []
+            except Exception as e:
+                # The rate limiter has already backed off on a 429; only auth or configuration
+                # failures take AskNews out for every question, anything else skips this query
+                if is_rate_limit_error(e):
+                    logger.warning(f"AskNews rate limited for query '{query}': {e}")
+                elif _is_asknews_auth_failure(e):
+                    searchers.mark_unavailable("asknews", e)
+                else:
+                    logger.warning(f"Error retrieving from AskNews for query '{query}': {e}")
+                return []
+        articles = self._parse_asknews_response(response)
+        if not articles and _ASKNEWS_ERROR_RESPONSE.search(response[:300]):
+            # Only a response with no articles that reads like an error or auth failure counts;
+            # news mentioning e.g. "unauthorized access" is a normal result
+            if _is_asknews_auth_failure(response[:300]):
+                searchers.mark_unavailable("asknews", f"error response: {response[:100]!r}")
+            else:
+                logger.warning(f"AskNews returned an error for query '{query}': {response[:100]!r}")
+            return []
+        searchers.mark_available("asknews")
+        logger.info(f"Got {len(articles)} articles from AskNews for query: {query}")
+        return articles
+
+    async def _search_smart(self, searcher: SmartSearcher, query: str, limiter: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        smart_prompt = f"Find recent news articles about: {query}"
+        async with limiter:
+            try:
+                async with get_rate_limiter().limit(searcher.llm.model, smart_prompt):
+                    response = await asyncio.wait_for(
+                        searcher.invoke(smart_prompt), timeout=self.source_timeouts["smart-searcher"]
+                    )
+            except asyncio.TimeoutError:
+                logger.warning(f"SmartSearcher timed out after {self.source_timeouts['smart-searcher']}s for query: {query}")
+                return []
+            except Exception as e:
+                logger.warning(f"Error retrieving from SmartSearcher for query '{query}': {e}")
+                return []
+        articles = self._parse_smart_response(response)
+        logger.info(f"Got {len(articles)} articles from SmartSearcher for query: {query}")
+        return articles
     
     def _parse_asknews_response(self, response: str) -> List[Dict[str, Any]]:
         """
@@ -249,55 +517,123 @@ class EnhancedRetrievalSystem:
     async def rate_article_relevance(self, articles: List[Dict[str, Any]], question: MetaculusQuestion) -> List[Dict[str, Any]]:
         """
         Rate the relevance of articles to the forecasting question.
+
+        Articles sharing fewer than min_lexical_overlap content words with the question are
+        scored 1 without an LLM call. The rest are rated concurrently (at most rating_concurrency
+        calls in flight), one article per prompt, or rating_batch_size articles per prompt when
+        batching is enabled. Returns the articles sorted by relevance score, highest first.
         """
-        rated_articles = []
-        
+        question_words = _content_words(f"{question.question_text} {getattr(question, 'background_info', '') or ''}")
+        to_rate = []
+        skipped = 0
         for article in articles:
-            prompt = clean_indents(f"""
-                Please consider the following forecasting question and its background information.
-                After that, I will give you a news article and ask you to rate its relevance with respect to the forecasting question.
-                
-                Question:
-                {question.question_text}
-                
-                Question Background: {question.background_info}
-                Resolution Criteria: {question.resolution_criteria}
-                
-                Article:
-                {article.get('title', '')}
-                {article.get('summary', '')}
-                
-                Please rate the relevance of the article to the question, at the scale of 1-6
-                1 – irrelevant
-                2 – slightly relevant
-                3 – somewhat relevant
-                4 – relevant
-                5 – highly relevant
-                6 – most relevant
-                
-                Guidelines:
-                - You don't need to access any external sources. Just consider the information provided.
-                - Focus on the content of the article, not the title.
-                - If the text content is an error message about JavaScript, paywall, cookies or other technical issues, output a score of 1.
-                
-                Your response should look like the following:
-                Thought: {{ Insert your thinking }}
-                Rating: {{ Insert answer here }}
-            """)
+            article_words = _content_words(f"{article.get('title', '')} {article.get('summary', '')}")
+            if question_words and len(question_words & article_words) < self.min_lexical_overlap:
+                article['relevance_score'] = 1
+                skipped += 1
+            else:
+                to_rate.append(article)
+        if skipped:
+            logger.info(f"Lexical pre-filter scored {skipped}/{len(articles)} articles as irrelevant without an LLM call")
+
+        semaphore = asyncio.Semaphore(self.rating_concurrency)
+        if self.rating_batch_size > 1:
+            batches = [to_rate[i:i + self.rating_batch_size] for i in range(0, len(to_rate), self.rating_batch_size)]
+            await asyncio.gather(*[self._rate_article_batch(batch, question, semaphore) for batch in batches])
+        else:
+            await asyncio.gather(*[self._rate_single_article(article, question, semaphore) for article in to_rate])
+
+        # Sort by relevance score (descending); sort is stable so ties keep retrieval order
+        rated_articles = sorted(articles, key=lambda x: x['relevance_score'], reverse=True)
+        return rated_articles
+
+    async def _rate_single_article(self, article: Dict[str, Any], question: MetaculusQuestion, semaphore: asyncio.Semaphore) -> None:
+        prompt = clean_indents(f"""
+            Please consider the following forecasting question and its background information.
+            After that, I will give you a news article and ask you to rate its relevance with respect to the forecasting question.
             
-            try:
-                response = await self.llm.invoke(prompt)
-                rating = self._extract_rating_from_response(response)
-                article['relevance_score'] = rating
-                rated_articles.append(article)
-            except Exception as e:
-                logger.warning(f"Error rating article relevance: {e}")
-                article['relevance_score'] = 3  # Default medium relevance
-                rated_articles.append(article)
+            Question:
+            {question.question_text}
+            
+            Question Background: {question.background_info}
+            Resolution Criteria: {question.resolution_criteria}
+            
+            Article:
+            {article.get('title', '')}
+            {article.get('summary', '')}
+            
+            {RELEVANCE_SCALE}
+            
+            Your response should look like the following:
+            Thought: {{ Insert your thinking }}
+            Rating: {{ Insert answer here }}
+        """)
         
-        # Sort by relevance score (descending)
-        rated_articles.sort(key=lambda x: x['relevance_score'], reverse=True)
-        return rated_articles
+        try:
+            async with semaphore:
+                response = await self._invoke_llm(prompt)
+            article['relevance_score'] = self._extract_rating_from_response(response)
+        except Exception as e:
+            logger.warning(f"Error rating article relevance: {e}")
+            article['relevance_score'] = 3  # Default medium relevance
+
+    async def _rate_article_batch(self, batch: List[Dict[str, Any]], question: MetaculusQuestion, semaphore: asyncio.Semaphore) -> None:
+        """
+        Rate several articles in one prompt. Articles whose score is missing from the
+        response are rated individually.
+        """
+        articles_text = "\n\n".join([
+            f"Article {i}:\n{article.get('title', '')}\n{article.get('summary', '')}"
+            for i, article in enumerate(batch, 1)
+        ])
+        prompt = clean_indents(f"""
+            Please consider the following forecasting question and its background information.
+            After that, I will give you {len(batch)} news articles and ask you to rate the relevance of each one with respect to the forecasting question.
+            
+            Question:
+            {question.question_text}
+            
+            Question Background: {question.background_info}
+            Resolution Criteria: {question.resolution_criteria}
+            
+            Articles:
+            {articles_text}
+            
+            {RELEVANCE_SCALE}
+            
+            Rate every article independently. End your response with one line per article, exactly like:
+            Article 1 Rating: {{ Insert answer here }}
+            Article 2 Rating: {{ Insert answer here }}
+        """)
+
+        ratings: Dict[int, int] = {}
+        try:
+            async with semaphore:
+                response = await self._invoke_llm(prompt)
+            ratings = self._extract_batch_ratings_from_response(response, len(batch))
+        except Exception as e:
+            logger.warning(f"Error rating article batch relevance: {e}")
+
+        missing = []
+        for i, article in enumerate(batch, 1):
+            if i in ratings:
+                article['relevance_score'] = ratings[i]
+            else:
+                missing.append(article)
+        if missing:
+            logger.info(f"Batch rating missed {len(missing)}/{len(batch)} articles, rating them individually")
+            await asyncio.gather(*[self._rate_single_article(article, question, semaphore) for article in missing])
+
+    def _extract_batch_ratings_from_response(self, response: str, batch_size: int) -> Dict[int, int]:
+        """
+        Extract per-article ratings ("Article N Rating: X") from a batched rating response.
+        """
+        ratings: Dict[int, int] = {}
+        for index, rating in re.findall(r'Article\s*(\d+)\s*(?:Rating)?\s*[:\-–]\s*(\d+)', response, flags=re.IGNORECASE):
+            index = int(index)
+            if 1 <= index <= batch_size:
+                ratings[index] = max(1, min(6, int(rating)))  # Clamp between 1-6
+        return ratings
     
     def _extract_rating_from_response(self, response: str) -> int:
         """
@@ -329,14 +665,18 @@ class EnhancedRetrievalSystem:
         # Filter out low relevance articles (score < 4)
         filtered_articles = [a for a in articles if a.get('relevance_score', 3) >= 4]
         
-        # Take top N articles
+        # Take top N articles, packed into the summarizer's token budget by relevance and recency
         top_articles = filtered_articles[:max_articles]
-        
-        # Create summary prompt
-        articles_text = "\n\n".join([
-            f"Article {i+1}:\nTitle: {article.get('title', 'N/A')}\nSummary: {article.get('summary', 'N/A')}"
-            for i, article in enumerate(top_articles)
-        ])
+        packed = pack_articles(
+            top_articles,
+            get_context_budget(getattr(self.llm, 'model', None)),
+            lambda i, article: (
+                f"Article {i}:\nTitle: {article.get('title', 'N/A')}\nSummary: {article.get('summary', 'N/A')}"
+                + (f"\nReported by {article['duplicate_count']} outlets" if article.get('duplicate_count') else "")
+            ),
+        )
+        articles_text = packed.text
+        logger.info(f"Packed articles for summarization: {packed.describe()}")
         
         prompt = clean_indents(f"""
             I want to make the following articles shorter (condense them to no more than 200 words total).
@@ -353,7 +693,7 @@ class EnhancedRetrievalSystem:
         """)
         
         try:
-            summary = await self.llm.invoke(prompt)
+            summary = await self._invoke_llm(prompt)
             return summary
         except Exception as e:
             logger.warning(f"Error summarizing articles: {e}")
@@ -367,27 +707,76 @@ class EnhancedRetrievalSystem:
     async def enhanced_retrieve(self, question: MetaculusQuestion) -> str:
         """
         Complete enhanced retrieval pipeline.
+
+        With the research store enabled, research stored by an earlier run is reused while fresh,
+        refreshed incrementally (only articles not seen before are rated and merged) while
+        moderately stale, and rebuilt from scratch otherwise.
         """
         logger.info(f"Starting enhanced retrieval for question: {question.question_text}")
+
+        store = get_research_store()
+        stored = await store.get(question) if store is not None else None
+        freshness = store.classify(stored) if store is not None else ResearchStore.REBUILD
+        if freshness == ResearchStore.REUSE:
+            logger.info(f"Reusing stored research for {question.page_url} (updated {datetime.fromtimestamp(stored['updated_at']):%Y-%m-%d %H:%M})")
+            return stored["research"]
         
         # Step 1: Generate search queries
-        queries = await self.generate_search_queries(question)
+        queries = await profile_call("query_generation", self.generate_search_queries(question))
         logger.info(f"Generated {len(queries)} search queries")
         
         # Step 2: Retrieve articles
-        articles = await self.retrieve_articles(queries)
+        articles = await profile_call("retrieval", self.retrieve_articles(queries))
         logger.info(f"Retrieved {len(articles)} articles")
+        if self.near_duplicate_threshold > 0:
+            articles = collapse_near_duplicates(articles, self.near_duplicate_threshold)
         
         # Step 3: Rate relevance
-        rated_articles = await self.rate_article_relevance(articles, question)
+        if freshness == ResearchStore.INCREMENTAL:
+            new_articles = self._select_new_articles(articles, stored)
+            logger.info(f"Incremental research refresh for {question.page_url}: {len(new_articles)} new articles")
+            if not new_articles:
+                # Leave the entry untouched: rewriting it would only move updated_at forward
+                return stored["research"]
+            rated_new_articles = await profile_call("rating", self.rate_article_relevance(new_articles, question))
+            rated_articles = sorted(
+                stored["articles"] + rated_new_articles, key=lambda x: x.get('relevance_score', 3), reverse=True
+            )
+        else:
+            rated_articles = await profile_call("rating", self.rate_article_relevance(articles, question))
         logger.info("Rated article relevance")
         
         # Step 4: Summarize
-        summary = await self.summarize_articles(rated_articles, question)
+        summary = await profile_call("summarization", self.summarize_articles(rated_articles, question))
         logger.info("Generated article summary")
+
+        if store is not None and summary:
+            # Query-based fallback content is not worth keeping across runs
+            stored_articles = [a for a in rated_articles if a.get('source') != 'Query Analysis']
+            # Only an incremental refresh carries the last full build time forward
+            previous = stored if freshness == ResearchStore.INCREMENTAL else None
+            await store.put(question, summary, stored_articles, previous=previous)
         
         return summary
 
+    @staticmethod
+    def _select_new_articles(articles: List[Dict[str, Any]], stored: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Articles with a URL not in the stored research and not published before it was last updated.
+        Articles without a URL (synthesized search results, fallback content) never count as new.
+        """
+        known_urls = {a.get('url') for a in stored.get("articles", []) if a.get('url')}
+        last_update = datetime.fromtimestamp(stored.get("updated_at", 0))
+        new_articles = []
+        for article in articles:
+            if not article.get('url') or article['url'] in known_urls:
+                continue
+            published = parse_publish_date(article.get('publish_date'))
+            if published is not None and published < last_update:
+                continue
+            new_articles.append(article)
+        return new_articles
+
 
 # Example usage
 async def main():
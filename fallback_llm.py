@@ -4,14 +4,261 @@ Provides unified API calling with automatic fallback to alternative models when
 """
 
 import asyncio
+import contextvars
 import logging
 import os
-from typing import List, Optional, Dict, Any, Union, TypeVar, TYPE_CHECKING
+import time
+from collections import deque
+from typing import List, Optional, Dict, Any, Callable, Deque, NoReturn, Union, TypeVar, TYPE_CHECKING
+import litellm
 from forecasting_tools.ai_models.general_llm import GeneralLlm
 
+from llm_cache import LLMResponseCache, get_llm_response_cache
+from llm_telemetry import LLMAttempt, current_llm_stage, get_llm_telemetry
+from rate_limiter import estimate_tokens, get_rate_limiter
+from run_logging import structured
+
 T = TypeVar('T')
 logger = logging.getLogger(__name__)
 
+# Telemetry record of the model call running in the current task
+_current_attempt: contextvars.ContextVar[Optional[LLMAttempt]] = contextvars.ContextVar('_current_attempt', default=None)
+
+def is_streaming_unsupported_error(error: BaseException) -> bool:
+    """
+    Whether an exception says the provider or model does not accept stream=True.
+    """
+    message = str(error).lower()
+    return "stream" in message and any(
+        phrase in message for phrase in ("not support", "unsupported", "not available", "not allowed", "not enabled")
+    )
+
+
+class ModelHealth:
+    """
+    Rolling health record for a single model: outcome counts, recent latencies
+    and circuit breaker state.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, model_name: str, latency_history_size: int = 50):
+        self.model_name = model_name
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latencies: Deque[float] = deque(maxlen=latency_history_size)
+        self.circuit_opened_at: Optional[float] = None
+        self.probe_in_flight = False
+        self.last_error: Optional[str] = None
+
+
+class ModelHealthRegistry:
+    """
+    Process-wide registry of model health shared by every FallbackLLM.
+
+    After failure_threshold consecutive failures a model's circuit opens and
+    FallbackLLM moves it to the back of its chain. Once cooldown seconds have
+    passed the circuit is half-open: a single probe call is let through, which
+    closes the circuit on success or re-opens it on failure.
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 300.0, min_latency_samples: int = 5):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.min_latency_samples = min_latency_samples
+        self._models: Dict[str, ModelHealth] = {}
+
+    def get(self, model_name: str) -> ModelHealth:
+        if model_name not in self._models:
+            self._models[model_name] = ModelHealth(model_name)
+        return self._models[model_name]
+
+    def get_state(self, model_name: str) -> str:
+        health = self.get(model_name)
+        if health.circuit_opened_at is None:
+            return ModelHealth.CLOSED
+        if time.monotonic() - health.circuit_opened_at >= self.cooldown:
+            return ModelHealth.HALF_OPEN
+        return ModelHealth.OPEN
+
+    def is_available(self, model_name: str) -> bool:
+        """
+        Whether a call to model_name should be attempted now.
+        """
+        state = self.get_state(model_name)
+        if state == ModelHealth.CLOSED:
+            return True
+        if state == ModelHealth.HALF_OPEN:
+            return not self.get(model_name).probe_in_flight
+        return False
+
+    def record_attempt(self, model_name: str) -> None:
+        if self.get_state(model_name) == ModelHealth.HALF_OPEN:
+            logger.info(f"Circuit for {model_name} is half-open, sending probe call")
+            self.get(model_name).probe_in_flight = True
+
+    def record_success(self, model_name: str, latency: float) -> None:
+        health = self.get(model_name)
+        health.successes += 1
+        health.consecutive_failures = 0
+        health.latencies.append(latency)
+        health.probe_in_flight = False
+        if health.circuit_opened_at is not None:
+            logger.info(f"Circuit for {model_name} closed after successful call")
+            health.circuit_opened_at = None
+
+    def record_failure(self, model_name: str, error: BaseException) -> None:
+        health = self.get(model_name)
+        health.failures += 1
+        health.consecutive_failures += 1
+        health.last_error = str(error)
+        was_probe = health.probe_in_flight
+        health.probe_in_flight = False
+        if was_probe or health.consecutive_failures >= self.failure_threshold:
+            if health.circuit_opened_at is None or was_probe:
+                logger.warning(f"Opening circuit for {model_name} after {health.consecutive_failures} consecutive failures")
+            health.circuit_opened_at = time.monotonic()
+
+    def record_cancelled(self, model_name: str) -> None:
+        """
+        A call was cancelled (e.g. lost a hedged race): neither success nor failure.
+        """
+        self.get(model_name).probe_in_flight = False
+
+    def order_chain(self, model_chain: List[str]) -> List[str]:
+        """
+        Return model_chain with models that should not be called right now moved
+        to the back, keeping chain order within each group. Unhealthy models are
+        deprioritised rather than dropped so a chain is never empty.
+        """
+        available = [m for m in model_chain if self.is_available(m)]
+        unavailable = [m for m in model_chain if not self.is_available(m)]
+        return available + unavailable
+
+    def latency_percentile(self, model_name: str, percentile: float) -> Optional[float]:
+        """
+        Return the given percentile (0-100) of recent latencies for model_name,
+        or None if too few calls have been recorded to say.
+        """
+        samples = self.get(model_name).latencies
+        if len(samples) < self.min_latency_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, round(percentile / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def get_summary(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "state": self.get_state(name),
+                "successes": health.successes,
+                "failures": health.failures,
+                "consecutive_failures": health.consecutive_failures,
+                "median_latency": self.latency_percentile(name, 50),
+                "last_error": health.last_error,
+            }
+            for name, health in self._models.items()
+        }
+
+    def reset(self) -> None:
+        self._models.clear()
+
+
+# Global registry shared by every FallbackLLM in the process
+_model_health_registry: Optional[ModelHealthRegistry] = None
+
+
+def get_model_health_registry() -> ModelHealthRegistry:
+    """
+    Get or create the global model health registry.
+    """
+    global _model_health_registry
+    if _model_health_registry is None:
+        _model_health_registry = ModelHealthRegistry(
+            failure_threshold=int(os.getenv('FALLBACK_LLM_CIRCUIT_FAILURES', '3')),
+            cooldown=float(os.getenv('FALLBACK_LLM_CIRCUIT_COOLDOWN', '300')),
+        )
+    return _model_health_registry
+
+
+class GeneralLlmPool:
+    """
+    Process-wide cache of GeneralLlm clients keyed by their full configuration,
+    so repeated calls reuse one client per (model, api key, temperature, timeout,
+    tries, kwargs) instead of constructing a new one for every attempt.
+    Tracks hits, misses and construction time to report the overhead saved.
+    """
+
+    def __init__(self):
+        self._clients: Dict[tuple, GeneralLlm] = {}
+        self.hits = 0
+        self.misses = 0
+        self.construction_seconds = 0.0
+
+    @staticmethod
+    def make_key(model_name: str, api_key: str, temperature: float, timeout: int, allowed_tries: int, kwargs: Dict[str, Any]) -> tuple:
+        return (
+            model_name,
+            api_key,
+            temperature,
+            timeout,
+            allowed_tries,
+            tuple(sorted((name, repr(value)) for name, value in kwargs.items())),
+        )
+
+    def get(self, model_name: str, api_key: str, temperature: float, timeout: int, allowed_tries: int, **kwargs) -> GeneralLlm:
+        key = self.make_key(model_name, api_key, temperature, timeout, allowed_tries, kwargs)
+        client = self._clients.get(key)
+        if client is not None:
+            self.hits += 1
+            return client
+
+        self.misses += 1
+        start_time = time.perf_counter()
+        client = GeneralLlm(
+            model=model_name,
+            api_key=api_key,
+            temperature=temperature,
+            timeout=timeout,
+            allowed_tries=allowed_tries,
+            **kwargs
+        )
+        self.construction_seconds += time.perf_counter() - start_time
+        self._clients[key] = client
+        return client
+
+    def get_stats(self) -> Dict[str, Any]:
+        average_construction = self.construction_seconds / self.misses if self.misses else 0.0
+        return {
+            "clients": len(self._clients),
+            "hits": self.hits,
+            "misses": self.misses,
+            "average_construction_ms": round(average_construction * 1000, 3),
+            "estimated_saved_seconds": round(self.hits * average_construction, 3),
+        }
+
+    def clear(self) -> None:
+        self._clients.clear()
+        self.hits = 0
+        self.misses = 0
+        self.construction_seconds = 0.0
+
+
+_general_llm_pool: Optional[GeneralLlmPool] = None
+
+
+def get_general_llm_pool() -> GeneralLlmPool:
+    """
+    Get or create the global GeneralLlm client pool.
+    """
+    global _general_llm_pool
+    if _general_llm_pool is None:
+        _general_llm_pool = GeneralLlmPool()
+    return _general_llm_pool
+
 
 class FallbackLLM:
     """
@@ -27,6 +274,13 @@ class FallbackLLM:
         temperature: float = 0.5,
         timeout: int = 60,
         allowed_tries: int = 2,
+        hedged: Optional[bool] = None,
+        hedge_delay: Optional[float] = None,
+        hedge_latency_percentile: Optional[float] = None,
+        hedge_max_in_flight: int = 2,
+        cache: Optional[LLMResponseCache] = None,
+        streaming: Optional[bool] = None,
+        stage: Optional[str] = None,
         **kwargs
     ):
         """
@@ -38,6 +292,20 @@ class FallbackLLM:
             temperature: Temperature parameter for all models
             timeout: Timeout in seconds for all models
             allowed_tries: Number of allowed retries per model
+            hedged: Race the chain instead of walking it strictly in order
+                (falls back to FALLBACK_LLM_HEDGED env var, default off)
+            hedge_delay: Seconds to wait on a model before also starting the next one
+                (falls back to FALLBACK_LLM_HEDGE_DELAY env var, default 20)
+            hedge_latency_percentile: If set, wait this percentile (0-100) of the model's
+                recent latencies instead of hedge_delay once enough calls have been seen
+                (falls back to FALLBACK_LLM_HEDGE_PERCENTILE env var)
+            hedge_max_in_flight: Maximum number of models racing at once in hedged mode
+            cache: Response cache for invoke (falls back to the global cache configured
+                by LLM_CACHE_MODE, which is off by default)
+            streaming: Let invoke_streaming stream responses and stop early
+                (falls back to FALLBACK_LLM_STREAMING env var, default on)
+            stage: Pipeline stage this LLM serves (researcher, forecaster1, synthesizer, parser...),
+                recorded with each call's telemetry unless the caller sets one with llm_stage
             **kwargs: Additional parameters passed to all GeneralLlm instances
         """
         self.model_chain = model_chain
@@ -47,6 +315,22 @@ class FallbackLLM:
         self.allowed_tries = allowed_tries
         self.kwargs = kwargs
 
+        if hedged is None:
+            hedged = os.getenv('FALLBACK_LLM_HEDGED', 'false').lower() == 'true'
+        if hedge_delay is None:
+            hedge_delay = float(os.getenv('FALLBACK_LLM_HEDGE_DELAY', '20'))
+        if hedge_latency_percentile is None and os.getenv('FALLBACK_LLM_HEDGE_PERCENTILE'):
+            hedge_latency_percentile = float(os.getenv('FALLBACK_LLM_HEDGE_PERCENTILE'))
+        self.hedged = hedged
+        self.hedge_delay = hedge_delay
+        self.hedge_latency_percentile = hedge_latency_percentile
+        self.hedge_max_in_flight = max(1, hedge_max_in_flight)
+        self.cache = cache if cache is not None else get_llm_response_cache()
+        if streaming is None:
+            streaming = os.getenv('FALLBACK_LLM_STREAMING', 'true').lower() == 'true'
+        self.streaming = streaming
+        self.stage = stage
+
         # Validate that we have an API key
         if not self.api_key:
             logger.error("No OpenRouter API key provided. Set OPENROUTER_API_KEY environment variable.")
@@ -67,6 +351,9 @@ class FallbackLLM:
         """
         Invoke the LLM with the given prompt, trying models in fallback order.
 
+        In hedged mode the next model in the chain is started alongside a slow model
+        and the first successful response wins (see _invoke_hedged).
+
         Args:
             prompt: The prompt to send to the LLM
 
@@ -76,83 +363,338 @@ class FallbackLLM:
         Raises:
             RuntimeError: If all models in the chain fail
         """
-        # Log the complete prompt for debugging
-        main_logger = logging.getLogger('__main__')
-        main_logger.info("=== FALLBACK LLM COMPLETE PROMPT ===")
-        main_logger.info(f"Model chain: {self.model_chain}")
-        main_logger.info(f"Prompt length: {len(prompt)} characters")
-        main_logger.info(f"Full prompt:\n{prompt}")
-        main_logger.info("=== END PROMPT ===\n")
+        # The full prompt goes to the run log's blob store, not into the message
+        logger.info(
+            f"Invoking chain {self.model_chain[0]} ({len(prompt)} character prompt)",
+            extra=structured("llm_prompt", {"prompt": prompt}, model_chain=self.model_chain),
+        )
+
+        if self.cache is not None:
+            cached_response = await self.cache.get(self._cache_model_key(), self.temperature, prompt)
+            if cached_response is not None:
+                logger.info(f"LLM cache hit for chain {self.model_chain[0]} ({len(prompt)} character prompt)")
+                return cached_response
+
+        response = await self._invoke_uncached(prompt)
+        if self.cache is not None:
+            await self.cache.put(self._cache_model_key(), self.temperature, prompt, response)
+        return response
+
+    async def invoke_streaming(self, prompt: str, stop_when: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        Invoke the LLM with a streamed response, stopping as soon as the answer is complete.
 
-        last_error = None
+        After each streamed chunk stop_when is called with the response so far; once it
+        returns True the stream is closed, so the model stops generating the tail after
+        its answer, and the response up to that point is returned. Models are tried in
+        fallback order, each up to allowed_tries times like invoke. A model whose provider
+        rejects streaming is called once without it instead; other failures move on to the
+        next model, so the chain is never walked twice. With streaming off this is invoke.
 
-        # Try each model in the chain
-        for i, model_name in enumerate(self.model_chain):
+        Args:
+            prompt: The prompt to send to the LLM
+            stop_when: Predicate on the response so far, e.g. "final probability seen"
+
+        Returns:
+            The LLM response, possibly cut short after the answer
+        """
+        if not self.streaming:
+            return await self.invoke(prompt)
+
+        # Early-stopped responses differ from full ones, so they are cached separately
+        cache_key = f"{self._cache_model_key()}|stream:{getattr(stop_when, '__name__', 'none')}"
+        if self.cache is not None:
+            cached_response = await self.cache.get(cache_key, self.temperature, prompt)
+            if cached_response is not None:
+                logger.info(f"LLM cache hit for streamed chain {self.model_chain[0]} ({len(prompt)} character prompt)")
+                return cached_response
+
+        last_error = None
+        model_chain = self._get_ordered_chain()
+        for i, model_name in enumerate(model_chain):
             try:
-                logger.info(f"Trying model {i+1}/{len(self.model_chain)}: {model_name}")
-
-                # Create GeneralLlm instance for this model
-                llm = GeneralLlm(
-                    model=model_name,
-                    api_key=self.api_key,
-                    temperature=self.temperature,
-                    timeout=self.timeout,
-                    allowed_tries=self.allowed_tries,
-                    **self.kwargs
+                logger.info(f"Streaming model {i+1}/{len(model_chain)}: {model_name}")
+                response = await self._call_with_health_tracking(
+                    model_name, self._stream_model_with_retries(model_name, prompt, stop_when), prompt
                 )
+                break
+            except Exception as e:
+                self._log_model_failure(model_name, e)
+                print("⏭️  TRYING NEXT MODEL IN CHAIN\n")
+                last_error = e
+        else:
+            self._raise_all_failed(last_error)
 
-                # Attempt to invoke the model with console output
-                logger.info(f"Making API call to model: {model_name}")
-                print(f"\n🔄 CALLING MODEL: {model_name}")
-                print(f"🔑 API Key: {'***' + self.api_key[-4:] if self.api_key else 'None'}")
-                print(f"🌡️  Temperature: {self.temperature}")
-                print(f"⏱️  Timeout: {self.timeout}s")
-                print(f"📝 Prompt length: {len(prompt)} characters")
-                main_logger.info(f"=== MAKING API CALL TO {model_name} ===")
-                main_logger.info(f"API Key: {'***' + self.api_key[-4:] if self.api_key else 'None'}")
-                main_logger.info(f"Temperature: {self.temperature}")
-                main_logger.info(f"Timeout: {self.timeout}")
-                main_logger.info(f"Prompt length: {len(prompt)} characters")
-                main_logger.info(f"Prompt preview:\n{prompt[:200]}{'...' if len(prompt) > 200 else ''}")
-                main_logger.info("=== END API CALL DETAILS ===\n")
-                print("⏳ Waiting for response...\n")
-
-                response = await llm.invoke(prompt)
-
-                # Success! Log and return with console output for GitHub Actions
-                logger.info(f"Model {model_name} succeeded")
-                print(f"\n🎯 MODEL SUCCESS: {model_name}")
-                print(f"📊 Response length: {len(response)} characters")
-                print(f"📄 Response preview: {response[:200]}{'...' if len(response) > 200 else ''}")
-                main_logger.info(f"=== SUCCESSFUL RESPONSE FROM {model_name} ===")
-                main_logger.info(f"Response length: {len(response)} characters")
-                main_logger.info(f"Response preview:\n{response[:300]}{'...' if len(response) > 300 else ''}")
-                main_logger.info(f"Full response:\n{response}")
-                main_logger.info("=== END RESPONSE ===\n")
-                print("✅ API CALL COMPLETED SUCCESSFULLY\n")
-                return response
+        if self.cache is not None:
+            await self.cache.put(cache_key, self.temperature, prompt, response)
+        return response
+
+    async def _stream_model_with_retries(self, model_name: str, prompt: str, stop_when: Optional[Callable[[str], bool]]) -> str:
+        """
+        Stream one model, retrying up to allowed_tries times as GeneralLlm.invoke does.
+        If the provider rejects streaming, the model is called once without it instead.
+        """
+        tries = max(1, self.allowed_tries)
+        for attempt in range(1, tries + 1):
+            try:
+                return await self._stream_model(model_name, prompt, stop_when)
+            except Exception as e:
+                if is_streaming_unsupported_error(e):
+                    logger.warning(f"Model {model_name} does not support streaming ({e}), calling it without streaming")
+                    return await self._get_client(model_name).invoke(prompt)
+                if attempt == tries:
+                    raise
+                logger.info(f"Streaming {model_name} failed (try {attempt}/{tries}): {e}")
+                await asyncio.sleep(1)
+
+    async def _stream_model(self, model_name: str, prompt: str, stop_when: Optional[Callable[[str], bool]]) -> str:
+        """
+        Stream one model's response, closing the stream once stop_when is satisfied.
+        """
+        llm = self._get_client(model_name)
+
+        stream = await litellm.acompletion(
+            messages=llm.model_input_to_message(prompt),
+            stream=True,
+            **llm.litellm_kwargs,
+        )
+        response = ""
+        stopped_early = False
+        attempt = _current_attempt.get()
+        if attempt is not None:
+            attempt.streamed = True
+        try:
+            async for chunk in stream:
+                usage = getattr(chunk, "usage", None)
+                if attempt is not None and usage is not None:
+                    attempt.set_usage(getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None))
+                choices = getattr(chunk, "choices", None)
+                if not choices:
+                    continue
+                piece = getattr(choices[0].delta, "content", None)
+                if not piece:
+                    continue
+                if attempt is not None:
+                    attempt.first_byte()
+                response += piece
+                if stop_when is not None and stop_when(response):
+                    stopped_early = True
+                    break
+        finally:
+            close = getattr(stream, "aclose", None)
+            if close is not None:
+                await close()
+
+        if not response.strip():
+            raise ValueError(f"Empty streamed response from {model_name}")
+
+        logger.info(
+            f"Model {model_name} streamed {len(response)} characters{' (stopped early)' if stopped_early else ''}",
+            extra=structured("llm_response", {"response": response}, model=model_name, streamed=True, stopped_early=stopped_early),
+        )
+        print(f"🎯 MODEL SUCCESS: {model_name} ({len(response)} characters{', stopped early' if stopped_early else ''})")
+        return response
+
+    def _cache_model_key(self) -> str:
+        """
+        Cache responses per model chain (any model in the chain may have answered) and stage, so
+        forecasters sharing a chain, temperature and prompt stay independent samples.
+        """
+        key = "|".join(self.model_chain)
+        return f"{key}|stage:{self.stage}" if self.stage else key
 
+    async def _invoke_uncached(self, prompt: str) -> str:
+        if self.hedged and len(self.model_chain) > 1:
+            return await self._invoke_hedged(prompt)
+
+        last_error = None
+        model_chain = self._get_ordered_chain()
+
+        # Try each model in the chain
+        for i, model_name in enumerate(model_chain):
+            try:
+                logger.info(f"Trying model {i+1}/{len(model_chain)}: {model_name}")
+                return await self._invoke_model(model_name, prompt)
             except Exception as e:
-                error_msg = f"Model {model_name} failed: {str(e)}"
-                logger.warning(error_msg)
-                print(f"\n❌ MODEL FAILED: {model_name}")
-                print(f"🚫 Error: {str(e)}")
-                main_logger.info(f"=== MODEL {model_name} FAILED ===")
-                main_logger.info(error_msg)
-                main_logger.info("=== END ERROR ===\n")
+                self._log_model_failure(model_name, e)
                 print("⏭️  TRYING NEXT MODEL IN CHAIN\n")
                 last_error = e
                 continue
 
-        # All models failed
+        self._raise_all_failed(last_error)
+
+    async def _invoke_hedged(self, prompt: str) -> str:
+        """
+        Race the model chain: start the next model whenever the newest one has been
+        running longer than its hedge delay, or as soon as a model fails. Models are
+        still started in chain order. Returns the first successful response and
+        cancels the remaining in-flight calls.
+        """
+        pending: Dict[asyncio.Task, str] = {}
+        model_chain = self._get_ordered_chain()
+        next_index = 0
+        last_error = None
+
+        def start_next_model() -> str:
+            nonlocal next_index
+            model_name = model_chain[next_index]
+            next_index += 1
+            logger.info(f"Trying model {next_index}/{len(model_chain)}: {model_name} (hedged, {len(pending)} already in flight)")
+            pending[asyncio.create_task(self._invoke_model(model_name, prompt))] = model_name
+            return model_name
+
+        newest_model = start_next_model()
+        try:
+            while pending:
+                can_hedge = next_index < len(model_chain) and len(pending) < self.hedge_max_in_flight
+                wait_timeout = self._get_hedge_delay(newest_model) if can_hedge else None
+                done, _ = await asyncio.wait(pending, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    logger.info(f"Model {newest_model} slower than {wait_timeout:.1f}s, hedging with next model in chain")
+                    print(f"\n🏁 HEDGING: {newest_model} is slow, also starting next model in chain")
+                    newest_model = start_next_model()
+                    continue
+
+                for task in done:
+                    model_name = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if pending:
+                            logger.info(f"Hedged call won by {model_name}, cancelling {list(pending.values())}")
+                        return task.result()
+                    self._log_model_failure(model_name, error)
+                    last_error = error
+
+                if next_index < len(model_chain) and len(pending) < self.hedge_max_in_flight:
+                    print("⏭️  TRYING NEXT MODEL IN CHAIN\n")
+                    newest_model = start_next_model()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        self._raise_all_failed(last_error)
+
+    def _get_ordered_chain(self) -> List[str]:
+        """
+        The model chain with models whose circuit is open moved to the back.
+        """
+        model_chain = get_model_health_registry().order_chain(self.model_chain)
+        if model_chain != self.model_chain:
+            skipped = [m for m in self.model_chain if not get_model_health_registry().is_available(m)]
+            logger.info(f"Deprioritising unhealthy models: {skipped}")
+        return model_chain
+
+    def _get_hedge_delay(self, model_name: str) -> float:
+        """
+        How long to give model_name before hedging: the configured percentile of its
+        recent latencies when known, otherwise the fixed hedge_delay.
+        """
+        if self.hedge_latency_percentile is not None:
+            learned_delay = get_model_health_registry().latency_percentile(model_name, self.hedge_latency_percentile)
+            if learned_delay is not None:
+                return learned_delay
+        return self.hedge_delay
+
+    async def _invoke_model(self, model_name: str, prompt: str) -> str:
+        """
+        Call a single model from the chain, recording its latency on success.
+        """
+        llm = self._get_client(model_name)
+
+        logger.info(
+            f"Making API call to model: {model_name}",
+            extra=structured(
+                "llm_call",
+                model=model_name,
+                api_key_configured=bool(self.api_key),
+                temperature=self.temperature,
+                timeout=self.timeout,
+                prompt_chars=len(prompt),
+            ),
+        )
+
+        response = await self._call_with_health_tracking(model_name, llm.invoke(prompt), prompt)
+
+        # One console line per call for GitHub Actions; the full response is in the run log
+        logger.info(
+            f"Model {model_name} succeeded ({len(response)} characters)",
+            extra=structured("llm_response", {"response": response}, model=model_name, streamed=False),
+        )
+        print(f"🎯 MODEL SUCCESS: {model_name} ({len(response)} characters)")
+        return response
+
+    def _get_client(self, model_name: str) -> GeneralLlm:
+        """
+        Get the shared GeneralLlm client for model_name with this FallbackLLM's settings.
+        """
+        return get_general_llm_pool().get(
+            model_name,
+            self.api_key,
+            self.temperature,
+            self.timeout,
+            self.allowed_tries,
+            **self.kwargs
+        )
+
+    def warm_up(self) -> int:
+        """
+        Build the clients for every model in the chain ahead of the first call.
+        Returns the number of clients available for this chain.
+        """
+        for model_name in self.model_chain:
+            self._get_client(model_name)
+        return len(self.model_chain)
+
+    async def _call_with_health_tracking(self, model_name: str, call: Any, prompt: Any = "") -> Any:
+        """
+        Await a call to model_name once the shared rate limiter admits it, recording its outcome
+        and latency (excluding rate limiter wait) in the health registry.
+        """
+        rate_limiter = get_rate_limiter()
+        try:
+            await rate_limiter.acquire(model_name, estimate_tokens(prompt))
+        except BaseException:
+            call.close()
+            raise
+
+        registry = get_model_health_registry()
+        registry.record_attempt(model_name)
+        telemetry = get_llm_telemetry()
+        chain_index = self.model_chain.index(model_name) if model_name in self.model_chain else -1
+        attempt = telemetry.start(model_name, chain_index, current_llm_stage(self.stage), prompt)
+        # Lets _stream_model mark the first byte and provider-reported usage on this attempt
+        attempt_token = _current_attempt.set(attempt)
+        start_time = time.monotonic()
+        try:
+            result = await call
+        except asyncio.CancelledError as e:
+            telemetry.finish(attempt, error=e)
+            registry.record_cancelled(model_name)
+            raise
+        except Exception as e:
+            telemetry.finish(attempt, error=e)
+            registry.record_failure(model_name, e)
+            rate_limiter.record_error(model_name, e)
+            raise
+        finally:
+            _current_attempt.reset(attempt_token)
+        telemetry.finish(attempt, response=result)
+        registry.record_success(model_name, time.monotonic() - start_time)
+        rate_limiter.record_success(model_name)
+        return result
+
+    def _log_model_failure(self, model_name: str, error: BaseException) -> None:
+        error_msg = f"Model {model_name} failed: {str(error)}"
+        logger.warning(error_msg, extra=structured("llm_failure", model=model_name, error_type=type(error).__name__))
+        print(f"❌ MODEL FAILED: {model_name}: {str(error)}")
+
+    def _raise_all_failed(self, last_error: Optional[BaseException]) -> NoReturn:
         final_error_msg = f"All {len(self.model_chain)} models in fallback chain failed. Last error: {last_error}"
-        logger.error(final_error_msg)
-        print(f"\n💥 ALL MODELS FAILED")
-        print(f"❌ Tried {len(self.model_chain)} models in fallback chain")
-        print(f"🚫 Last error: {last_error}")
-        main_logger.info("=== ALL MODELS IN FALLBACK CHAIN FAILED ===")
-        main_logger.info(final_error_msg)
-        main_logger.info("=== END ERROR ===\n")
+        logger.error(final_error_msg, extra=structured("llm_chain_failed", model_chain=self.model_chain))
+        print(f"💥 ALL MODELS FAILED: tried {len(self.model_chain)} models, last error: {last_error}")
         raise RuntimeError(final_error_msg)
 
     async def __call__(self, *args, **kwargs) -> str:
@@ -185,7 +727,11 @@ class FallbackLLM:
             "api_key_configured": bool(self.api_key),
             "temperature": self.temperature,
             "timeout": self.timeout,
-            "allowed_tries": self.allowed_tries
+            "allowed_tries": self.allowed_tries,
+            "hedged": self.hedged,
+            "hedge_delay": self.hedge_delay,
+            "hedge_latency_percentile": self.hedge_latency_percentile,
+            "streaming": self.streaming,
         }
 
     async def invoke_and_return_verified_type(
@@ -198,20 +744,15 @@ class FallbackLLM:
         Invoke the LLM and return a verified type, with fallback through the model chain.
         Matches the interface expected by structure_output and other forecasting-tools components.
         """
-        for i, model_name in enumerate(self.model_chain):
+        for i, model_name in enumerate(self._get_ordered_chain()):
             try:
-                llm = GeneralLlm(
-                    model=model_name,
-                    api_key=self.api_key,
-                    temperature=self.temperature,
-                    timeout=self.timeout,
-                    allowed_tries=self.allowed_tries,
-                    **self.kwargs
-                )
+                llm = self._get_client(model_name)
                 # Note: GeneralLlm.invoke_and_return_verified_type may not accept the allowed_invoke_tries_for_failed_output parameter
                 # So we don't pass it to avoid interface mismatch
-                response = await llm.invoke_and_return_verified_type(
-                    input, normal_complex_or_pydantic_type
+                response = await self._call_with_health_tracking(
+                    model_name,
+                    llm.invoke_and_return_verified_type(input, normal_complex_or_pydantic_type),
+                    input,
                 )
                 return response
             except Exception as e:
@@ -0,0 +1,108 @@
+"""
+In-run registry of forecasting work, keyed by question id.
+Lets a question that shows up in several tournament lists (or twice in one mode) be
+researched and forecast once per run, with later occurrences reusing the stored result.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from forecasting_tools import ForecastReport, MetaculusQuestion
+
+from question_inventory import get_question_key
+
+logger = logging.getLogger(__name__)
+
+
+class ForecastRegistry:
+    """
+    Memoises research, final predictions and finished reports per question for one run.
+
+    Computations are single-flight: if a second caller asks for a result that is still
+    being computed it awaits the same task instead of starting another. Failures are not
+    stored, so a later occurrence retries the work.
+    """
+
+    def __init__(self):
+        self._results: Dict[Tuple[str, Hashable], Any] = {}
+        self._in_flight: Dict[Tuple[str, Hashable], asyncio.Task] = {}
+        self._reports: Dict[Hashable, ForecastReport] = {}
+        self.computed: Dict[str, int] = {}
+        self.reused: Dict[str, int] = {}
+
+    @staticmethod
+    def research_key(question: MetaculusQuestion) -> Hashable:
+        return get_question_key(question)
+
+    @staticmethod
+    def prediction_key(question: MetaculusQuestion, research: str) -> Hashable:
+        """
+        Predictions depend on the research they were made from, so key on both.
+        """
+        research_hash = hashlib.sha256((research or "").encode("utf-8")).hexdigest()
+        return (get_question_key(question), research_hash)
+
+    async def get_or_compute(self, kind: str, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the stored result for (kind, key), computing it once if needed.
+
+        Args:
+            kind: Namespace of the result, e.g. "research" or "prediction"
+            key: Identity of the result within its namespace
+            compute: Coroutine factory producing the result on a miss
+        """
+        entry = (kind, key)
+        if entry in self._results:
+            self.reused[kind] = self.reused.get(kind, 0) + 1
+            logger.info(f"Reusing {kind} for question {key if kind == 'research' else key[0]} from earlier in this run")
+            return self._results[entry]
+
+        task = self._in_flight.get(entry)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            self.computed[kind] = self.computed.get(kind, 0) + 1
+            task = asyncio.create_task(compute())
+            self._in_flight[entry] = task
+        else:
+            self.reused[kind] = self.reused.get(kind, 0) + 1
+
+        try:
+            # shield so one cancelled waiter does not cancel the work shared with the others
+            result = await asyncio.shield(task)
+        finally:
+            if task.done() and self._in_flight.get(entry) is task:
+                del self._in_flight[entry]
+        self._results[entry] = result
+        return result
+
+    def get_report(self, question: MetaculusQuestion) -> Optional[ForecastReport]:
+        return self._reports.get(get_question_key(question))
+
+    def record_report(self, question: MetaculusQuestion, report: ForecastReport) -> None:
+        self._reports[get_question_key(question)] = report
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "reports": len(self._reports),
+            "computed": dict(self.computed),
+            "reused": dict(self.reused),
+        }
+
+
+# Global instance for the current run
+_forecast_registry_instance: Optional[ForecastRegistry] = None
+_forecast_registry_configured = False
+
+
+def get_forecast_registry() -> Optional[ForecastRegistry]:
+    """
+    Get the global forecast registry, or None if FORECAST_DEDUP is set to false.
+    """
+    global _forecast_registry_instance, _forecast_registry_configured
+    if not _forecast_registry_configured:
+        _forecast_registry_configured = True
+        if os.getenv('FORECAST_DEDUP', 'true').lower() == 'true':
+            _forecast_registry_instance = ForecastRegistry()
+    return _forecast_registry_instance
@@ -0,0 +1,245 @@
+"""
+Content-addressed on-disk cache for LLM responses.
+Lets re-runs, crash recovery and overlapping question sets reuse responses to identical prompts,
+and lets test scripts replay recorded responses offline.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from async_utils import LoopLocalSemaphore
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCacheMiss(RuntimeError):
+    """
+    Raised in replay mode when a prompt has no recorded response.
+    """
+
+
+class LLMResponseCache:
+    """
+    Persistent LLM response cache keyed on (model, temperature, prompt hash).
+
+    Each entry is one JSON file named by the SHA-256 of its key, written atomically.
+    Entries older than ttl_seconds are treated as misses. When the cache grows past
+    max_size_bytes the least recently used entries (by file modification time, which
+    is refreshed on every hit) are evicted.
+
+    Modes:
+        read_write: serve hits and store new responses (default)
+        read_only: serve hits but never write
+        replay: serve hits regardless of age and raise LLMCacheMiss on a miss,
+            so test scripts can run offline against recorded responses
+    """
+
+    MODES = ("read_write", "read_only", "replay")
+
+    def __init__(
+        self,
+        cache_dir: str = ".llm_cache",
+        ttl_seconds: Optional[float] = 24 * 60 * 60,
+        max_size_bytes: int = 500 * 1024 * 1024,
+        mode: str = "read_write",
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries
+            ttl_seconds: Maximum entry age in seconds (None or 0 = never expire)
+            max_size_bytes: Total size above which least recently used entries are evicted
+            mode: One of read_write, read_only, replay
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown LLM cache mode '{mode}', expected one of {self.MODES}")
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds or None
+        self.max_size_bytes = max_size_bytes
+        self.mode = mode
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.expired = 0
+        self.evictions = 0
+
+        # digest -> (size in bytes, last access time); loaded from disk on first use
+        self._index: Optional[Dict[str, Tuple[int, float]]] = None
+        self._total_size = 0
+        self._lock = LoopLocalSemaphore(1)  # The global cache outlives any single event loop
+
+    @property
+    def read_only(self) -> bool:
+        return self.mode != "read_write"
+
+    @staticmethod
+    def make_key(model: str, temperature: float, prompt: str) -> str:
+        """
+        Return the content address for a (model, temperature, prompt) triple.
+        """
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        raw_key = json.dumps([model, temperature, prompt_hash])
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def _path_for(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def _load_index(self) -> None:
+        index: Dict[str, Tuple[int, float]] = {}
+        if os.path.isdir(self.cache_dir):
+            for subdir in os.listdir(self.cache_dir):
+                subdir_path = os.path.join(self.cache_dir, subdir)
+                if not os.path.isdir(subdir_path):
+                    continue
+                for filename in os.listdir(subdir_path):
+                    if not filename.endswith(".json"):
+                        continue
+                    stat = os.stat(os.path.join(subdir_path, filename))
+                    index[filename[:-len(".json")]] = (stat.st_size, stat.st_mtime)
+        self._index = index
+        self._total_size = sum(size for size, _ in index.values())
+        logger.info(f"Loaded LLM cache index from {self.cache_dir}: {len(index)} entries, {self._total_size} bytes")
+
+    async def _ensure_index(self) -> None:
+        if self._index is None:
+            await asyncio.to_thread(self._load_index)
+
+    async def get(self, model: str, temperature: float, prompt: str) -> Optional[str]:
+        """
+        Return the cached response for this call, or None on a miss.
+
+        Raises:
+            LLMCacheMiss: On a miss in replay mode
+        """
+        digest = self.make_key(model, temperature, prompt)
+        async with self._lock:
+            await self._ensure_index()
+            entry = await asyncio.to_thread(self._read_entry, digest)
+            if entry is not None and self.mode != "replay" and self.ttl_seconds is not None:
+                if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+                    self.expired += 1
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                if self.mode == "replay":
+                    raise LLMCacheMiss(f"No recorded response for model {model} (key {digest[:12]})")
+                return None
+
+            self.hits += 1
+            now = time.time()
+            if digest in self._index:
+                self._index[digest] = (self._index[digest][0], now)
+            if not self.read_only:
+                await asyncio.to_thread(self._touch, digest, now)
+            return entry["response"]
+
+    async def put(self, model: str, temperature: float, prompt: str, response: str) -> None:
+        """
+        Store a response. Does nothing in read_only and replay modes.
+        """
+        if self.read_only:
+            return
+        digest = self.make_key(model, temperature, prompt)
+        entry = {
+            "model": model,
+            "temperature": temperature,
+            "prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "created_at": time.time(),
+            "response": response,
+        }
+        async with self._lock:
+            await self._ensure_index()
+            size = await asyncio.to_thread(self._write_entry, digest, entry)
+            previous_size = self._index.get(digest, (0, 0.0))[0]
+            self._index[digest] = (size, time.time())
+            self._total_size += size - previous_size
+            self.writes += 1
+            if self._total_size > self.max_size_bytes:
+                await asyncio.to_thread(self._evict)
+
+    def _read_entry(self, digest: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path_for(digest), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable LLM cache entry {digest[:12]}: {e}")
+            return None
+
+    def _write_entry(self, digest: str, entry: Dict[str, Any]) -> int:
+        path = self._path_for(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(temp_path, path)
+        return os.path.getsize(path)
+
+    def _touch(self, digest: str, now: float) -> None:
+        try:
+            os.utime(self._path_for(digest), (now, now))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        for digest, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total_size <= self.max_size_bytes:
+                break
+            try:
+                os.remove(self._path_for(digest))
+            except FileNotFoundError:
+                pass
+            del self._index[digest]
+            self._total_size -= size
+            self.evictions += 1
+        logger.info(f"Evicted LLM cache entries down to {self._total_size} bytes ({self.evictions} evictions so far)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "writes": self.writes,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "entries": len(self._index) if self._index is not None else None,
+            "size_bytes": self._total_size if self._index is not None else None,
+        }
+
+
+# Global instance configured from the environment
+_llm_cache_instance: Optional[LLMResponseCache] = None
+_llm_cache_configured = False
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the global response cache, or None if caching is disabled.
+
+    Configured by LLM_CACHE_MODE (off, read_write, read_only, replay; default off),
+    LLM_CACHE_DIR (default .llm_cache), LLM_CACHE_TTL in seconds (default 86400, 0 = never expire)
+    and LLM_CACHE_MAX_MB (default 500).
+    """
+    global _llm_cache_instance, _llm_cache_configured
+    if not _llm_cache_configured:
+        _llm_cache_configured = True
+        mode = os.getenv('LLM_CACHE_MODE', 'off').lower()
+        if mode != 'off':
+            _llm_cache_instance = LLMResponseCache(
+                cache_dir=os.getenv('LLM_CACHE_DIR', '.llm_cache'),
+                ttl_seconds=float(os.getenv('LLM_CACHE_TTL', str(24 * 60 * 60))),
+                max_size_bytes=int(float(os.getenv('LLM_CACHE_MAX_MB', '500')) * 1024 * 1024),
+                mode=mode,
+            )
+            logger.info(f"LLM response cache enabled: mode={mode}, dir={_llm_cache_instance.cache_dir}")
+    return _llm_cache_instance
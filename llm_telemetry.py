@@ -0,0 +1,301 @@
+"""
+Per-attempt LLM telemetry.
+FallbackLLM records one attempt per model call: model, position in the chain, calling stage,
+outcome class, time to first byte, latency, tokens and estimated cost. Attempts are aggregated
+into per-model and per-stage histograms and written to a JSON file at the end of the run, so we
+can see which model or stage is eating the time budget.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import litellm
+
+from rate_limiter import estimate_tokens, is_rate_limit_error
+
+logger = logging.getLogger(__name__)
+
+# Upper edges (seconds) of the latency and time-to-first-byte histogram buckets; the last bucket is open
+LATENCY_BUCKETS = (1, 2, 5, 10, 20, 30, 60, 120)
+
+SUCCESS = "success"
+CANCELLED = "cancelled"
+TIMEOUT = "timeout"
+RATE_LIMITED = "rate_limited"
+AUTH = "auth"
+SERVER_ERROR = "server_error"
+EMPTY_RESPONSE = "empty_response"
+OTHER_ERROR = "other_error"
+
+
+# Stage set by the caller for every LLM call in the current task, overriding the LLM's own tag
+_stage_override: ContextVar[Optional[str]] = ContextVar('_stage_override', default=None)
+
+
+@contextmanager
+def llm_stage(stage: str) -> Iterator[None]:
+    """
+    Record LLM calls made inside the block (including tasks started there) under stage,
+    whichever configured LLM makes them:
+
+        with llm_stage("research"):
+            research = await EnhancedRetrievalSystem(default_llm).enhanced_retrieve(question)
+    """
+    token = _stage_override.set(stage)
+    try:
+        yield
+    finally:
+        _stage_override.reset(token)
+
+
+def current_llm_stage(default: Optional[str] = None) -> Optional[str]:
+    """
+    The stage set by an enclosing llm_stage block, else default.
+    """
+    return _stage_override.get() or default
+
+
+def classify_failure(error: BaseException) -> str:
+    """
+    Coarse failure class of an exception raised by a model call.
+    """
+    if isinstance(error, asyncio.CancelledError):
+        return CANCELLED
+    name = type(error).__name__
+    message = str(error).lower()
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)) or "timeout" in name.lower() or "timed out" in message:
+        return TIMEOUT
+    if is_rate_limit_error(error):
+        return RATE_LIMITED
+    if status in (401, 403) or name in ("AuthenticationError", "PermissionDeniedError"):
+        return AUTH
+    if (isinstance(status, int) and status >= 500) or name in (
+        "InternalServerError", "ServiceUnavailableError", "APIConnectionError", "BadGatewayError"
+    ):
+        return SERVER_ERROR
+    if "empty" in message and "response" in message:
+        return EMPTY_RESPONSE
+    return OTHER_ERROR
+
+
+class LLMAttempt:
+    """
+    One call to one model, filled in as the call progresses.
+    """
+
+    def __init__(self, model: str, chain_index: int, stage: Optional[str], prompt_tokens: int):
+        self.model = model
+        self.chain_index = chain_index
+        self.stage = stage or "unknown"
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens: Optional[int] = None
+        self.tokens_estimated = True
+        self.started_at = time.time()
+        self._start = time.monotonic()
+        self.ttfb: Optional[float] = None
+        self.latency: Optional[float] = None
+        self.outcome: Optional[str] = None
+        self.error: Optional[str] = None
+        self.cost: Optional[float] = None
+        self.streamed = False
+
+    def first_byte(self) -> None:
+        """
+        Mark the first streamed chunk (only the first call counts).
+        """
+        if self.ttfb is None:
+            self.ttfb = time.monotonic() - self._start
+
+    def set_usage(self, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+        """
+        Replace the estimated token counts with ones reported by the provider.
+        """
+        if prompt_tokens:
+            self.prompt_tokens = prompt_tokens
+        if completion_tokens is not None:
+            self.completion_tokens = completion_tokens
+            self.tokens_estimated = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="milliseconds"),
+            "model": self.model,
+            "chain_index": self.chain_index,
+            "stage": self.stage,
+            "outcome": self.outcome,
+            "error": self.error,
+            "streamed": self.streamed,
+            "ttfb": self.ttfb,
+            "latency": self.latency,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "tokens_estimated": self.tokens_estimated,
+            "cost": self.cost,
+        }
+
+
+def _histogram(values: List[float]) -> Dict[str, int]:
+    labels = [f"<={edge}s" for edge in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+    counts = dict.fromkeys(labels, 0)
+    for value in values:
+        for edge, label in zip(LATENCY_BUCKETS, labels):
+            if value <= edge:
+                counts[label] += 1
+                break
+        else:
+            counts[labels[-1]] += 1
+    return counts
+
+
+def _percentile(ordered: List[float], percentile: float) -> Optional[float]:
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(percentile / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize_attempts(attempts: List[LLMAttempt]) -> Dict[str, Any]:
+    """
+    Counts, outcome classes, latency/TTFB percentiles and histograms, tokens and cost.
+    """
+    latencies = sorted(a.latency for a in attempts if a.latency is not None and a.outcome == SUCCESS)
+    ttfbs = sorted(a.ttfb for a in attempts if a.ttfb is not None)
+    outcomes: Dict[str, int] = {}
+    for attempt in attempts:
+        outcomes[attempt.outcome or "in_flight"] = outcomes.get(attempt.outcome or "in_flight", 0) + 1
+    costs = [a.cost for a in attempts if a.cost is not None]
+    return {
+        "attempts": len(attempts),
+        "outcomes": outcomes,
+        "total_seconds": round(sum(a.latency or 0.0 for a in attempts), 3),
+        "latency_p50": _percentile(latencies, 50),
+        "latency_p90": _percentile(latencies, 90),
+        "latency_histogram": _histogram(latencies),
+        "ttfb_p50": _percentile(ttfbs, 50),
+        "ttfb_histogram": _histogram(ttfbs),
+        "prompt_tokens": sum(a.prompt_tokens for a in attempts),
+        "completion_tokens": sum(a.completion_tokens or 0 for a in attempts),
+        "cost": round(sum(costs), 6) if costs else None,
+    }
+
+
+class LLMTelemetry:
+    """
+    Collects LLMAttempt records for the run and aggregates them per model and per stage.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.attempts: List[LLMAttempt] = []
+        self._unpriced_models: set = set()
+
+    def start(self, model: str, chain_index: int, stage: Optional[str], prompt: Any) -> Optional[LLMAttempt]:
+        """
+        Begin recording an attempt, or return None when telemetry is disabled.
+        """
+        if not self.enabled:
+            return None
+        attempt = LLMAttempt(model, chain_index, stage, estimate_tokens(prompt))
+        self.attempts.append(attempt)
+        return attempt
+
+    def finish(self, attempt: Optional[LLMAttempt], response: Any = None, error: Optional[BaseException] = None) -> None:
+        """
+        Close an attempt with its response or the exception it raised.
+        """
+        if attempt is None:
+            return
+        attempt.latency = time.monotonic() - attempt._start
+        if error is None:
+            attempt.outcome = SUCCESS
+            if attempt.completion_tokens is None:
+                attempt.completion_tokens = estimate_tokens(response)
+            attempt.cost = self._estimate_cost(attempt)
+        else:
+            attempt.outcome = classify_failure(error)
+            attempt.error = f"{type(error).__name__}: {str(error)[:200]}"
+
+    def _estimate_cost(self, attempt: LLMAttempt) -> Optional[float]:
+        if attempt.model in self._unpriced_models:
+            return None
+        try:
+            prompt_cost, completion_cost = litellm.cost_per_token(
+                model=attempt.model,
+                prompt_tokens=attempt.prompt_tokens,
+                completion_tokens=attempt.completion_tokens or 0,
+            )
+            return prompt_cost + completion_cost
+        except Exception:
+            # Not in litellm's price map (e.g. many free OpenRouter models); don't ask again
+            self._unpriced_models.add(attempt.model)
+            return None
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Run totals plus the same breakdown per model, per stage and per chain position.
+        """
+        def grouped(key) -> Dict[str, Any]:
+            groups: Dict[str, List[LLMAttempt]] = {}
+            for attempt in self.attempts:
+                groups.setdefault(str(key(attempt)), []).append(attempt)
+            return {name: summarize_attempts(group) for name, group in sorted(groups.items())}
+
+        return {
+            "total": summarize_attempts(self.attempts),
+            "by_model": grouped(lambda a: a.model),
+            "by_stage": grouped(lambda a: a.stage),
+            "by_chain_index": grouped(lambda a: a.chain_index),
+        }
+
+    def write(self, path: str) -> str:
+        """
+        Write the summary and every attempt as JSON.
+        """
+        report = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "latency_buckets": list(LATENCY_BUCKETS),
+            "summary": self.summary(),
+            "attempts": [attempt.to_dict() for attempt in self.attempts],
+        }
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        os.replace(temp_path, path)
+        return path
+
+    def log_summary(self) -> None:
+        """
+        Log one line per stage: attempts, failures, time spent, latency percentiles, tokens and cost.
+        """
+        for stage, stats in self.summary()["by_stage"].items():
+            failures = stats["attempts"] - stats["outcomes"].get(SUCCESS, 0)
+            p50 = f"{stats['latency_p50']:.1f}s" if stats["latency_p50"] is not None else "n/a"
+            p90 = f"{stats['latency_p90']:.1f}s" if stats["latency_p90"] is not None else "n/a"
+            cost = f"${stats['cost']:.4f}" if stats["cost"] is not None else "n/a"
+            logger.info(
+                f"LLM stage {stage}: {stats['attempts']} attempts, {failures} failed, "
+                f"{stats['total_seconds']:.0f}s total, p50 {p50}, p90 {p90}, "
+                f"{stats['prompt_tokens']}+{stats['completion_tokens']} tokens, cost {cost}"
+            )
+
+
+# Global instance shared by every FallbackLLM in the process
+_llm_telemetry_instance: Optional[LLMTelemetry] = None
+
+
+def get_llm_telemetry() -> LLMTelemetry:
+    """
+    Get or create the global telemetry collector (disabled with LLM_TELEMETRY=false).
+    """
+    global _llm_telemetry_instance
+    if _llm_telemetry_instance is None:
+        _llm_telemetry_instance = LLMTelemetry(enabled=os.getenv('LLM_TELEMETRY', 'true').lower() == 'true')
+    return _llm_telemetry_instance
@@ -2,22 +2,25 @@ from dotenv import load_dotenv
 load_dotenv()
 import os
 import argparse
+import atexit
 import asyncio
 import logging
-import smtplib
 from datetime import datetime, timedelta
-from typing import Literal
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from typing import Any, Awaitable, Callable, Literal
 
 # Import ntfy alert system
-from ntfy_alerts import send_bot_status_alert, send_new_question_alert, send_forecast_alert
+from ntfy_alerts import send_new_question_alert, send_forecast_alert
+from notifications import get_notifier
+from run_logging import setup_run_logging, structured
+from llm_telemetry import get_llm_telemetry, llm_stage
+from stage_profiler import get_stage_profiler, profile_call, profile_span
 
-from fallback_llm import create_default_fallback_llm, create_research_fallback_llm, create_synthesis_fallback_llm, create_forecasting_fallback_llm, FallbackLLM
+from fallback_llm import create_default_fallback_llm, create_research_fallback_llm, create_synthesis_fallback_llm, create_forecasting_fallback_llm, FallbackLLM, get_general_llm_pool, get_model_health_registry
 from forecasting_tools import (
     AskNewsSearcher,
     BinaryQuestion,
     ForecastBot,
+    ForecastReport,
     GeneralLlm,
     MetaculusApi,
     MetaculusQuestion,
@@ -34,6 +37,16 @@ from forecasting_tools import (
 )
 from tenacity import retry, stop_after_attempt, wait_fixed
 
+from llm_cache import get_llm_response_cache
+from forecast_registry import get_forecast_registry
+from question_inventory import QuestionInventory, get_question_key
+from question_scheduler import QuestionScheduler
+from rate_limiter import get_rate_limiter
+from async_utils import LoopLocalSemaphore
+from context_packing import count_tokens, get_context_budget, pack_sections
+from prediction_parsing import parse_prediction
+from aggregation import aggregate_binary, aggregate_multiple_choice, aggregate_numeric, get_ensemble_weights
+
 # Import the enhanced retrieval system
 from enhanced_retrieval import EnhancedRetrievalSystem
 
@@ -44,53 +57,6 @@ from tenacity import retry, stop_after_attempt, wait_fixed
 logger = logging.getLogger(__name__)
 
 
-def send_notification_email(subject, body, recipient_email=None):
-    """
-    Send an email notification about bot activity.
-    """
-    try:
-        # Get email configuration from environment variables
-        sender_email = os.getenv('NOTIFICATION_SENDER_EMAIL')
-        sender_password = os.getenv('NOTIFICATION_SENDER_PASSWORD')
-        smtp_server = os.getenv('NOTIFICATION_SMTP_SERVER', 'smtp.gmail.com')
-        smtp_port = int(os.getenv('NOTIFICATION_SMTP_PORT', '587'))
-        
-        # Use provided recipient or fallback to sender
-        if not recipient_email:
-            recipient_email = os.getenv('NOTIFICATION_RECIPIENT_EMAIL', sender_email)
-        
-        # Check if we have the necessary configuration
-        if not sender_email or not sender_password:
-            logger.warning("Email notification configuration incomplete. Set NOTIFICATION_SENDER_EMAIL and NOTIFICATION_SENDER_PASSWORD to enable notifications.")
-            return False
-            
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = recipient_email
-        msg['Subject'] = subject
-        
-        # Add body to email
-        msg.attach(MIMEText(body, 'plain'))
-        
-        # Create SMTP session
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()  # Enable security
-        server.login(sender_email, sender_password)
-        
-        # Send email
-        text = msg.as_string()
-        server.sendmail(sender_email, recipient_email, text)
-        server.quit()
-        
-        logger.info(f"Notification email sent to {recipient_email}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to send notification email: {str(e)}")
-        return False
-
-
 class FallTemplateBot2025(ForecastBot):
     """
     This is a copy of the template bot for Fall 2025 Metaculus AI Tournament.
@@ -205,13 +171,14 @@ class FallTemplateBot2025(ForecastBot):
     _max_concurrent_questions = (
         1  # Set this to whatever works for your search-provider/ai-model rate limits
     )
-    _concurrency_limiter = asyncio.Semaphore(_max_concurrent_questions)
+    _concurrency_limiter = LoopLocalSemaphore(_max_concurrent_questions)  # Bound lazily to whichever event loop is running
 
-    # Enhanced rate limiting for tested models (conservative for 15-min target)
-    _llm_rate_limiter = asyncio.Semaphore(2)  # Reduced concurrent LLM calls for stability
+    # LLM calls are paced by the shared adaptive rate limiter (rate_limiter.get_rate_limiter()),
+    # which FallbackLLM applies to every model attempt, including structure_output parsing calls
 
-    # Add delay between LLM calls to respect rate limits
-    _llm_call_delay = float(os.getenv('FORECAST_RATE_LIMIT_DELAY', '2'))  # 2 second default delay
+    # Fan out the forecaster ensemble concurrently instead of awaiting forecaster1..4 one after another
+    _forecaster_fan_out = os.getenv('FORECASTER_FAN_OUT', 'true').lower() == 'true'
+    _forecaster_concurrency = max(1, int(os.getenv('FORECASTER_CONCURRENCY', '4')))  # Max forecaster calls in flight per question
 
     def get_llm(self, llm_name: str, llm_type: str = "llm") -> GeneralLlm | FallbackLLM:
         """
@@ -225,14 +192,190 @@ class FallTemplateBot2025(ForecastBot):
 
     async def rate_limited_llm_call(self, llm: GeneralLlm | FallbackLLM, prompt: str) -> str:
         """
-        Make a rate-limited LLM call with delay to respect API limits.
+        Make an LLM call paced by the shared adaptive rate limiter.
+        FallbackLLM applies the limiter per model attempt itself; plain GeneralLlm calls are wrapped here.
         """
-        await asyncio.sleep(self._llm_call_delay)  # Add delay before call
-        async with self._llm_rate_limiter:  # Limit concurrent calls
+        if isinstance(llm, FallbackLLM):
+            return await llm.invoke(prompt)
+        async with get_rate_limiter().limit(llm.model, prompt):
             return await llm.invoke(prompt)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
+    async def _run_forecasters(
+        self,
+        question: MetaculusQuestion,
+        forecaster_keys: list[str],
+        run_forecaster: Callable[[str, GeneralLlm | FallbackLLM], Awaitable[tuple[str, Any]]],
+        describe_prediction: Callable[[Any], Any] = lambda prediction: prediction,
+    ) -> tuple[list[str], list[str], list[Any]]:
+        """
+        Run every forecaster in forecaster_keys and collect the ones that succeed.
+
+        With FORECASTER_FAN_OUT enabled (the default) all forecasters are dispatched at once,
+        at most FORECASTER_CONCURRENCY in flight, and results are collected as they complete.
+        Otherwise they run one after another under the shared LLM rate limiter.
+        Failed forecasters are logged and skipped. Returns (successful_forecasters, reasonings,
+        predictions), ordered as in forecaster_keys regardless of completion order.
+        """
+        async def run_one(key: str) -> tuple[str, tuple[str, Any] | None]:
+            try:
+                llm = self.get_llm(key, "llm")
+                if llm is None:
+                    logger.warning(f"LLM for {key} is None, skipping")
+                    return key, None
+                async with profile_span(key):
+                    result = await run_forecaster(key, llm)
+                model_name = self.forecaster_models.get(key, 'unknown')
+                logger.info(f"Forecast from {key} ({model_name}) for URL {question.page_url}: {describe_prediction(result[1])}")
+                return key, result
+            except Exception as e:
+                logger.error(f"Forecaster {key} ({self.forecaster_models.get(key, 'unknown')}) failed for URL {question.page_url}: {str(e)}")
+                logger.error(f"Forecaster {key} model details: {getattr(self.llms.get(key), 'model', 'N/A')}, API key source: {'personal' if key in ['forecaster2', 'forecaster3'] else 'OpenRouter'}")
+                return key, None
+
+        results: dict[str, tuple[str, Any]] = {}
+        if self._forecaster_fan_out:
+            fan_out_limiter = asyncio.Semaphore(self._forecaster_concurrency)
+
+            async def run_limited(key: str) -> tuple[str, tuple[str, Any] | None]:
+                async with fan_out_limiter:
+                    return await run_one(key)
+
+            tasks = [asyncio.create_task(run_limited(key)) for key in forecaster_keys]
+            try:
+                for completed in asyncio.as_completed(tasks):
+                    key, result = await completed
+                    if result is not None:
+                        results[key] = result
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+        else:
+            for key in forecaster_keys:
+                key, result = await run_one(key)
+                if result is not None:
+                    results[key] = result
+
+        successful_forecasters = [key for key in forecaster_keys if key in results]
+        individual_reasonings = [results[key][0] for key in successful_forecasters]
+        individual_predictions = [results[key][1] for key in successful_forecasters]
+        return successful_forecasters, individual_reasonings, individual_predictions
+
+    async def forecast_questions(
+        self,
+        questions: list[MetaculusQuestion],
+        return_exceptions: bool = False,
+    ) -> list[ForecastReport] | list[ForecastReport | BaseException]:
+        """
+        Forecast questions, reusing reports already produced for the same question id this run.
+
+        Questions seen earlier in the run (in another tournament list or an earlier call) are not
+        researched, forecast or submitted again; their stored report is returned in their place.
+        Duplicates within one call are forecast once. Set FORECAST_DEDUP=false to disable.
+        """
+        registry = get_forecast_registry()
+        if registry is None:
+            return await super().forecast_questions(questions, return_exceptions=return_exceptions)
+
+        if self.skip_previously_forecasted_questions:
+            unforecasted_questions = [question for question in questions if not question.already_forecasted]
+            if len(questions) != len(unforecasted_questions):
+                logger.info(f"Skipping {len(questions) - len(unforecasted_questions)} previously forecasted questions")
+            questions = unforecasted_questions
+
+        new_questions: dict[Any, MetaculusQuestion] = {}
+        for question in questions:
+            key = get_question_key(question)
+            if registry.get_report(question) is None and key not in new_questions:
+                new_questions[key] = question
+        if len(new_questions) < len(questions):
+            logger.info(f"Reusing reports for {len(questions) - len(new_questions)} questions already forecast this run")
+
+        new_reports = await super().forecast_questions(list(new_questions.values()), return_exceptions=return_exceptions)
+        reports_by_key = dict(zip(new_questions.keys(), new_reports))
+        for key, report in reports_by_key.items():
+            if not isinstance(report, BaseException):
+                registry.record_report(new_questions[key], report)
+
+        return [
+            reports_by_key.get(get_question_key(question)) or registry.get_report(question)
+            for question in questions
+        ]
+
     async def run_research(self, question: MetaculusQuestion) -> str:
+        """
+        Research a question once per run; later calls for the same question id reuse the result.
+        """
+        registry = get_forecast_registry()
+        # Research runs on the shared default LLM too; attribute all of its calls to research
+        with llm_stage("research"):
+            async with profile_span("research"):
+                if registry is None:
+                    return await self._run_research_uncached(question)
+                return await registry.get_or_compute(
+                    "research", registry.research_key(question), lambda: self._run_research_uncached(question)
+                )
+
+    async def _run_individual_question(self, question: MetaculusQuestion) -> ForecastReport:
+        """
+        Research, forecast and publish one question inside a profiler span, so every stage below
+        is attributed to it in the run's stage profile.
+        """
+        async with profile_span("question", question=question):
+            return await super()._run_individual_question(question)
+
+    async def _make_prediction(self, question: MetaculusQuestion, research: str) -> ReasonedPrediction:
+        """
+        Memoise the final prediction per (question id, research) so repeated occurrences of a
+        question reuse it. Only applies with one prediction per research report, since the
+        framework asks for several independent predictions from the same research otherwise.
+        """
+        registry = get_forecast_registry()
+        if registry is None or self.predictions_per_research_report != 1:
+            return await super()._make_prediction(question, research)
+        return await registry.get_or_compute(
+            "prediction", registry.prediction_key(question, research), lambda: super(FallTemplateBot2025, self)._make_prediction(question, research)
+        )
+
+    def _pack_forecaster_reasonings(self, reasonings: list[str]) -> list[str]:
+        """
+        Fit the forecaster reasonings quoted in a synthesizer prompt into the synthesizer's context budget.
+        """
+        synth_llm = self.get_llm("synthesizer", "llm") or self.get_llm("default", "llm")
+        budget = get_context_budget(getattr(synth_llm, 'model', None))
+        packed = pack_sections(reasonings, budget)
+        used = sum(count_tokens(reasoning) for reasoning in packed)
+        logger.info(f"Packed {len(reasonings)} forecaster reasonings for synthesis: {used}/{budget} tokens (from {sum(count_tokens(r) for r in reasonings)})")
+        return packed
+
+    async def _structure_prediction(
+        self,
+        text: str,
+        output_type: Any,
+        parser_llm: GeneralLlm | FallbackLLM | None,
+        options: list[str] | None = None,
+        additional_instructions: str | None = None,
+    ) -> Any:
+        """
+        Read a prediction from model output, parsing it locally and only calling structure_output
+        (an extra LLM round trip) when the local parse is ambiguous.
+        """
+        with profile_span("parsing"):
+            parsed = parse_prediction(text, output_type, options)
+        if parsed.is_confident():
+            logger.info(f"Parsed prediction locally ({parsed.describe()})")
+            return parsed.value
+        logger.info(f"Local parse ambiguous ({parsed.describe()}), using LLM parser")
+        async with profile_span("llm_parsing"):
+            return await structure_output(
+                text_to_structure=text,
+                output_type=output_type,
+                model=parser_llm,
+                additional_instructions=additional_instructions,
+            )
+
+    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
+    async def _run_research_uncached(self, question: MetaculusQuestion) -> str:
         async with self._concurrency_limiter:
             research = ""
             
@@ -353,7 +496,7 @@ class FallTemplateBot2025(ForecastBot):
                     else:
                         research = await self.get_llm("researcher", "llm").invoke(prompt)
                         
-                logger.info(f"Found Research for URL {question.page_url}:\\n{research if research else 'No research content'}")
+                logger.info(f"Found Research for URL {question.page_url} ({len(research or '')} characters)", extra=structured("research", {"research": research or None}, url=question.page_url))
                 return research
                 
             except Exception as e:
@@ -377,33 +520,19 @@ class FallTemplateBot2025(ForecastBot):
                 
                 # Define forecaster models (only 4 forecasters)
                 forecaster_keys = ["forecaster1", "forecaster2", "forecaster3", "forecaster4"]
-                individual_reasonings = []
-                individual_predictions = []
-                successful_forecasters = []
+
+                async def run_forecaster(key: str, llm: GeneralLlm | FallbackLLM) -> tuple[str, object]:
+                    optimized_system = OptimizedReasoningSystem(llm)
+                    result = await optimized_system.run_optimized_binary_forecast(question, research)
+                    reasoning = result["reasoning"]
+                    decimal_pred = result["prediction"]
+                    logger.info(f"Reasoning from {key} for URL {question.page_url}", extra=structured("forecaster_reasoning", {"reasoning": reasoning}, forecaster=key, url=question.page_url))
+                    return reasoning, decimal_pred
 
                 # Generate individual forecasts with rate limiting and error handling
-                for key in forecaster_keys:
-                    try:
-                        async with self._llm_rate_limiter:  # Rate limit LLM calls
-                            llm = self.get_llm(key, "llm")
-                            if llm is None:
-                                logger.warning(f"LLM for {key} is None, skipping")
-                                continue
-                                
-                            optimized_system = OptimizedReasoningSystem(llm)
-                            result = await optimized_system.run_optimized_binary_forecast(question, research)
-                            reasoning = result["reasoning"]
-                            decimal_pred = result["prediction"]
-                            logger.info(f"Reasoning from {key} for URL {question.page_url}: {reasoning}")
-                            individual_reasonings.append(reasoning)
-                            individual_predictions.append(decimal_pred)
-                            successful_forecasters.append(key)
-                            model_name = self.forecaster_models.get(key, 'unknown')
-                            logger.info(f"Forecast from {key} ({model_name}) for URL {question.page_url}: {decimal_pred}")
-                    except Exception as e:
-                        logger.error(f"Forecaster {key} ({self.forecaster_models.get(key, 'unknown')}) failed for URL {question.page_url}: {str(e)}")
-                        logger.error(f"Forecaster {key} model details: {getattr(self.llms.get(key), 'model', 'N/A')}, API key source: {'personal' if key in ['forecaster2', 'forecaster3'] else 'OpenRouter'}")
-                        continue
+                successful_forecasters, individual_reasonings, individual_predictions = await self._run_forecasters(
+                    question, forecaster_keys, run_forecaster
+                )
 
                 # Check if we have any successful forecasts
                 if not successful_forecasters:
@@ -414,65 +543,63 @@ class FallTemplateBot2025(ForecastBot):
                     return ReasonedPrediction(prediction_value=0.5, reasoning="All forecasters failed, defaulting to 50% probability")
 
                 # Synthesize final prediction with rate limiting
-                async with self._llm_rate_limiter:  # Rate limit LLM calls
-                    synth_prompt = clean_indents(
-                        f"""
-                        You are a synthesizer comparing multiple forecaster outputs for a binary question.
+                synth_prompt = clean_indents(
+                    f"""
+                    You are a synthesizer comparing multiple forecaster outputs for a binary question.
 
-                        Question: {question.question_text}
+                    Question: {question.question_text}
 
-                        Individual forecasts:
-                        """
-                    )
-                    for i, (reason, pred) in enumerate(zip(individual_reasonings, individual_predictions), 1):
-                        synth_prompt += f"\nForecaster {i}: Reasoning: {reason}\nPrediction: {pred}\n"
+                    Individual forecasts:
+                    """
+                )
+                for i, (reason, pred) in enumerate(zip(self._pack_forecaster_reasonings(individual_reasonings), individual_predictions), 1):
+                    synth_prompt += f"\nForecaster {i}: Reasoning: {reason}\nPrediction: {pred}\n"
 
-                    synth_prompt += clean_indents(
-                        f"""
-                        Compare these: Highlight agreements/disagreements, resolve via heuristics (base rates, Bayesian updates, Fermi, intangibles, qualitative elements, wide intervals, bias avoidance). Synthesize a final balanced probability.
+                synth_prompt += clean_indents(
+                    f"""
+                    Compare these: Highlight agreements/disagreements, resolve via heuristics (base rates, Bayesian updates, Fermi, intangibles, qualitative elements, wide intervals, bias avoidance). Synthesize a final balanced probability.
 
-                        Output only the final probability as: "Probability: ZZ%", 0-100
-                        """
-                    )
+                    Output only the final probability as: "Probability: ZZ%", 0-100
+                    """
+                )
 
-                    try:
-                        synth_llm = self.get_llm("synthesizer", "llm")
-                        if synth_llm is None:
-                            # Fallback to default LLM
-                            synth_llm = self.get_llm("default", "llm")
+                try:
+                    synth_llm = self.get_llm("synthesizer", "llm")
+                    if synth_llm is None:
+                        # Fallback to default LLM
+                        synth_llm = self.get_llm("default", "llm")
                             
-                        synth_model_name = self.forecaster_models.get('synthesizer', 'openrouter/qwen/qwen2.5-72b-instruct')
-                        synth_reasoning = await synth_llm.invoke(synth_prompt)
-                        logger.info(f"Synthesized reasoning (using {synth_model_name}) for URL {question.page_url}: {synth_reasoning}")
+                    synth_model_name = self.forecaster_models.get('synthesizer', 'openrouter/qwen/qwen2.5-72b-instruct')
+                    synth_reasoning = await profile_call("synthesis", synth_llm.invoke(synth_prompt))
+                    logger.info(f"Synthesized reasoning (using {synth_model_name}) for URL {question.page_url}", extra=structured("synthesis_reasoning", {"reasoning": synth_reasoning}, model=synth_model_name, url=question.page_url))
                         
-                        try:
-                            parser_llm = self.get_llm("parser", "llm")
-                            if parser_llm is None:
-                                # Fallback to default LLM
-                                parser_llm = self.get_llm("default", "llm")
+                    try:
+                        parser_llm = self.get_llm("parser", "llm")
+                        if parser_llm is None:
+                            # Fallback to default LLM
+                            parser_llm = self.get_llm("default", "llm")
                                 
-                            parser_model_name = self.forecaster_models.get('parser', 'openrouter/qwen/qwen2.5-32b-instruct')
-                            final_binary_prediction: BinaryPrediction = await structure_output(
-                                synth_reasoning, BinaryPrediction, model=parser_llm
-                            )
-                            final_decimal_pred = max(0.01, min(0.99, final_binary_prediction.prediction_in_decimal))
-                            logger.info(f"Synthesized final prediction (parsed with {parser_model_name}) for URL {question.page_url}: {final_decimal_pred}")
-                        except Exception as parser_e:
-                            logger.warning(f"Parser failed for URL {question.page_url}, using fallback: {str(parser_e)}")
-                            # Fallback: extract probability from synthesis reasoning
-                            import re
-                            match = re.search(r'(\d+)%', synth_reasoning)
-                            if match:
-                                final_decimal_pred = float(match.group(1)) / 100.0
-                                final_decimal_pred = max(0.01, min(0.99, final_decimal_pred))
-                            else:
-                                final_decimal_pred = 0.5  # Default fallback
-                    except Exception as synth_e:
-                        logger.warning(f"Synthesizer failed for URL {question.page_url}, using average: {str(synth_e)}")
-                        # Fallback: average all predictions
-                        final_decimal_pred = sum(individual_predictions) / len(individual_predictions)
-                        final_decimal_pred = max(0.01, min(0.99, final_decimal_pred))
-                        synth_reasoning = "Synthesizer failed, used average of individual predictions"
+                        parser_model_name = self.forecaster_models.get('parser', 'openrouter/qwen/qwen2.5-32b-instruct')
+                        final_binary_prediction: BinaryPrediction = await self._structure_prediction(
+                            synth_reasoning, BinaryPrediction, parser_llm
+                        )
+                        final_decimal_pred = max(0.01, min(0.99, final_binary_prediction.prediction_in_decimal))
+                        logger.info(f"Synthesized final prediction (parsed with {parser_model_name}) for URL {question.page_url}: {final_decimal_pred}")
+                    except Exception as parser_e:
+                        logger.warning(f"Parser failed for URL {question.page_url}, using fallback: {str(parser_e)}")
+                        # Fallback: extract probability from synthesis reasoning
+                        import re
+                        match = re.search(r'(\d+)%', synth_reasoning)
+                        if match:
+                            final_decimal_pred = float(match.group(1)) / 100.0
+                            final_decimal_pred = max(0.01, min(0.99, final_decimal_pred))
+                        else:
+                            final_decimal_pred = 0.5  # Default fallback
+                except Exception as synth_e:
+                    logger.warning(f"Synthesizer failed for URL {question.page_url}, using average: {str(synth_e)}")
+                    # Fallback: average all predictions
+                    final_decimal_pred = self._average_binary_predictions(individual_predictions, successful_forecasters)
+                    synth_reasoning = "Synthesizer failed, used average of individual predictions"
 
                 # Combined reasoning with model names
                 combined_reasoning_parts = []
@@ -521,34 +648,20 @@ class FallTemplateBot2025(ForecastBot):
                 
                 # Define forecaster models (only 4 forecasters)
                 forecaster_keys = ["forecaster1", "forecaster2", "forecaster3", "forecaster4"]
-                individual_reasonings = []
-                individual_predictions = []
-                successful_forecasters = []
+
+                async def run_forecaster(key: str, llm: GeneralLlm | FallbackLLM) -> tuple[str, object]:
+                    reasoning = await llm.invoke(prompt)
+                    logger.info(f"Reasoning from {key} for URL {question.page_url}", extra=structured("forecaster_reasoning", {"reasoning": reasoning}, forecaster=key, url=question.page_url))
+                    binary_prediction: BinaryPrediction = await self._structure_prediction(
+                        reasoning, BinaryPrediction, self.get_llm("parser", "llm")
+                    )
+                    decimal_pred = max(0.01, min(0.99, binary_prediction.prediction_in_decimal))
+                    return reasoning, decimal_pred
 
                 # Generate individual forecasts with error handling
-                for key in forecaster_keys:
-                    try:
-                        async with self._llm_rate_limiter:  # Rate limit LLM calls
-                            llm = self.get_llm(key, "llm")
-                            if llm is None:
-                                logger.warning(f"LLM for {key} is None, skipping")
-                                continue
-                                
-                            reasoning = await llm.invoke(prompt)
-                            logger.info(f"Reasoning from {key} for URL {question.page_url}: {reasoning}")
-                            binary_prediction: BinaryPrediction = await structure_output(
-                                reasoning, BinaryPrediction, model=self.get_llm("parser", "llm")
-                            )
-                            decimal_pred = max(0.01, min(0.99, binary_prediction.prediction_in_decimal))
-                            individual_reasonings.append(reasoning)
-                            individual_predictions.append(decimal_pred)
-                            successful_forecasters.append(key)
-                            model_name = self.forecaster_models.get(key, 'unknown')
-                            logger.info(f"Forecast from {key} ({model_name}) for URL {question.page_url}: {decimal_pred}")
-                    except Exception as e:
-                        logger.error(f"Forecaster {key} ({self.forecaster_models.get(key, 'unknown')}) failed for URL {question.page_url}: {str(e)}")
-                        logger.error(f"Forecaster {key} model details: {getattr(self.llms.get(key), 'model', 'N/A')}, API key source: {'personal' if key in ['forecaster2', 'forecaster3'] else 'OpenRouter'}")
-                        continue
+                successful_forecasters, individual_reasonings, individual_predictions = await self._run_forecasters(
+                    question, forecaster_keys, run_forecaster
+                )
 
                 # Check if we have any successful forecasts
                 if not successful_forecasters:
@@ -559,65 +672,63 @@ class FallTemplateBot2025(ForecastBot):
                     return ReasonedPrediction(prediction_value=0.5, reasoning="All forecasters failed, defaulting to 50% probability")
 
                 # Synthesize final prediction with rate limiting
-                async with self._llm_rate_limiter:  # Rate limit LLM calls
-                    synth_prompt = clean_indents(
-                        f"""
-                        You are a synthesizer comparing multiple forecaster outputs for a binary question.
+                synth_prompt = clean_indents(
+                    f"""
+                    You are a synthesizer comparing multiple forecaster outputs for a binary question.
 
-                        Question: {question.question_text}
+                    Question: {question.question_text}
 
-                        Individual forecasts:
-                        """
-                    )
-                    for i, (reason, pred) in enumerate(zip(individual_reasonings, individual_predictions), 1):
-                        synth_prompt += f"\nForecaster {i}: Reasoning: {reason}\nPrediction: {pred}\n"
+                    Individual forecasts:
+                    """
+                )
+                for i, (reason, pred) in enumerate(zip(self._pack_forecaster_reasonings(individual_reasonings), individual_predictions), 1):
+                    synth_prompt += f"\nForecaster {i}: Reasoning: {reason}\nPrediction: {pred}\n"
 
-                    synth_prompt += clean_indents(
-                        f"""
-                        Compare these: Highlight agreements/disagreements, resolve via heuristics (base rates, Bayesian updates, Fermi, intangibles, qualitative elements, wide intervals, bias avoidance). Synthesize a final balanced probability.
+                synth_prompt += clean_indents(
+                    f"""
+                    Compare these: Highlight agreements/disagreements, resolve via heuristics (base rates, Bayesian updates, Fermi, intangibles, qualitative elements, wide intervals, bias avoidance). Synthesize a final balanced probability.
 
-                        Output only the final probability as: "Probability: ZZ%", 0-100
-                        """
-                    )
+                    Output only the final probability as: "Probability: ZZ%", 0-100
+                    """
+                )
 
-                    try:
-                        synth_llm = self.get_llm("synthesizer", "llm")
-                        if synth_llm is None:
-                            # Fallback to default LLM
-                            synth_llm = self.get_llm("default", "llm")
+                try:
+                    synth_llm = self.get_llm("synthesizer", "llm")
+                    if synth_llm is None:
+                        # Fallback to default LLM
+                        synth_llm = self.get_llm("default", "llm")
                             
-                        synth_model_name = self.forecaster_models.get('synthesizer', 'openrouter/qwen/qwen2.5-72b-instruct')
-                        synth_reasoning = await synth_llm.invoke(synth_prompt)
-                        logger.info(f"Synthesized reasoning (using {synth_model_name}) for URL {question.page_url}: {synth_reasoning}")
+                    synth_model_name = self.forecaster_models.get('synthesizer', 'openrouter/qwen/qwen2.5-72b-instruct')
+                    synth_reasoning = await profile_call("synthesis", synth_llm.invoke(synth_prompt))
+                    logger.info(f"Synthesized reasoning (using {synth_model_name}) for URL {question.page_url}", extra=structured("synthesis_reasoning", {"reasoning": synth_reasoning}, model=synth_model_name, url=question.page_url))
                         
-                        try:
-                            parser_llm = self.get_llm("parser", "llm")
-                            if parser_llm is None:
-                                # Fallback to default LLM
-                                parser_llm = self.get_llm("default", "llm")
+                    try:
+                        parser_llm = self.get_llm("parser", "llm")
+                        if parser_llm is None:
+                            # Fallback to default LLM
+                            parser_llm = self.get_llm("default", "llm")
                                 
-                            parser_model_name = self.forecaster_models.get('parser', 'openrouter/qwen/qwen2.5-32b-instruct')
-                            final_binary_prediction: BinaryPrediction = await structure_output(
-                                synth_reasoning, BinaryPrediction, model=parser_llm
-                            )
-                            final_decimal_pred = max(0.01, min(0.99, final_binary_prediction.prediction_in_decimal))
-                            logger.info(f"Synthesized final prediction (parsed with {parser_model_name}) for URL {question.page_url}: {final_decimal_pred}")
-                        except Exception as parser_e:
-                            logger.warning(f"Parser failed for URL {question.page_url}, using fallback: {str(parser_e)}")
-                            # Fallback: extract probability from synthesis reasoning
-                            import re
-                            match = re.search(r'(\d+)%', synth_reasoning)
-                            if match:
-                                final_decimal_pred = float(match.group(1)) / 100.0
-                                final_decimal_pred = max(0.01, min(0.99, final_decimal_pred))
-                            else:
-                                final_decimal_pred = 0.5  # Default fallback
-                    except Exception as synth_e:
-                        logger.warning(f"Synthesizer failed for URL {question.page_url}, using average: {str(synth_e)}")
-                        # Fallback: average all predictions
-                        final_decimal_pred = sum(individual_predictions) / len(individual_predictions)
-                        final_decimal_pred = max(0.01, min(0.99, final_decimal_pred))
-                        synth_reasoning = "Synthesizer failed, used average of individual predictions"
+                        parser_model_name = self.forecaster_models.get('parser', 'openrouter/qwen/qwen2.5-32b-instruct')
+                        final_binary_prediction: BinaryPrediction = await self._structure_prediction(
+                            synth_reasoning, BinaryPrediction, parser_llm
+                        )
+                        final_decimal_pred = max(0.01, min(0.99, final_binary_prediction.prediction_in_decimal))
+                        logger.info(f"Synthesized final prediction (parsed with {parser_model_name}) for URL {question.page_url}: {final_decimal_pred}")
+                    except Exception as parser_e:
+                        logger.warning(f"Parser failed for URL {question.page_url}, using fallback: {str(parser_e)}")
+                        # Fallback: extract probability from synthesis reasoning
+                        import re
+                        match = re.search(r'(\d+)%', synth_reasoning)
+                        if match:
+                            final_decimal_pred = float(match.group(1)) / 100.0
+                            final_decimal_pred = max(0.01, min(0.99, final_decimal_pred))
+                        else:
+                            final_decimal_pred = 0.5  # Default fallback
+                except Exception as synth_e:
+                    logger.warning(f"Synthesizer failed for URL {question.page_url}, using average: {str(synth_e)}")
+                    # Fallback: average all predictions
+                    final_decimal_pred = self._average_binary_predictions(individual_predictions, successful_forecasters)
+                    synth_reasoning = "Synthesizer failed, used average of individual predictions"
 
                 # Combined reasoning with model names
                 combined_reasoning_parts = []
@@ -647,33 +758,19 @@ class FallTemplateBot2025(ForecastBot):
                 
                 # Define forecaster models (only 4 forecasters)
                 forecaster_keys = ["forecaster1", "forecaster2", "forecaster3", "forecaster4"]
-                individual_reasonings = []
-                individual_predictions = []
-                successful_forecasters = []
+
+                async def run_forecaster(key: str, llm: GeneralLlm | FallbackLLM) -> tuple[str, object]:
+                    optimized_system = OptimizedReasoningSystem(llm)
+                    result = await optimized_system.run_optimized_multiple_choice_forecast(question, research)
+                    reasoning = result["reasoning"]
+                    predicted_option_list = result["predictions"]
+                    logger.info(f"Reasoning from {key} for URL {question.page_url}", extra=structured("forecaster_reasoning", {"reasoning": reasoning}, forecaster=key, url=question.page_url))
+                    return reasoning, predicted_option_list
 
                 # Generate individual forecasts with rate limiting and error handling
-                for key in forecaster_keys:
-                    try:
-                        async with self._llm_rate_limiter:  # Rate limit LLM calls
-                            llm = self.get_llm(key, "llm")
-                            if llm is None:
-                                logger.warning(f"LLM for {key} is None, skipping")
-                                continue
-                                
-                            optimized_system = OptimizedReasoningSystem(llm)
-                            result = await optimized_system.run_optimized_multiple_choice_forecast(question, research)
-                            reasoning = result["reasoning"]
-                            predicted_option_list = result["predictions"]
-                            logger.info(f"Reasoning from {key} for URL {question.page_url}: {reasoning}")
-                            individual_reasonings.append(reasoning)
-                            individual_predictions.append(predicted_option_list)
-                            successful_forecasters.append(key)
-                            model_name = self.forecaster_models.get(key, 'unknown')
-                            logger.info(f"Forecast from {key} ({model_name}) for URL {question.page_url}: {predicted_option_list}")
-                    except Exception as e:
-                        logger.error(f"Forecaster {key} ({self.forecaster_models.get(key, 'unknown')}) failed for URL {question.page_url}: {str(e)}")
-                        logger.error(f"Forecaster {key} model details: {getattr(self.llms.get(key), 'model', 'N/A')}, API key source: {'personal' if key in ['forecaster2', 'forecaster3'] else 'OpenRouter'}")
-                        continue
+                successful_forecasters, individual_reasonings, individual_predictions = await self._run_forecasters(
+                    question, forecaster_keys, run_forecaster
+                )
 
                 # Check if we have any successful forecasts
                 if not successful_forecasters:
@@ -686,75 +783,75 @@ class FallTemplateBot2025(ForecastBot):
                     )
 
                 # Synthesize final prediction with rate limiting
-                async with self._llm_rate_limiter:  # Rate limit LLM calls
-                    synth_prompt = clean_indents(
-                        f"""
-                        You are a synthesizer comparing multiple forecaster outputs for a multiple choice question.
+                synth_prompt = clean_indents(
+                    f"""
+                    You are a synthesizer comparing multiple forecaster outputs for a multiple choice question.
 
-                        Question: {question.question_text}
-                        Options: {question.options}
+                    Question: {question.question_text}
+                    Options: {question.options}
 
-                        Individual forecasts:
-                        """
-                    )
-                    for i, (reason, pred) in enumerate(zip(individual_reasonings, individual_predictions), 1):
-                        synth_prompt += f"\nForecaster {i}: Reasoning: {reason}\nPrediction: {pred}\n"
+                    Individual forecasts:
+                    """
+                )
+                for i, (reason, pred) in enumerate(zip(self._pack_forecaster_reasonings(individual_reasonings), individual_predictions), 1):
+                    synth_prompt += f"\nForecaster {i}: Reasoning: {reason}\nPrediction: {pred}\n"
 
-                    synth_prompt += clean_indents(
-                        f"""
-                        Compare these: Highlight agreements/disagreements, resolve via heuristics (base rates, Bayesian updates, Fermi, intangibles, qualitative elements, wide intervals, bias avoidance). Synthesize a final balanced probability distribution.
+                synth_prompt += clean_indents(
+                    f"""
+                    Compare these: Highlight agreements/disagreements, resolve via heuristics (base rates, Bayesian updates, Fermi, intangibles, qualitative elements, wide intervals, bias avoidance). Synthesize a final balanced probability distribution.
 
-                        Output only the final probabilities for the N options in this order {question.options} as:
-                        Option_A: Probability_A
-                        Option_B: Probability_B
-                        ... 
-                        Option_N: Probability_N
-                        """
-                    )
+                    Output only the final probabilities for the N options in this order {question.options} as:
+                    Option_A: Probability_A
+                    Option_B: Probability_B
+                    ... 
+                    Option_N: Probability_N
+                    """
+                )
 
-                    try:
-                        synth_llm = self.get_llm("synthesizer", "llm")
-                        if synth_llm is None:
-                            # Fallback to default LLM
-                            synth_llm = self.get_llm("default", "llm")
+                try:
+                    synth_llm = self.get_llm("synthesizer", "llm")
+                    if synth_llm is None:
+                        # Fallback to default LLM
+                        synth_llm = self.get_llm("default", "llm")
                             
-                        synth_model_name = self.forecaster_models.get('synthesizer', 'openrouter/qwen/qwen2.5-72b-instruct')
-                        synth_reasoning = await synth_llm.invoke(synth_prompt)
-                        logger.info(f"Synthesized reasoning (using {synth_model_name}) for URL {question.page_url}: {synth_reasoning}")
+                    synth_model_name = self.forecaster_models.get('synthesizer', 'openrouter/qwen/qwen2.5-72b-instruct')
+                    synth_reasoning = await profile_call("synthesis", synth_llm.invoke(synth_prompt))
+                    logger.info(f"Synthesized reasoning (using {synth_model_name}) for URL {question.page_url}", extra=structured("synthesis_reasoning", {"reasoning": synth_reasoning}, model=synth_model_name, url=question.page_url))
                         
-                        try:
-                            parser_llm = self.get_llm("parser", "llm")
-                            if parser_llm is None:
-                                # Fallback to default LLM
-                                parser_llm = self.get_llm("default", "llm")
+                    try:
+                        parser_llm = self.get_llm("parser", "llm")
+                        if parser_llm is None:
+                            # Fallback to default LLM
+                            parser_llm = self.get_llm("default", "llm")
                                 
-                            parser_model_name = self.forecaster_models.get('parser', 'openrouter/qwen/qwen2.5-32b-instruct')
+                        parser_model_name = self.forecaster_models.get('parser', 'openrouter/qwen/qwen2.5-32b-instruct')
                             
-                            # Parse the synthesized prediction
-                            parsing_instructions = clean_indents(
-                                f"""
-                                Make sure that all option names are one of the following:
-                                {question.options}
-                                The text you are parsing may prepend these options with some variation of "Option" which you should remove if not part of the option names I just gave you.
-                                """
-                            )
+                        # Parse the synthesized prediction
+                        parsing_instructions = clean_indents(
+                            f"""
+                            Make sure that all option names are one of the following:
+                            {question.options}
+                            The text you are parsing may prepend these options with some variation of "Option" which you should remove if not part of the option names I just gave you.
+                            """
+                        )
                             
-                            final_predicted_option_list: PredictedOptionList = await structure_output(
-                                text_to_structure=synth_reasoning,
-                                output_type=PredictedOptionList,
-                                model=parser_llm,
-                                additional_instructions=parsing_instructions,
-                            )
-                            logger.info(f"Synthesized final prediction (parsed with {parser_model_name}) for URL {question.page_url}: {final_predicted_option_list}")
-                        except Exception as parser_e:
-                            logger.warning(f"Parser failed for URL {question.page_url}, using fallback: {str(parser_e)}")
-                            # Fallback: use average of individual predictions
-                            final_predicted_option_list = self._average_multiple_choice_predictions(individual_predictions, question.options)
-                    except Exception as synth_e:
-                        logger.warning(f"Synthesizer failed for URL {question.page_url}, using average: {str(synth_e)}")
+                        final_predicted_option_list: PredictedOptionList = await self._structure_prediction(
+                            synth_reasoning,
+                            PredictedOptionList,
+                            parser_llm,
+                            options=question.options,
+                            additional_instructions=parsing_instructions,
+                        )
+                        logger.info(f"Synthesized final prediction (parsed with {parser_model_name}) for URL {question.page_url}: {final_predicted_option_list}")
+                    except Exception as parser_e:
+                        logger.warning(f"Parser failed for URL {question.page_url}, using fallback: {str(parser_e)}")
                         # Fallback: use average of individual predictions
-                        final_predicted_option_list = self._average_multiple_choice_predictions(individual_predictions, question.options)
-                        synth_reasoning = "Synthesizer failed, used average of individual predictions"
+                        final_predicted_option_list = self._average_multiple_choice_predictions(individual_predictions, question.options, successful_forecasters)
+                except Exception as synth_e:
+                    logger.warning(f"Synthesizer failed for URL {question.page_url}, using average: {str(synth_e)}")
+                    # Fallback: use average of individual predictions
+                    final_predicted_option_list = self._average_multiple_choice_predictions(individual_predictions, question.options, successful_forecasters)
+                    synth_reasoning = "Synthesizer failed, used average of individual predictions"
 
                 # Combined reasoning with model names
                 combined_reasoning_parts = []
@@ -816,36 +913,23 @@ class FallTemplateBot2025(ForecastBot):
                 
                 # Define forecaster models (only 4 forecasters)
                 forecaster_keys = ["forecaster1", "forecaster2", "forecaster3", "forecaster4"]
-                individual_reasonings = []
-                individual_predictions = []
-                successful_forecasters = []
+
+                async def run_forecaster(key: str, llm: GeneralLlm | FallbackLLM) -> tuple[str, object]:
+                    reasoning = await llm.invoke(prompt)
+                    logger.info(f"Reasoning from {key} for URL {question.page_url}", extra=structured("forecaster_reasoning", {"reasoning": reasoning}, forecaster=key, url=question.page_url))
+                    predicted_option_list: PredictedOptionList = await self._structure_prediction(
+                        reasoning,
+                        PredictedOptionList,
+                        self.get_llm("parser", "llm"),
+                        options=question.options,
+                        additional_instructions=parsing_instructions,
+                    )
+                    return reasoning, predicted_option_list
 
                 # Generate individual forecasts with error handling
-                for key in forecaster_keys:
-                    try:
-                        async with self._llm_rate_limiter:  # Rate limit LLM calls
-                            llm = self.get_llm(key, "llm")
-                            if llm is None:
-                                logger.warning(f"LLM for {key} is None, skipping")
-                                continue
-                                
-                            reasoning = await llm.invoke(prompt)
-                            logger.info(f"Reasoning from {key} for URL {question.page_url}: {reasoning}")
-                            predicted_option_list: PredictedOptionList = await structure_output(
-                                text_to_structure=reasoning,
-                                output_type=PredictedOptionList,
-                                model=self.get_llm("parser", "llm"),
-                                additional_instructions=parsing_instructions,
-                            )
-                            individual_reasonings.append(reasoning)
-                            individual_predictions.append(predicted_option_list)
-                            successful_forecasters.append(key)
-                            model_name = self.forecaster_models.get(key, 'unknown')
-                            logger.info(f"Forecast from {key} ({model_name}) for URL {question.page_url}: {predicted_option_list}")
-                    except Exception as e:
-                        logger.error(f"Forecaster {key} ({self.forecaster_models.get(key, 'unknown')}) failed for URL {question.page_url}: {str(e)}")
-                        logger.error(f"Forecaster {key} model details: {getattr(self.llms.get(key), 'model', 'N/A')}, API key source: {'personal' if key in ['forecaster2', 'forecaster3'] else 'OpenRouter'}")
-                        continue
+                successful_forecasters, individual_reasonings, individual_predictions = await self._run_forecasters(
+                    question, forecaster_keys, run_forecaster
+                )
 
                 # Check if we have any successful forecasts
                 if not successful_forecasters:
@@ -858,65 +942,65 @@ class FallTemplateBot2025(ForecastBot):
                     )
 
                 # Synthesize final prediction
-                async with self._llm_rate_limiter:  # Rate limit LLM calls
-                    synth_prompt = clean_indents(
-                        f"""
-                        You are a synthesizer comparing multiple forecaster outputs for a multiple choice question.
+                synth_prompt = clean_indents(
+                    f"""
+                    You are a synthesizer comparing multiple forecaster outputs for a multiple choice question.
 
-                        Question: {question.question_text}
-                        Options: {question.options}
+                    Question: {question.question_text}
+                    Options: {question.options}
 
-                        Individual forecasts:
-                        """
-                    )
-                    for i, (reason, pred) in enumerate(zip(individual_reasonings, individual_predictions), 1):
-                        synth_prompt += f"\nForecaster {i}: Reasoning: {reason}\nPrediction: {pred}\n"
+                    Individual forecasts:
+                    """
+                )
+                for i, (reason, pred) in enumerate(zip(self._pack_forecaster_reasonings(individual_reasonings), individual_predictions), 1):
+                    synth_prompt += f"\nForecaster {i}: Reasoning: {reason}\nPrediction: {pred}\n"
 
-                    synth_prompt += clean_indents(
-                        f"""
-                        Compare these: Highlight agreements/disagreements, resolve via heuristics (base rates, Bayesian updates, Fermi, intangibles, qualitative elements, wide intervals, bias avoidance). Synthesize a final balanced probability distribution.
+                synth_prompt += clean_indents(
+                    f"""
+                    Compare these: Highlight agreements/disagreements, resolve via heuristics (base rates, Bayesian updates, Fermi, intangibles, qualitative elements, wide intervals, bias avoidance). Synthesize a final balanced probability distribution.
 
-                        Output only the final probabilities for the N options in this order {question.options} as:
-                        Option_A: Probability_A
-                        Option_B: Probability_B
-                        ... 
-                        Option_N: Probability_N
-                        """
-                    )
+                    Output only the final probabilities for the N options in this order {question.options} as:
+                    Option_A: Probability_A
+                    Option_B: Probability_B
+                    ... 
+                    Option_N: Probability_N
+                    """
+                )
 
-                    try:
-                        synth_llm = self.get_llm("synthesizer", "llm")
-                        if synth_llm is None:
-                            # Fallback to default LLM
-                            synth_llm = self.get_llm("default", "llm")
+                try:
+                    synth_llm = self.get_llm("synthesizer", "llm")
+                    if synth_llm is None:
+                        # Fallback to default LLM
+                        synth_llm = self.get_llm("default", "llm")
                             
-                        synth_model_name = self.forecaster_models.get('synthesizer', 'openrouter/qwen/qwen2.5-72b-instruct')
-                        synth_reasoning = await synth_llm.invoke(synth_prompt)
-                        logger.info(f"Synthesized reasoning (using {synth_model_name}) for URL {question.page_url}: {synth_reasoning}")
+                    synth_model_name = self.forecaster_models.get('synthesizer', 'openrouter/qwen/qwen2.5-72b-instruct')
+                    synth_reasoning = await profile_call("synthesis", synth_llm.invoke(synth_prompt))
+                    logger.info(f"Synthesized reasoning (using {synth_model_name}) for URL {question.page_url}", extra=structured("synthesis_reasoning", {"reasoning": synth_reasoning}, model=synth_model_name, url=question.page_url))
                         
-                        try:
-                            parser_llm = self.get_llm("parser", "llm")
-                            if parser_llm is None:
-                                # Fallback to default LLM
-                                parser_llm = self.get_llm("default", "llm")
+                    try:
+                        parser_llm = self.get_llm("parser", "llm")
+                        if parser_llm is None:
+                            # Fallback to default LLM
+                            parser_llm = self.get_llm("default", "llm")
                                 
-                            parser_model_name = self.forecaster_models.get('parser', 'openrouter/qwen/qwen2.5-32b-instruct')
-                            final_predicted_option_list: PredictedOptionList = await structure_output(
-                                text_to_structure=synth_reasoning,
-                                output_type=PredictedOptionList,
-                                model=parser_llm,
-                                additional_instructions=parsing_instructions,
-                            )
-                            logger.info(f"Synthesized final prediction (parsed with {parser_model_name}) for URL {question.page_url}: {final_predicted_option_list}")
-                        except Exception as parser_e:
-                            logger.warning(f"Parser failed for URL {question.page_url}, using fallback: {str(parser_e)}")
-                            # Fallback: use average of individual predictions
-                            final_predicted_option_list = self._average_multiple_choice_predictions(individual_predictions, question.options)
-                    except Exception as synth_e:
-                        logger.warning(f"Synthesizer failed for URL {question.page_url}, using average: {str(synth_e)}")
+                        parser_model_name = self.forecaster_models.get('parser', 'openrouter/qwen/qwen2.5-32b-instruct')
+                        final_predicted_option_list: PredictedOptionList = await self._structure_prediction(
+                            synth_reasoning,
+                            PredictedOptionList,
+                            parser_llm,
+                            options=question.options,
+                            additional_instructions=parsing_instructions,
+                        )
+                        logger.info(f"Synthesized final prediction (parsed with {parser_model_name}) for URL {question.page_url}: {final_predicted_option_list}")
+                    except Exception as parser_e:
+                        logger.warning(f"Parser failed for URL {question.page_url}, using fallback: {str(parser_e)}")
                         # Fallback: use average of individual predictions
-                        final_predicted_option_list = self._average_multiple_choice_predictions(individual_predictions, question.options)
-                        synth_reasoning = "Synthesizer failed, used average of individual predictions"
+                        final_predicted_option_list = self._average_multiple_choice_predictions(individual_predictions, question.options, successful_forecasters)
+                except Exception as synth_e:
+                    logger.warning(f"Synthesizer failed for URL {question.page_url}, using average: {str(synth_e)}")
+                    # Fallback: use average of individual predictions
+                    final_predicted_option_list = self._average_multiple_choice_predictions(individual_predictions, question.options, successful_forecasters)
+                    synth_reasoning = "Synthesizer failed, used average of individual predictions"
 
                 # Combined reasoning with model names
                 combined_reasoning_parts = []
@@ -952,33 +1036,20 @@ class FallTemplateBot2025(ForecastBot):
                 
                 # Define forecaster models (only 4 forecasters)
                 forecaster_keys = ["forecaster1", "forecaster2", "forecaster3", "forecaster4"]
-                individual_reasonings = []
-                individual_predictions = []
-                successful_forecasters = []
+
+                async def run_forecaster(key: str, llm: GeneralLlm | FallbackLLM) -> tuple[str, object]:
+                    optimized_system = OptimizedReasoningSystem(llm)
+                    result = await optimized_system.run_optimized_numeric_forecast(question, research)
+                    reasoning = result["reasoning"]
+                    prediction = result["distribution"]
+                    logger.info(f"Reasoning from {key} for URL {question.page_url}", extra=structured("forecaster_reasoning", {"reasoning": reasoning}, forecaster=key, url=question.page_url))
+                    return reasoning, prediction
 
                 # Generate individual forecasts with rate limiting and error handling
-                for key in forecaster_keys:
-                    try:
-                        async with self._llm_rate_limiter:  # Rate limit LLM calls
-                            llm = self.get_llm(key, "llm")
-                            if llm is None:
-                                logger.warning(f"LLM for {key} is None, skipping")
-                                continue
-                                
-                            optimized_system = OptimizedReasoningSystem(llm)
-                            result = await optimized_system.run_optimized_numeric_forecast(question, research)
-                            reasoning = result["reasoning"]
-                            prediction = result["distribution"]
-                            logger.info(f"Reasoning from {key} for URL {question.page_url}: {reasoning}")
-                            individual_reasonings.append(reasoning)
-                            individual_predictions.append(prediction)
-                            successful_forecasters.append(key)
-                            model_name = self.forecaster_models.get(key, 'unknown')
-                            logger.info(f"Forecast from {key} ({model_name}) for URL {question.page_url}: {prediction.declared_percentiles}")
-                    except Exception as e:
-                        logger.error(f"Forecaster {key} ({self.forecaster_models.get(key, 'unknown')}) failed for URL {question.page_url}: {str(e)}")
-                        logger.error(f"Forecaster {key} model details: {getattr(self.llms.get(key), 'model', 'N/A')}, API key source: {'personal' if key in ['forecaster2', 'forecaster3'] else 'OpenRouter'}")
-                        continue
+                successful_forecasters, individual_reasonings, individual_predictions = await self._run_forecasters(
+                    question, forecaster_keys, run_forecaster,
+                    describe_prediction=lambda prediction: prediction.declared_percentiles,
+                )
 
                 # Check if we have any successful forecasts
                 if not successful_forecasters:
@@ -999,64 +1070,63 @@ class FallTemplateBot2025(ForecastBot):
                     )
 
                 # Synthesize final prediction with rate limiting
-                async with self._llm_rate_limiter:  # Rate limit LLM calls
-                    synth_prompt = clean_indents(
-                        f"""
-                        You are a synthesizer comparing multiple forecaster outputs for a numeric question.
+                synth_prompt = clean_indents(
+                    f"""
+                    You are a synthesizer comparing multiple forecaster outputs for a numeric question.
 
-                        Question: {question.question_text}
+                    Question: {question.question_text}
 
-                        Individual forecasts:
-                        """
-                    )
-                    for i, (reason, pred) in enumerate(zip(individual_reasonings, individual_predictions), 1):
-                        synth_prompt += f"\nForecaster {i}: Reasoning: {reason}\nPrediction: {pred.declared_percentiles}\n"
+                    Individual forecasts:
+                    """
+                )
+                for i, (reason, pred) in enumerate(zip(self._pack_forecaster_reasonings(individual_reasonings), individual_predictions), 1):
+                    synth_prompt += f"\nForecaster {i}: Reasoning: {reason}\nPrediction: {pred.declared_percentiles}\n"
 
-                    synth_prompt += clean_indents(
-                        f"""
-                        Compare these: Highlight agreements/disagreements, resolve via heuristics (base rates, Bayesian updates, Fermi, intangibles, qualitative elements, wide intervals, bias avoidance). Synthesize a final balanced distribution.
-
-                        Output only the final percentiles:
-                        Percentile 10: XX
-                        Percentile 20: XX
-                        Percentile 40: XX
-                        Percentile 60: XX
-                        Percentile 80: XX
-                        Percentile 90: XX
-                        """
-                    )
+                synth_prompt += clean_indents(
+                    f"""
+                    Compare these: Highlight agreements/disagreements, resolve via heuristics (base rates, Bayesian updates, Fermi, intangibles, qualitative elements, wide intervals, bias avoidance). Synthesize a final balanced distribution.
 
-                    try:
-                        synth_llm = self.get_llm("synthesizer", "llm")
-                        if synth_llm is None:
-                            # Fallback to default LLM
-                            synth_llm = self.get_llm("default", "llm")
+                    Output only the final percentiles:
+                    Percentile 10: XX
+                    Percentile 20: XX
+                    Percentile 40: XX
+                    Percentile 60: XX
+                    Percentile 80: XX
+                    Percentile 90: XX
+                    """
+                )
+
+                try:
+                    synth_llm = self.get_llm("synthesizer", "llm")
+                    if synth_llm is None:
+                        # Fallback to default LLM
+                        synth_llm = self.get_llm("default", "llm")
                             
-                        synth_model_name = self.forecaster_models.get('synthesizer', 'openrouter/qwen/qwen2.5-72b-instruct')
-                        synth_reasoning = await synth_llm.invoke(synth_prompt)
-                        logger.info(f"Synthesized reasoning (using {synth_model_name}) for URL {question.page_url}: {synth_reasoning}")
+                    synth_model_name = self.forecaster_models.get('synthesizer', 'openrouter/qwen/qwen2.5-72b-instruct')
+                    synth_reasoning = await profile_call("synthesis", synth_llm.invoke(synth_prompt))
+                    logger.info(f"Synthesized reasoning (using {synth_model_name}) for URL {question.page_url}", extra=structured("synthesis_reasoning", {"reasoning": synth_reasoning}, model=synth_model_name, url=question.page_url))
                         
-                        try:
-                            parser_llm = self.get_llm("parser", "llm")
-                            if parser_llm is None:
-                                # Fallback to default LLM
-                                parser_llm = self.get_llm("default", "llm")
+                    try:
+                        parser_llm = self.get_llm("parser", "llm")
+                        if parser_llm is None:
+                            # Fallback to default LLM
+                            parser_llm = self.get_llm("default", "llm")
                                 
-                            parser_model_name = self.forecaster_models.get('parser', 'openrouter/qwen/qwen2.5-32b-instruct')
-                            final_percentile_list: list[Percentile] = await structure_output(
-                                synth_reasoning, list[Percentile], model=parser_llm
-                            )
-                            final_prediction = NumericDistribution.from_question(final_percentile_list, question)
-                            logger.info(f"Synthesized final prediction (parsed with {parser_model_name}) for URL {question.page_url}: {final_prediction.declared_percentiles}")
-                        except Exception as parser_e:
-                            logger.warning(f"Parser failed for URL {question.page_url}, using fallback: {str(parser_e)}")
-                            # Fallback: average individual predictions
-                            final_prediction = self._average_numeric_predictions(individual_predictions, question)
-                    except Exception as synth_e:
-                        logger.warning(f"Synthesizer failed for URL {question.page_url}, using average: {str(synth_e)}")
+                        parser_model_name = self.forecaster_models.get('parser', 'openrouter/qwen/qwen2.5-32b-instruct')
+                        final_percentile_list: list[Percentile] = await self._structure_prediction(
+                            synth_reasoning, list[Percentile], parser_llm
+                        )
+                        final_prediction = NumericDistribution.from_question(final_percentile_list, question)
+                        logger.info(f"Synthesized final prediction (parsed with {parser_model_name}) for URL {question.page_url}: {final_prediction.declared_percentiles}")
+                    except Exception as parser_e:
+                        logger.warning(f"Parser failed for URL {question.page_url}, using fallback: {str(parser_e)}")
                         # Fallback: average individual predictions
-                        final_prediction = self._average_numeric_predictions(individual_predictions, question)
-                        synth_reasoning = "Synthesizer failed, used average of individual predictions"
+                        final_prediction = self._average_numeric_predictions(individual_predictions, question, successful_forecasters)
+                except Exception as synth_e:
+                    logger.warning(f"Synthesizer failed for URL {question.page_url}, using average: {str(synth_e)}")
+                    # Fallback: average individual predictions
+                    final_prediction = self._average_numeric_predictions(individual_predictions, question, successful_forecasters)
+                    synth_reasoning = "Synthesizer failed, used average of individual predictions"
 
                 # Combined reasoning with model names
                 combined_reasoning_parts = []
@@ -1124,34 +1194,21 @@ class FallTemplateBot2025(ForecastBot):
                 )
                 # Define forecaster models (only 4 forecasters)
                 forecaster_keys = ["forecaster1", "forecaster2", "forecaster3", "forecaster4"]
-                individual_reasonings = []
-                individual_predictions = []
-                successful_forecasters = []
+
+                async def run_forecaster(key: str, llm: GeneralLlm | FallbackLLM) -> tuple[str, object]:
+                    reasoning = await llm.invoke(prompt)
+                    logger.info(f"Reasoning from {key} for URL {question.page_url}", extra=structured("forecaster_reasoning", {"reasoning": reasoning}, forecaster=key, url=question.page_url))
+                    percentile_list: list[Percentile] = await self._structure_prediction(
+                        reasoning, list[Percentile], self.get_llm("parser", "llm")
+                    )
+                    prediction = NumericDistribution.from_question(percentile_list, question)
+                    return reasoning, prediction
 
                 # Generate individual forecasts with error handling
-                for key in forecaster_keys:
-                    try:
-                        async with self._llm_rate_limiter:  # Rate limit LLM calls
-                            llm = self.get_llm(key, "llm")
-                            if llm is None:
-                                logger.warning(f"LLM for {key} is None, skipping")
-                                continue
-                                
-                            reasoning = await llm.invoke(prompt)
-                            logger.info(f"Reasoning from {key} for URL {question.page_url}: {reasoning}")
-                            percentile_list: list[Percentile] = await structure_output(
-                                reasoning, list[Percentile], model=self.get_llm("parser", "llm")
-                            )
-                            prediction = NumericDistribution.from_question(percentile_list, question)
-                            individual_reasonings.append(reasoning)
-                            individual_predictions.append(prediction)
-                            successful_forecasters.append(key)
-                            model_name = self.forecaster_models.get(key, 'unknown')
-                            logger.info(f"Forecast from {key} ({model_name}) for URL {question.page_url}: {prediction.declared_percentiles}")
-                    except Exception as e:
-                        logger.error(f"Forecaster {key} ({self.forecaster_models.get(key, 'unknown')}) failed for URL {question.page_url}: {str(e)}")
-                        logger.error(f"Forecaster {key} model details: {getattr(self.llms.get(key), 'model', 'N/A')}, API key source: {'personal' if key in ['forecaster2', 'forecaster3'] else 'OpenRouter'}")
-                        continue
+                successful_forecasters, individual_reasonings, individual_predictions = await self._run_forecasters(
+                    question, forecaster_keys, run_forecaster,
+                    describe_prediction=lambda prediction: prediction.declared_percentiles,
+                )
 
                 # Check if we have any successful forecasts
                 if not successful_forecasters:
@@ -1172,64 +1229,63 @@ class FallTemplateBot2025(ForecastBot):
                     )
 
                 # Synthesize final prediction
-                async with self._llm_rate_limiter:  # Rate limit LLM calls
-                    synth_prompt = clean_indents(
-                        f"""
-                        You are a synthesizer comparing multiple forecaster outputs for a numeric question.
+                synth_prompt = clean_indents(
+                    f"""
+                    You are a synthesizer comparing multiple forecaster outputs for a numeric question.
 
-                        Question: {question.question_text}
+                    Question: {question.question_text}
 
-                        Individual forecasts:
-                        """
-                    )
-                    for i, (reason, pred) in enumerate(zip(individual_reasonings, individual_predictions), 1):
-                        synth_prompt += f"\nForecaster {i}: Reasoning: {reason}\nPrediction: {pred.declared_percentiles}\n"
+                    Individual forecasts:
+                    """
+                )
+                for i, (reason, pred) in enumerate(zip(self._pack_forecaster_reasonings(individual_reasonings), individual_predictions), 1):
+                    synth_prompt += f"\nForecaster {i}: Reasoning: {reason}\nPrediction: {pred.declared_percentiles}\n"
 
-                    synth_prompt += clean_indents(
-                        f"""
-                        Compare these: Highlight agreements/disagreements, resolve via heuristics (base rates, Bayesian updates, Fermi, intangibles, qualitative elements, wide intervals, bias avoidance). Synthesize a final balanced distribution.
-
-                        Output only the final percentiles:
-                        Percentile 10: XX
-                        Percentile 20: XX
-                        Percentile 40: XX
-                        Percentile 60: XX
-                        Percentile 80: XX
-                        Percentile 90: XX
-                        """
-                    )
+                synth_prompt += clean_indents(
+                    f"""
+                    Compare these: Highlight agreements/disagreements, resolve via heuristics (base rates, Bayesian updates, Fermi, intangibles, qualitative elements, wide intervals, bias avoidance). Synthesize a final balanced distribution.
 
-                    try:
-                        synth_llm = self.get_llm("synthesizer", "llm")
-                        if synth_llm is None:
-                            # Fallback to default LLM
-                            synth_llm = self.get_llm("default", "llm")
+                    Output only the final percentiles:
+                    Percentile 10: XX
+                    Percentile 20: XX
+                    Percentile 40: XX
+                    Percentile 60: XX
+                    Percentile 80: XX
+                    Percentile 90: XX
+                    """
+                )
+
+                try:
+                    synth_llm = self.get_llm("synthesizer", "llm")
+                    if synth_llm is None:
+                        # Fallback to default LLM
+                        synth_llm = self.get_llm("default", "llm")
                             
-                        synth_model_name = self.forecaster_models.get('synthesizer', 'openrouter/qwen/qwen2.5-72b-instruct')
-                        synth_reasoning = await synth_llm.invoke(synth_prompt)
-                        logger.info(f"Synthesized reasoning (using {synth_model_name}) for URL {question.page_url}: {synth_reasoning}")
+                    synth_model_name = self.forecaster_models.get('synthesizer', 'openrouter/qwen/qwen2.5-72b-instruct')
+                    synth_reasoning = await profile_call("synthesis", synth_llm.invoke(synth_prompt))
+                    logger.info(f"Synthesized reasoning (using {synth_model_name}) for URL {question.page_url}", extra=structured("synthesis_reasoning", {"reasoning": synth_reasoning}, model=synth_model_name, url=question.page_url))
                         
-                        try:
-                            parser_llm = self.get_llm("parser", "llm")
-                            if parser_llm is None:
-                                # Fallback to default LLM
-                                parser_llm = self.get_llm("default", "llm")
+                    try:
+                        parser_llm = self.get_llm("parser", "llm")
+                        if parser_llm is None:
+                            # Fallback to default LLM
+                            parser_llm = self.get_llm("default", "llm")
                                 
-                            parser_model_name = self.forecaster_models.get('parser', 'openrouter/qwen/qwen2.5-32b-instruct')
-                            final_percentile_list: list[Percentile] = await structure_output(
-                                synth_reasoning, list[Percentile], model=parser_llm
-                            )
-                            final_prediction = NumericDistribution.from_question(final_percentile_list, question)
-                            logger.info(f"Synthesized final prediction (parsed with {parser_model_name}) for URL {question.page_url}: {final_prediction.declared_percentiles}")
-                        except Exception as parser_e:
-                            logger.warning(f"Parser failed for URL {question.page_url}, using fallback: {str(parser_e)}")
-                            # Fallback: average individual predictions
-                            final_prediction = self._average_numeric_predictions(individual_predictions, question)
-                    except Exception as synth_e:
-                        logger.warning(f"Synthesizer failed for URL {question.page_url}, using average: {str(synth_e)}")
+                        parser_model_name = self.forecaster_models.get('parser', 'openrouter/qwen/qwen2.5-32b-instruct')
+                        final_percentile_list: list[Percentile] = await self._structure_prediction(
+                            synth_reasoning, list[Percentile], parser_llm
+                        )
+                        final_prediction = NumericDistribution.from_question(final_percentile_list, question)
+                        logger.info(f"Synthesized final prediction (parsed with {parser_model_name}) for URL {question.page_url}: {final_prediction.declared_percentiles}")
+                    except Exception as parser_e:
+                        logger.warning(f"Parser failed for URL {question.page_url}, using fallback: {str(parser_e)}")
                         # Fallback: average individual predictions
-                        final_prediction = self._average_numeric_predictions(individual_predictions, question)
-                        synth_reasoning = "Synthesizer failed, used average of individual predictions"
+                        final_prediction = self._average_numeric_predictions(individual_predictions, question, successful_forecasters)
+                except Exception as synth_e:
+                    logger.warning(f"Synthesizer failed for URL {question.page_url}, using average: {str(synth_e)}")
+                    # Fallback: average individual predictions
+                    final_prediction = self._average_numeric_predictions(individual_predictions, question, successful_forecasters)
+                    synth_reasoning = "Synthesizer failed, used average of individual predictions"
 
                 # Combined reasoning with model names
                 combined_reasoning_parts = []
@@ -1285,136 +1341,44 @@ class FallTemplateBot2025(ForecastBot):
             )
         return upper_bound_message, lower_bound_message
 
-    def _average_multiple_choice_predictions(self, predictions: list, options: list) -> dict:
+    def _average_binary_predictions(self, predictions: list, forecaster_keys: list | None = None) -> float:
         """
-        Average multiple choice predictions from different forecasters.
+        Pool binary predictions from different forecasters (see aggregation.aggregate_binary).
         """
-        if not predictions:
-            # Return equal probabilities if no predictions
-            return {option: 1.0/len(options) for option in options}
-        
-        # Initialize averaged probabilities
-        averaged_probs = {option: 0.0 for option in options}
-        valid_predictions = 0
-        
-        # Sum up probabilities from all predictions
-        for pred in predictions:
-            try:
-                if isinstance(pred, dict):
-                    # If it's already a dictionary
-                    for option in options:
-                        if option in pred:
-                            averaged_probs[option] += pred[option]
-                        else:
-                            # Try to find the option with different formatting
-                            for key in pred.keys():
-                                if option.lower() in key.lower() or key.lower() in option.lower():
-                                    averaged_probs[option] += pred[key]
-                                    break
-                    valid_predictions += 1
-                elif hasattr(pred, 'options') and hasattr(pred, 'probabilities'):
-                    # If it's a PredictedOptionList object
-                    for i, option in enumerate(pred.options):
-                        if i < len(pred.probabilities) and option in options:
-                            averaged_probs[option] += pred.probabilities[i]
-                    valid_predictions += 1
-            except Exception as e:
-                logger.warning(f"Error processing prediction for averaging: {str(e)}")
-                continue
-        
-        # Average the probabilities
-        if valid_predictions > 0:
-            for option in options:
-                averaged_probs[option] /= valid_predictions
-        
-        # Normalize to ensure probabilities sum to 1.0
-        total = sum(averaged_probs.values())
-        if total > 0:
-            for option in options:
-                averaged_probs[option] /= total
-        else:
-            # If all probabilities are zero, use equal distribution
-            for option in options:
-                averaged_probs[option] = 1.0/len(options)
-        
-        return averaged_probs
+        weights = get_ensemble_weights(forecaster_keys) if forecaster_keys else None
+        return max(0.01, min(0.99, aggregate_binary(predictions, weights=weights)))
 
-    def _average_numeric_predictions(self, predictions: list, question: NumericQuestion) -> NumericDistribution:
+    def _average_multiple_choice_predictions(self, predictions: list, options: list, forecaster_keys: list | None = None) -> dict:
         """
-        Average numeric predictions from different forecasters.
+        Pool multiple choice predictions from different forecasters (see aggregation.aggregate_multiple_choice).
         """
-        if not predictions:
-            # Return a default uniform distribution if no predictions
-            default_percentiles = [
-                Percentile(percentile=0.1, value=question.lower_bound),
-                Percentile(percentile=0.2, value=question.lower_bound + (question.upper_bound - question.lower_bound) * 0.2),
-                Percentile(percentile=0.4, value=question.lower_bound + (question.upper_bound - question.lower_bound) * 0.4),
-                Percentile(percentile=0.6, value=question.lower_bound + (question.upper_bound - question.lower_bound) * 0.6),
-                Percentile(percentile=0.8, value=question.lower_bound + (question.upper_bound - question.lower_bound) * 0.8),
-                Percentile(percentile=0.9, value=question.upper_bound),
-            ]
-            return NumericDistribution.from_question(default_percentiles, question)
-        
-        # Initialize averaged percentiles
-        averaged_values = {0.1: 0.0, 0.2: 0.0, 0.4: 0.0, 0.6: 0.0, 0.8: 0.0, 0.9: 0.0}
-        valid_predictions = 0
-        
-        # Sum up values from all predictions
-        for pred in predictions:
-            try:
-                if hasattr(pred, 'declared_percentiles'):
-                    # If it's a NumericDistribution object
-                    for percentile_obj in pred.declared_percentiles:
-                        if percentile_obj.percentile in averaged_values:
-                            averaged_values[percentile_obj.percentile] += percentile_obj.value
-                    valid_predictions += 1
-                elif isinstance(pred, list):
-                    # If it's a list of Percentile objects
-                    for percentile_obj in pred:
-                        if hasattr(percentile_obj, 'percentile') and hasattr(percentile_obj, 'value'):
-                            if percentile_obj.percentile in averaged_values:
-                                averaged_values[percentile_obj.percentile] += percentile_obj.value
-                    valid_predictions += 1
-            except Exception as e:
-                logger.warning(f"Error processing numeric prediction for averaging: {str(e)}")
-                continue
-        
-        # Average the values
-        if valid_predictions > 0:
-            for percentile in averaged_values:
-                averaged_values[percentile] /= valid_predictions
-        
-        # Create percentile objects
-        percentile_list = [
-            Percentile(percentile=0.1, value=averaged_values[0.1]),
-            Percentile(percentile=0.2, value=averaged_values[0.2]),
-            Percentile(percentile=0.4, value=averaged_values[0.4]),
-            Percentile(percentile=0.6, value=averaged_values[0.6]),
-            Percentile(percentile=0.8, value=averaged_values[0.8]),
-            Percentile(percentile=0.9, value=averaged_values[0.9]),
-        ]
-        
-        # Create and return the distribution
-        return NumericDistribution.from_question(percentile_list, question)
+        weights = get_ensemble_weights(forecaster_keys) if forecaster_keys else None
+        return aggregate_multiple_choice(predictions, options, weights=weights)
 
+    def _average_numeric_predictions(self, predictions: list, question: NumericQuestion, forecaster_keys: list | None = None) -> NumericDistribution:
+        """
+        Pool numeric predictions from different forecasters (see aggregation.aggregate_numeric).
+        """
+        weights = get_ensemble_weights(forecaster_keys) if forecaster_keys else None
+        return aggregate_numeric(predictions, question, weights=weights)
 
-def main():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    )
 
-    # Add file handler for markdown output with timestamp
+def main():
+    # Structured logging: records are written by a background listener to a JSONL run log,
+    # with prompts, responses and reasoning in a compressed blob store. The markdown report
+    # is rendered from it when the run ends.
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     outputs_dir = 'outputs'
     os.makedirs(outputs_dir, exist_ok=True)
     filename = f'{outputs_dir}/forecastoutput_{timestamp}.md'
-    file_handler = logging.FileHandler(filename, mode='w', encoding='utf-8')
-    file_handler.setLevel(logging.INFO)
-    markdown_formatter = logging.Formatter('## %(asctime)s\n%(name)s - %(levelname)s\n%(message)s\n\n---\n')
-    file_handler.setFormatter(markdown_formatter)
-    logger.addHandler(file_handler)
-    print(f"Logging to {filename}")
+    run_logging = setup_run_logging(outputs_dir, timestamp)
+    atexit.register(run_logging.finish, filename)
+    telemetry_filename = f'{outputs_dir}/llm_telemetry_{timestamp}.json'
+    atexit.register(get_llm_telemetry().write, telemetry_filename)
+    profile_filename = f'{outputs_dir}/stage_profile_{timestamp}.json'
+    collapsed_filename = f'{outputs_dir}/stage_profile_{timestamp}.collapsed'
+    atexit.register(get_stage_profiler().write, profile_filename, collapsed_filename)
+    print(f"Logging to {run_logging.jsonl_path} (report: {filename})")
 
     # Configure API key for FallbackLLM system
     openrouter_key = os.getenv('OPENROUTER_API_KEY', '')
@@ -1585,6 +1549,15 @@ def main():
         },
     )
 
+    # Build every model client up front so forecasting calls reuse them, and tag each
+    # LLM with its role so per-call telemetry can be broken down by stage and forecasters
+    # sharing a model chain keep separate response cache entries
+    for key, llm in template_bot._llms.items():
+        if isinstance(llm, FallbackLLM):
+            llm.stage = llm.stage or key
+            llm.warm_up()
+    logger.info(f"Warmed up LLM client pool: {get_general_llm_pool().get_stats()}")
+
     # Send startup notification
     startup_subject = f"Metaculus Bot Starting - {run_mode} mode"
     startup_body = f"""
@@ -1594,17 +1567,14 @@ Mode: {run_mode}
 Timestamp: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 Host: {os.getenv('GITHUB_ACTIONS', 'Local')}
 """
-    send_notification_email(startup_subject, startup_body)
-
-    # Send ntfy startup notification
-    try:
-        send_bot_status_alert(
-            status="started",
-            message=f"Bot starting in {run_mode} mode from {os.getenv('GITHUB_ACTIONS', 'Local')}",
-            priority=3
-        )
-    except Exception as e:
-        logger.warning(f"Failed to send ntfy startup notification: {e}")
+    notifier = get_notifier()
+    notifier.notify(
+        startup_subject,
+        startup_body,
+        status="started",
+        priority=3,
+        summary=f"Bot starting in {run_mode} mode from {os.getenv('GITHUB_ACTIONS', 'Local')}",
+    )
 
     # Import shared components for all modes
     from forecasting_tools.helpers.metaculus_api import ApiFilter
@@ -1612,398 +1582,7 @@ Host: {os.getenv('GITHUB_ACTIONS', 'Local')}
 
     try:
         if run_mode == "tournament":
-            logger.info("Starting tournament mode forecast")
-            logger.info(f"Checking AI Competition Tournament ID: {MetaculusApi.CURRENT_AI_COMPETITION_ID}")
-            logger.info(f"Checking MiniBench Tournament ID: {MetaculusApi.CURRENT_MINIBENCH_ID}")
-            logger.info("Checking Fall AIB 2025 Tournament by slug: fall-aib-2025")
-            
-            # Use get_questions_matching_filter instead of forecast_on_tournament due to API issues
-            from forecasting_tools.helpers.metaculus_api import ApiFilter
-            
-            # Get AI Competition questions
-            ai_comp_filter = ApiFilter(
-                allowed_statuses=["open"],
-                allowed_tournaments=[MetaculusApi.CURRENT_AI_COMPETITION_ID]
-            )
-            ai_comp_questions = asyncio.run(
-                MetaculusApi.get_questions_matching_filter(ai_comp_filter)
-            )
-            
-            # For debugging, also get all AI Competition questions to see what's available
-            all_ai_comp_filter = ApiFilter(
-                allowed_tournaments=[MetaculusApi.CURRENT_AI_COMPETITION_ID]
-            )
-            all_ai_comp_questions = asyncio.run(
-                MetaculusApi.get_questions_matching_filter(all_ai_comp_filter)
-            )
-            logger.info(f"Found {len(all_ai_comp_questions)} total questions for AI Competition (including closed).")
-            
-            logger.info(f"Found {len(ai_comp_questions)} OPEN questions for AI Competition.")
-            for q in ai_comp_questions:
-                logger.info(f"  - {q.page_url}: {q.question_text} (Status: {getattr(q, 'state.name', 'unknown')})")
-            seasonal_tournament_reports = asyncio.run(
-                template_bot.forecast_questions(ai_comp_questions, return_exceptions=True)
-            )
-            
-            # Get MiniBench questions
-            minibench_filter = ApiFilter(
-                allowed_statuses=["open"],
-                allowed_tournaments=[MetaculusApi.CURRENT_MINIBENCH_ID]
-            )
-            minibench_questions = asyncio.run(
-                MetaculusApi.get_questions_matching_filter(minibench_filter)
-            )
-            
-            # For debugging, also get all MiniBench questions to see what's available
-            all_minibench_filter = ApiFilter(
-                allowed_tournaments=[MetaculusApi.CURRENT_MINIBENCH_ID]
-            )
-            all_minibench_questions = asyncio.run(
-                MetaculusApi.get_questions_matching_filter(all_minibench_filter)
-            )
-            logger.info(f"Found {len(all_minibench_questions)} total questions for MiniBench (including closed).")
-            
-            logger.info(f"Found {len(minibench_questions)} OPEN questions for MiniBench.")
-            for q in minibench_questions:
-                logger.info(f"  - {q.page_url}: {q.question_text} (Status: {getattr(q, 'state.name', 'unknown')})")
-            minibench_reports = asyncio.run(
-                template_bot.forecast_questions(minibench_questions, return_exceptions=True)
-            )
-            
-            # Get Fall AIB 2025 questions
-            logger.info("Setting skip_previously_forecasted_questions = False for tournament mode")
-            template_bot.skip_previously_forecasted_questions = False
-            fall_aib_filter = ApiFilter(
-                allowed_statuses=["open"],
-                allowed_tournaments=["fall-aib-2025"]
-            )
-            fall_aib_questions = asyncio.run(
-                MetaculusApi.get_questions_matching_filter(fall_aib_filter)
-            )
-            
-            # For debugging, also get questions with other statuses to see what's available
-            all_fall_aib_filter = ApiFilter(
-                allowed_tournaments=["fall-aib-2025"]
-            )
-            all_fall_aib_questions = asyncio.run(
-                MetaculusApi.get_questions_matching_filter(all_fall_aib_filter)
-            )
-            logger.info(f"Found {len(all_fall_aib_questions)} total questions for Fall AIB 2025 (including closed).")
-            
-            logger.info(f"Found {len(fall_aib_questions)} OPEN questions for Fall AIB 2025.")
-
-            # Send ntfy alerts for new Fall AIB questions
-            for q in fall_aib_questions:
-                logger.info(f"  - {q.page_url}: {q.question_text} (Status: {getattr(q, 'state.name', 'unknown')})")
-                try:
-                    # Determine question type
-                    question_type = "binary"
-                    if hasattr(q, 'question_type'):
-                        if q.question_type.value == "numeric":
-                            question_type = "numeric"
-                        elif q.question_type.value == "multiple_choice":
-                            question_type = "multiple_choice"
-
-                    send_new_question_alert(
-                        question_title=q.question_text[:100] + "..." if len(q.question_text) > 100 else q.question_text,
-                        question_url=q.page_url,
-                        question_type=question_type,
-                        tournament="Fall AIB 2025"
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to send ntfy alert for question {q.page_url}: {e}")
-
-            fall_aib_reports = asyncio.run(
-                template_bot.forecast_questions(fall_aib_questions, return_exceptions=True)
-            )
-            
-            # Get POTUS Predictions questions
-            logger.info("Getting POTUS Predictions tournament questions")
-            potus_filter = ApiFilter(
-                allowed_statuses=["open"],
-                allowed_tournaments=["POTUS-predictions"]
-            )
-            potus_questions = asyncio.run(
-                MetaculusApi.get_questions_matching_filter(potus_filter)
-            )
-            
-            # For debugging, also get questions with other statuses to see what's available
-            all_potus_filter = ApiFilter(
-                allowed_tournaments=["POTUS-predictions"]
-            )
-            all_potus_questions = asyncio.run(
-                MetaculusApi.get_questions_matching_filter(all_potus_filter)
-            )
-            logger.info(f"Found {len(all_potus_questions)} total questions for POTUS Predictions (including closed).")
-            
-            logger.info(f"Found {len(potus_questions)} OPEN questions for POTUS Predictions.")
-            for q in potus_questions:
-                logger.info(f"  - {q.page_url}: {q.question_text} (Status: {getattr(q, 'state.name', 'unknown')})")
-
-            # Send ntfy alerts for new POTUS questions
-            for q in potus_questions:
-                try:
-                    # Determine question type
-                    question_type = "binary"
-                    if hasattr(q, 'question_type'):
-                        if q.question_type.value == "numeric":
-                            question_type = "numeric"
-                        elif q.question_type.value == "multiple_choice":
-                            question_type = "multiple_choice"
-                    
-                    send_new_question_alert(
-                        question_title=q.question_text[:100] + "..." if len(q.question_text) > 100 else q.question_text,
-                        question_url=q.page_url,
-                        question_type=question_type,
-                        tournament="POTUS Predictions"
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to send ntfy alert for POTUS question {q.page_url}: {e}")
-
-            potus_reports = asyncio.run(
-                template_bot.forecast_questions(potus_questions, return_exceptions=True)
-            )
-            
-            # Get RAND Policy Challenge questions
-            logger.info("Getting RAND Policy Challenge tournament questions")
-            rand_filter = ApiFilter(
-                allowed_statuses=["open"],
-                allowed_tournaments=["rand"]
-            )
-            rand_questions = asyncio.run(
-                MetaculusApi.get_questions_matching_filter(rand_filter)
-            )
-            
-            # For debugging, also get questions with other statuses to see what's available
-            all_rand_filter = ApiFilter(
-                allowed_tournaments=["rand"]
-            )
-            all_rand_questions = asyncio.run(
-                MetaculusApi.get_questions_matching_filter(all_rand_filter)
-            )
-            logger.info(f"Found {len(all_rand_questions)} total questions for RAND Policy Challenge (including closed).")
-            
-            logger.info(f"Found {len(rand_questions)} OPEN questions for RAND Policy Challenge.")
-            for q in rand_questions:
-                logger.info(f"  - {q.page_url}: {q.question_text} (Status: {getattr(q, 'state.name', 'unknown')})")
-
-            # Send ntfy alerts for new RAND questions
-            for q in rand_questions:
-                try:
-                    # Determine question type
-                    question_type = "binary"
-                    if hasattr(q, 'question_type'):
-                        if q.question_type.value == "numeric":
-                            question_type = "numeric"
-                        elif q.question_type.value == "multiple_choice":
-                            question_type = "multiple_choice"
-                    
-                    send_new_question_alert(
-                        question_title=q.question_text[:100] + "..." if len(q.question_text) > 100 else q.question_text,
-                        question_url=q.page_url,
-                        question_type=question_type,
-                        tournament="RAND Policy Challenge"
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to send ntfy alert for RAND question {q.page_url}: {e}")
-
-            rand_reports = asyncio.run(
-                template_bot.forecast_questions(rand_questions, return_exceptions=True)
-            )
-            
-            # Get Market Pulse Challenge 25Q4 questions
-            logger.info("Getting Market Pulse Challenge 25Q4 tournament questions")
-            logger.info(f"Using Market Pulse tournament ID: {MetaculusApi.CURRENT_MARKET_PULSE_ID}")
-            market_pulse_questions = []
-            
-            # Method 1: Try tournament filter (primary method)
-            try:
-                market_pulse_filter = ApiFilter(
-                    allowed_statuses=["open"],
-                    allowed_tournaments=[MetaculusApi.CURRENT_MARKET_PULSE_ID]
-                )
-                market_pulse_questions = asyncio.run(
-                    MetaculusApi.get_questions_matching_filter(market_pulse_filter)
-                )
-                logger.info(f"Method 1 - Tournament filter: Found {len(market_pulse_questions)} Market Pulse questions")
-            except Exception as e:
-                logger.warning(f"Method 1 failed: {e}")
-            
-            # Method 2: For debugging, also get all Market Pulse questions to see what's available
-            try:
-                all_market_pulse_filter = ApiFilter(
-                    allowed_tournaments=[MetaculusApi.CURRENT_MARKET_PULSE_ID]
-                )
-                all_market_pulse_questions = asyncio.run(
-                    MetaculusApi.get_questions_matching_filter(all_market_pulse_filter)
-                )
-                logger.info(f"Found {len(all_market_pulse_questions)} total questions for Market Pulse Challenge 25Q4 (including closed).")
-            except Exception as e:
-                logger.warning(f"Error getting all Market Pulse questions: {e}")
-            
-            # Method 3: Keyword fallback from all open questions
-            if len(market_pulse_questions) == 0:
-                logger.warning("No Market Pulse questions found via tournament filter, trying keyword fallback...")
-                try:
-                    all_open_filter = ApiFilter(allowed_statuses=["open"])
-                    all_open_questions = asyncio.run(
-                        MetaculusApi.get_questions_matching_filter(all_open_filter)
-                    )
-                    
-                    # Market Pulse keywords for fallback detection
-                    market_pulse_keywords = [
-                        'S&P 500', 'stock market', 'Market Pulse', 'market index', 
-                        'trading', 'financial markets', 'equity markets', 'volatility',
-                        'NYSE', 'NASDAQ', 'Dow Jones', 'VIX', 'market volatility',
-                        'stock price', 'index fund', 'ETF', 'market returns'
-                    ]
-                    
-                    for q in all_open_questions:
-                        if hasattr(q, 'question_text'):
-                            question_text_lower = q.question_text.lower()
-                            if any(keyword.lower() in question_text_lower for keyword in market_pulse_keywords):
-                                if q not in market_pulse_questions:  # Avoid duplicates
-                                    market_pulse_questions.append(q)
-                                    logger.info(f"Found Market Pulse question by keyword: {q.question_text[:50]}...")
-                    
-                    logger.info(f"After keyword fallback: {len(market_pulse_questions)} total Market Pulse questions")
-                except Exception as e:
-                    logger.error(f"Error with Market Pulse keyword fallback: {e}")
-            
-            # Method 4: Check for Market Pulse in project/series metadata
-            if len(market_pulse_questions) == 0:
-                logger.warning("Still no Market Pulse questions, checking project metadata...")
-                try:
-                    all_open_filter = ApiFilter(allowed_statuses=["open"])
-                    all_open_questions = asyncio.run(
-                        MetaculusApi.get_questions_matching_filter(all_open_filter)
-                    )
-                    
-                    for q in all_open_questions:
-                        # Check various metadata fields for Market Pulse
-                        if hasattr(q, 'projects') and q.projects:
-                            for project in q.projects:
-                                if hasattr(project, 'title') and 'market' in project.title.lower():
-                                    market_pulse_questions.append(q)
-                                    logger.info(f"Found Market Pulse by project title: {q.question_text[:50]}...")
-                                    break
-                                elif hasattr(project, 'slug') and 'market' in project.slug.lower():
-                                    market_pulse_questions.append(q)
-                                    logger.info(f"Found Market Pulse by project slug: {q.question_text[:50]}...")
-                                    break
-                        
-                        # Check series metadata
-                        if hasattr(q, 'series') and q.series:
-                            if hasattr(q.series, 'title') and 'market' in q.series.title.lower():
-                                market_pulse_questions.append(q)
-                                logger.info(f"Found Market Pulse by series title: {q.question_text[:50]}...")
-                            elif hasattr(q.series, 'slug') and 'market' in q.series.slug.lower():
-                                market_pulse_questions.append(q)
-                                logger.info(f"Found Market Pulse by series slug: {q.question_text[:50]}...")
-                    
-                    logger.info(f"After project metadata check: {len(market_pulse_questions)} total Market Pulse questions")
-                except Exception as e:
-                    logger.error(f"Error with Market Pulse project metadata check: {e}")
-            
-            logger.info(f"Final count: {len(market_pulse_questions)} Market Pulse Challenge 25Q4 questions")
-            for q in market_pulse_questions:
-                logger.info(f"  - {q.page_url}: {q.question_text[:80]}... (Status: {getattr(q, 'state.name', 'unknown')})")
-                
-                # Send ntfy alerts for new Market Pulse questions
-                try:
-                    question_type = "binary"
-                    if hasattr(q, 'question_type'):
-                        if q.question_type.value == "numeric":
-                            question_type = "numeric"
-                        elif q.question_type.value == "multiple_choice":
-                            question_type = "multiple_choice"
-                    
-                    send_new_question_alert(
-                        question_title=f"[MARKET PULSE] {q.question_text[:80]}...",
-                        question_url=q.page_url,
-                        question_type=question_type,
-                        tournament="Market Pulse Challenge 25Q4"
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to send ntfy alert for Market Pulse question {q.page_url}: {e}")
-
-            # Fallback: If no Market Pulse questions found via tournament filter, try keyword search
-            if len(market_pulse_questions) == 0:
-                logger.warning("No Market Pulse questions found via tournament filter, trying keyword fallback...")
-                try:
-                    all_open_filter = ApiFilter(allowed_statuses=["open"])
-                    all_open_questions = asyncio.run(
-                        MetaculusApi.get_questions_matching_filter(all_open_filter)
-                    )
-                    
-                    # Market Pulse keywords for fallback detection
-                    market_pulse_keywords = [
-                        'S&P 500', 'stock market', 'Market Pulse', 'market index', 
-                        'trading', 'financial markets', 'equity markets', 'volatility',
-                        'NYSE', 'NASDAQ', 'Dow Jones'
-                    ]
-                    
-                    for q in all_open_questions:
-                        if hasattr(q, 'question_text'):
-                            question_text_lower = q.question_text.lower()
-                            if any(keyword.lower() in question_text_lower for keyword in market_pulse_keywords):
-                                market_pulse_questions.append(q)
-                                logger.info(f"Found Market Pulse question by keyword: {q.question_text[:50]}...")
-                    
-                    logger.info(f"After keyword fallback: {len(market_pulse_questions)} total Market Pulse questions")
-                except Exception as e:
-                    logger.error(f"Error with Market Pulse keyword fallback: {e}")
-
-            market_pulse_reports = asyncio.run(
-                template_bot.forecast_questions(market_pulse_questions, return_exceptions=True)
-            )
-            
-            # Get Kiko Llaneras Tournament questions
-            logger.info("Getting Kiko Llaneras Tournament questions")
-            kiko_questions = []
-            
-            # Community-based detection (most reliable)
-            try:
-                all_open_filter = ApiFilter(allowed_statuses=["open"])
-                all_open_questions = asyncio.run(
-                    MetaculusApi.get_questions_matching_filter(all_open_filter)
-                )
-                
-                for q in all_open_questions:
-                    if hasattr(q, 'community') and q.community:
-                        if hasattr(q.community, 'slug') and q.community.slug == 'kiko':
-                            kiko_questions.append(q)
-                        elif hasattr(q, 'community_slug') and q.community_slug == 'kiko':
-                            kiko_questions.append(q)
-                
-                logger.info(f"Found {len(kiko_questions)} questions in 'kiko' community")
-            except Exception as e:
-                logger.info(f"Error with community detection: {e}")
-            
-            # Keyword fallback
-            if len(kiko_questions) == 0:
-                kiko_keywords = ['Kiko Llaneras', 'Llaneras', 'Kiko', 'Kiko Llaneras Tournament']
-                
-                for q in all_open_questions:
-                    if hasattr(q, 'question_text'):
-                        question_text_lower = q.question_text.lower()
-                        if any(keyword.lower() in question_text_lower for keyword in kiko_keywords):
-                            if q not in kiko_questions:
-                                kiko_questions.append(q)
-                                logger.info(f"Found Kiko question by keyword: {q.question_text[:50]}...")
-                
-                logger.info(f"After keyword fallback: {len(kiko_questions)} total Kiko questions")
-            
-            logger.info(f"Found {len(kiko_questions)} Kiko Llaneras Tournament questions")
-            for q in kiko_questions:
-                logger.info(f"  - {q.page_url}: {q.question_text} (Status: {getattr(q, 'state.name', 'unknown')})")
-
-            kiko_reports = asyncio.run(
-                template_bot.forecast_questions(kiko_questions, return_exceptions=True)
-            )
-
-            
-            forecast_reports = seasonal_tournament_reports + minibench_reports + fall_aib_reports + potus_reports + rand_reports + market_pulse_reports + kiko_reports
+            forecast_reports = asyncio.run(run_tournament_mode(template_bot))
         elif run_mode == "metaculus_cup":
             # The Metaculus cup is a good way to test the bot's performance on regularly open questions. 
             # The permanent ID for the Metaculus Cup is now 32828
@@ -2094,7 +1673,9 @@ Host: {os.getenv('GITHUB_ACTIONS', 'Local')}
             logger.info(f"Found {len(fall_aib_questions)} Fall AIB questions by pattern")
             
             # Step 5: Combine all found questions, avoiding duplicates
-            all_found_questions = list(set(tournament_questions + market_pulse_questions + fall_aib_questions))
+            all_found_questions = list({
+                get_question_key(q): q for q in tournament_questions + market_pulse_questions + fall_aib_questions
+            }.values())
             logger.info(f"Total unique questions found: {len(all_found_questions)}")
             
             # Step 6: Forecast on all found questions
@@ -2142,9 +1723,8 @@ Host: {os.getenv('GITHUB_ACTIONS', 'Local')}
                 except Exception as e:
                     logger.warning(f"Failed to send ntfy alert for Market Pulse/Fall AIB question {q.page_url}: {e}")
 
-            fall_aib_reports = asyncio.run(
-                template_bot.forecast_questions(fall_aib_questions, return_exceptions=True)
-            )
+            # fall_aib_questions are part of all_found_questions, so their reports are already in forecast_reports
+            fall_aib_reports = list(forecast_reports)
             
             # Also check for recently missed Market Pulse + Fall AIB questions
             logger.info("Checking for recently missed Market Pulse + Fall AIB questions...")
@@ -2184,17 +1764,15 @@ Host: {os.getenv('GITHUB_ACTIONS', 'Local')}
             exit(1)
 
     # Log final summary
-        if run_mode == "tournament":
-            logger.info(f"All tournament processing completed. Found questions: AI Comp: {len(ai_comp_questions)}, MiniBench: {len(minibench_questions)}, Fall AIB: {len(fall_aib_questions)}, POTUS: {len(potus_questions)}, RAND: {len(rand_questions)}, Market Pulse: {len(market_pulse_questions)}, Kiko: {len(kiko_questions)}")
-            
-            # Check for recently missed questions that the bot might have missed
-            # This catches questions that were only open for a short time window
-            logger.info("Checking for recently missed questions...")
-            recently_missed_reports = asyncio.run(check_recently_missed_questions(template_bot))
-            forecast_reports.extend(recently_missed_reports)
-
         logger.info("Forecasting completed successfully")
         template_bot.log_report_summary(forecast_reports)
+        logger.info(f"Model health summary: {get_model_health_registry().get_summary()}")
+        logger.info(f"LLM client pool stats: {get_general_llm_pool().get_stats()}")
+        logger.info(f"Rate limiter stats: {get_rate_limiter().get_stats()}")
+        if get_forecast_registry() is not None:
+            logger.info(f"Forecast dedup stats: {get_forecast_registry().get_stats()}")
+        if get_llm_response_cache() is not None:
+            logger.info(f"LLM response cache stats: {get_llm_response_cache().get_stats()}")
         
         # Send completion notification
         completion_subject = f"Metaculus Bot Completed - {run_mode} mode"
@@ -2209,23 +1787,29 @@ Output file: {filename}
 Questions processed: {len([r for r in forecast_reports if r is not None and not isinstance(r, Exception)])}
 Questions with errors: {len([r for r in forecast_reports if isinstance(r, Exception)])}
 """
-        send_notification_email(completion_subject, completion_body)
-
-        # Send ntfy completion notification
-        try:
-            successful_reports = len([r for r in forecast_reports if r is not None and not isinstance(r, Exception)])
-            error_reports = len([r for r in forecast_reports if isinstance(r, Exception)])
-
-            status_type = "success" if error_reports == 0 else "warning" if successful_reports > 0 else "error"
-            priority = 2 if error_reports == 0 else 4 if successful_reports > 0 else 5
+        successful_reports = len([r for r in forecast_reports if r is not None and not isinstance(r, Exception)])
+        error_reports = len([r for r in forecast_reports if isinstance(r, Exception)])
+
+        status_type = "success" if error_reports == 0 else "warning" if successful_reports > 0 else "error"
+        priority = 2 if error_reports == 0 else 4 if successful_reports > 0 else 5
+
+        notifier.notify(
+            completion_subject,
+            completion_body,
+            status=status_type,
+            priority=priority,
+            summary=f"Bot completed {run_mode} mode. Processed: {successful_reports}, Errors: {error_reports}",
+        )
 
-            send_bot_status_alert(
-                status=status_type,
-                message=f"Bot completed {run_mode} mode. Processed: {successful_reports}, Errors: {error_reports}",
-                priority=priority
-            )
-        except Exception as e:
-            logger.warning(f"Failed to send ntfy completion notification: {e}")
+        # Notifications are delivered in the background; make sure they go out before the run ends
+        notifier.flush()
+        get_llm_telemetry().log_summary()
+        get_llm_telemetry().write(telemetry_filename)
+        logger.info(f"LLM telemetry written to {telemetry_filename}")
+        get_stage_profiler().log_summary()
+        get_stage_profiler().write(profile_filename, collapsed_filename)
+        logger.info(f"Stage profile written to {profile_filename} and {collapsed_filename}")
+        run_logging.finish(filename)
 
     except Exception as e:
         logger.error(f"An unexpected error occurred: {str(e)}")
@@ -2241,6 +1825,224 @@ Questions with errors: {len([r for r in forecast_reports if isinstance(r, Except
             exit(0)
 
 
+async def run_tournament_mode(template_bot) -> list:
+    """
+    Forecast every tournament of a tournament-mode run inside one event loop.
+
+    Selects each tournament's questions from a shared inventory, then forecasts the combined,
+    deduplicated set through one bounded work queue ordered by close time, so a slow question
+    in one tournament no longer holds up the others. Returns the reports of every unique
+    question plus those of recently missed questions.
+    """
+    from forecasting_tools import MetaculusApi
+
+    logger.info("Starting tournament mode forecast")
+    logger.info(f"Checking AI Competition Tournament ID: {MetaculusApi.CURRENT_AI_COMPETITION_ID}")
+    logger.info(f"Checking MiniBench Tournament ID: {MetaculusApi.CURRENT_MINIBENCH_ID}")
+    logger.info("Checking Fall AIB 2025 Tournament by slug: fall-aib-2025")
+    
+    # Fetch every tournament's open questions plus the global open set once, concurrently,
+    # and serve all per-tournament selections below from memory
+    inventory = await QuestionInventory().load([
+        MetaculusApi.CURRENT_AI_COMPETITION_ID,
+        MetaculusApi.CURRENT_MINIBENCH_ID,
+        "fall-aib-2025",
+        "POTUS-predictions",
+        "rand",
+        MetaculusApi.CURRENT_MARKET_PULSE_ID,
+    ])
+
+    # Get AI Competition questions
+    ai_comp_questions = inventory.get_tournament_questions(MetaculusApi.CURRENT_AI_COMPETITION_ID)
+    logger.info(f"Found {len(ai_comp_questions)} OPEN questions for AI Competition.")
+    for q in ai_comp_questions:
+        logger.info(f"  - {q.page_url}: {q.question_text} (Status: {getattr(q, 'state.name', 'unknown')})")
+    
+    # Get MiniBench questions
+    minibench_questions = inventory.get_tournament_questions(MetaculusApi.CURRENT_MINIBENCH_ID)
+    logger.info(f"Found {len(minibench_questions)} OPEN questions for MiniBench.")
+    for q in minibench_questions:
+        logger.info(f"  - {q.page_url}: {q.question_text} (Status: {getattr(q, 'state.name', 'unknown')})")
+    
+    # Get Fall AIB 2025 questions
+    logger.info("Setting skip_previously_forecasted_questions = False for tournament mode")
+    template_bot.skip_previously_forecasted_questions = False
+    fall_aib_questions = inventory.get_tournament_questions("fall-aib-2025")
+    logger.info(f"Found {len(fall_aib_questions)} OPEN questions for Fall AIB 2025.")
+
+    # Send ntfy alerts for new Fall AIB questions
+    for q in fall_aib_questions:
+        logger.info(f"  - {q.page_url}: {q.question_text} (Status: {getattr(q, 'state.name', 'unknown')})")
+        try:
+            # Determine question type
+            question_type = "binary"
+            if hasattr(q, 'question_type'):
+                if q.question_type.value == "numeric":
+                    question_type = "numeric"
+                elif q.question_type.value == "multiple_choice":
+                    question_type = "multiple_choice"
+
+            send_new_question_alert(
+                question_title=q.question_text[:100] + "..." if len(q.question_text) > 100 else q.question_text,
+                question_url=q.page_url,
+                question_type=question_type,
+                tournament="Fall AIB 2025"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to send ntfy alert for question {q.page_url}: {e}")
+
+    
+    # Get POTUS Predictions questions
+    logger.info("Getting POTUS Predictions tournament questions")
+    potus_questions = inventory.get_tournament_questions("POTUS-predictions")
+    logger.info(f"Found {len(potus_questions)} OPEN questions for POTUS Predictions.")
+    for q in potus_questions:
+        logger.info(f"  - {q.page_url}: {q.question_text} (Status: {getattr(q, 'state.name', 'unknown')})")
+
+    # Send ntfy alerts for new POTUS questions
+    for q in potus_questions:
+        try:
+            # Determine question type
+            question_type = "binary"
+            if hasattr(q, 'question_type'):
+                if q.question_type.value == "numeric":
+                    question_type = "numeric"
+                elif q.question_type.value == "multiple_choice":
+                    question_type = "multiple_choice"
+            
+            send_new_question_alert(
+                question_title=q.question_text[:100] + "..." if len(q.question_text) > 100 else q.question_text,
+                question_url=q.page_url,
+                question_type=question_type,
+                tournament="POTUS Predictions"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to send ntfy alert for POTUS question {q.page_url}: {e}")
+
+    
+    # Get RAND Policy Challenge questions
+    logger.info("Getting RAND Policy Challenge tournament questions")
+    rand_questions = inventory.get_tournament_questions("rand")
+    logger.info(f"Found {len(rand_questions)} OPEN questions for RAND Policy Challenge.")
+    for q in rand_questions:
+        logger.info(f"  - {q.page_url}: {q.question_text} (Status: {getattr(q, 'state.name', 'unknown')})")
+
+    # Send ntfy alerts for new RAND questions
+    for q in rand_questions:
+        try:
+            # Determine question type
+            question_type = "binary"
+            if hasattr(q, 'question_type'):
+                if q.question_type.value == "numeric":
+                    question_type = "numeric"
+                elif q.question_type.value == "multiple_choice":
+                    question_type = "multiple_choice"
+            
+            send_new_question_alert(
+                question_title=q.question_text[:100] + "..." if len(q.question_text) > 100 else q.question_text,
+                question_url=q.page_url,
+                question_type=question_type,
+                tournament="RAND Policy Challenge"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to send ntfy alert for RAND question {q.page_url}: {e}")
+
+    
+    # Get Market Pulse Challenge 25Q4 questions
+    logger.info("Getting Market Pulse Challenge 25Q4 tournament questions")
+    logger.info(f"Using Market Pulse tournament ID: {MetaculusApi.CURRENT_MARKET_PULSE_ID}")
+
+    # Method 1: Tournament filter (primary method)
+    market_pulse_questions = inventory.get_tournament_questions(MetaculusApi.CURRENT_MARKET_PULSE_ID)
+    logger.info(f"Method 1 - Tournament filter: Found {len(market_pulse_questions)} Market Pulse questions")
+
+    # Method 2: Keyword fallback from all open questions
+    if len(market_pulse_questions) == 0:
+        logger.warning("No Market Pulse questions found via tournament filter, trying keyword fallback...")
+        # Market Pulse keywords for fallback detection
+        market_pulse_keywords = [
+            'S&P 500', 'stock market', 'Market Pulse', 'market index', 
+            'trading', 'financial markets', 'equity markets', 'volatility',
+            'NYSE', 'NASDAQ', 'Dow Jones', 'VIX', 'market volatility',
+            'stock price', 'index fund', 'ETF', 'market returns'
+        ]
+        market_pulse_questions = inventory.find_by_keywords(market_pulse_keywords)
+        for q in market_pulse_questions:
+            logger.info(f"Found Market Pulse question by keyword: {q.question_text[:50]}...")
+        logger.info(f"After keyword fallback: {len(market_pulse_questions)} total Market Pulse questions")
+
+    # Method 3: Check for Market Pulse in project/series metadata
+    if len(market_pulse_questions) == 0:
+        logger.warning("Still no Market Pulse questions, checking project metadata...")
+        market_pulse_questions = inventory.find_by_project_term('market')
+        for q in market_pulse_questions:
+            logger.info(f"Found Market Pulse by project metadata: {q.question_text[:50]}...")
+        logger.info(f"After project metadata check: {len(market_pulse_questions)} total Market Pulse questions")
+    
+    logger.info(f"Final count: {len(market_pulse_questions)} Market Pulse Challenge 25Q4 questions")
+    for q in market_pulse_questions:
+        logger.info(f"  - {q.page_url}: {q.question_text[:80]}... (Status: {getattr(q, 'state.name', 'unknown')})")
+        
+        # Send ntfy alerts for new Market Pulse questions
+        try:
+            question_type = "binary"
+            if hasattr(q, 'question_type'):
+                if q.question_type.value == "numeric":
+                    question_type = "numeric"
+                elif q.question_type.value == "multiple_choice":
+                    question_type = "multiple_choice"
+            
+            send_new_question_alert(
+                question_title=f"[MARKET PULSE] {q.question_text[:80]}...",
+                question_url=q.page_url,
+                question_type=question_type,
+                tournament="Market Pulse Challenge 25Q4"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to send ntfy alert for Market Pulse question {q.page_url}: {e}")
+
+    
+    # Get Kiko Llaneras Tournament questions
+    logger.info("Getting Kiko Llaneras Tournament questions")
+
+    # Community-based detection (most reliable)
+    kiko_questions = inventory.get_community_questions('kiko')
+    logger.info(f"Found {len(kiko_questions)} questions in 'kiko' community")
+    
+    # Keyword fallback
+    if len(kiko_questions) == 0:
+        kiko_keywords = ['Kiko Llaneras', 'Llaneras', 'Kiko', 'Kiko Llaneras Tournament']
+        kiko_questions = inventory.find_by_keywords(kiko_keywords)
+        for q in kiko_questions:
+            logger.info(f"Found Kiko question by keyword: {q.question_text[:50]}...")
+        logger.info(f"After keyword fallback: {len(kiko_questions)} total Kiko questions")
+    
+    logger.info(f"Found {len(kiko_questions)} Kiko Llaneras Tournament questions")
+    for q in kiko_questions:
+        logger.info(f"  - {q.page_url}: {q.question_text} (Status: {getattr(q, 'state.name', 'unknown')})")
+
+    tournament_questions = {
+        "AI Competition": ai_comp_questions,
+        "MiniBench": minibench_questions,
+        "Fall AIB 2025": fall_aib_questions,
+        "POTUS Predictions": potus_questions,
+        "RAND Policy Challenge": rand_questions,
+        "Market Pulse Challenge 25Q4": market_pulse_questions,
+        "Kiko Llaneras Tournament": kiko_questions,
+    }
+    logger.info(f"All tournament processing completed. Found questions: AI Comp: {len(ai_comp_questions)}, MiniBench: {len(minibench_questions)}, Fall AIB: {len(fall_aib_questions)}, POTUS: {len(potus_questions)}, RAND: {len(rand_questions)}, Market Pulse: {len(market_pulse_questions)}, Kiko: {len(kiko_questions)}")
+
+    forecast_reports, reports_by_tournament = await QuestionScheduler(template_bot).run(tournament_questions)
+    logger.info(f"Reports per tournament: { {name: len(reports) for name, reports in reports_by_tournament.items()} }")
+
+    # Check for recently missed questions that the bot might have missed
+    # This catches questions that were only open for a short time window
+    logger.info("Checking for recently missed questions...")
+    recently_missed_reports = await check_recently_missed_questions(template_bot)
+    forecast_reports.extend(recently_missed_reports)
+    return forecast_reports
+
+
 async def check_recently_missed_questions(template_bot):
     """
     Check for recently closed questions that the bot might have missed.
@@ -582,20 +582,19 @@ def extract_percentiles_from_response(forecast_text: str) -> dict:
         raise ValueError(f"Could not extract prediction from response: {forecast_text}")
 
 
-def generate_continuous_cdf(
+def _percentile_points(
     percentile_values: dict,
-    question_type: str,
     open_upper_bound: bool,
     open_lower_bound: bool,
     upper_bound: float,
     lower_bound: float,
-    zero_point: float | None,
-    cdf_size: int,
-) -> list[float]:
+) -> tuple[np.ndarray, np.ndarray]:
     """
-    Returns: list[float]: A list of 201 float values representing the CDF.
+    Returns: the known (value, percentile) points of one forecast as two arrays sorted by value,
+    after moving values off closed bounds and adding the implied points at the bounds.
+    Repeated values keep the highest percentile.
     """
-
+    percentile_values = dict(percentile_values)
     percentile_max = max(float(key) for key in percentile_values.keys())
     percentile_min = min(float(key) for key in percentile_values.keys())
     range_min = lower_bound
@@ -624,73 +623,119 @@ def generate_continuous_cdf(
     else:
         percentile_values[0] = range_min
 
-    sorted_percentile_values = dict(sorted(percentile_values.items()))
-
-    # Normalize percentile keys
-    normalized_percentile_values = {}
-    for key, value in sorted_percentile_values.items():
-        percentile = float(key) / 100
-        normalized_percentile_values[percentile] = value
-
-
     value_percentiles = {
-        value: key for key, value in normalized_percentile_values.items()
+        value: float(key) / 100 for key, value in sorted(percentile_values.items())
     }
+    known_values = np.array(sorted(value_percentiles), dtype=float)
+    known_percentiles = np.array([value_percentiles[value] for value in known_values], dtype=float)
+    return known_values, known_percentiles
 
-    # function for log scaled questions
-    def generate_cdf_locations(range_min, range_max, zero_point):
-        if zero_point is None:
-            scale = lambda x: range_min + (range_max - range_min) * x
-        else:
-            deriv_ratio = (range_max - zero_point) / (range_min - zero_point)
-            scale = lambda x: range_min + (range_max - range_min) * (
-                deriv_ratio**x - 1
-            ) / (deriv_ratio - 1)
-        return [scale(x) for x in np.linspace(0, 1, cdf_size)]
-
-    cdf_xaxis = generate_cdf_locations(range_min, range_max, zero_point)
-
-    def linear_interpolation(x_values, xy_pairs):
-        # Sort the xy_pairs by x-values
-        sorted_pairs = sorted(xy_pairs.items())
 
-        # Extract sorted x and y values
-        known_x = [pair[0] for pair in sorted_pairs]
-        known_y = [pair[1] for pair in sorted_pairs]
-
-        # Initialize the result list
-        y_values = []
+def generate_cdf_locations(
+    lower_bounds: np.ndarray,
+    upper_bounds: np.ndarray,
+    zero_points: np.ndarray,
+    cdf_size: int,
+) -> np.ndarray:
+    """
+    Returns: np.ndarray of shape (questions, cdf_size) with the x-axis of each question's CDF.
+    Rows whose zero point is NaN are linearly spaced, the others log scaled.
+    """
+    steps = np.linspace(0, 1, cdf_size)[None, :]
+    lower = lower_bounds[:, None]
+    span = (upper_bounds - lower_bounds)[:, None]
+    is_log = ~np.isnan(zero_points)
+    deriv_ratio = np.where(
+        is_log,
+        (upper_bounds - zero_points) / np.where(is_log, lower_bounds - zero_points, 1.0),
+        2.0,
+    )[:, None]
+    log_locations = lower + span * (deriv_ratio**steps - 1) / (deriv_ratio - 1)
+    return np.where(is_log[:, None], log_locations, lower + span * steps)
+
+
+def generate_continuous_cdfs(
+    percentile_value_sets: list[dict],
+    open_upper_bound,
+    open_lower_bound,
+    upper_bound,
+    lower_bound,
+    zero_point,
+    cdf_size: int,
+) -> np.ndarray:
+    """
+    Builds the CDFs of a batch of forecasts at once. Bounds and zero points can be given
+    per forecast (as sequences) or shared by the batch (as single values).
 
-        for x in x_values:
-            # Check if x is exactly in the known x values
-            if x in known_x:
-                y_values.append(known_y[known_x.index(x)])
-            else:
-                # Find the indices of the two nearest known x-values
-                i = 0
-                while i < len(known_x) and known_x[i] < x:
-                    i += 1
+    Returns: np.ndarray of shape (forecasts, cdf_size), one CDF per row.
+    """
+    count = len(percentile_value_sets)
 
-                list_index_2 = i
+    def per_forecast(value) -> list:
+        return list(value) if isinstance(value, (list, tuple, np.ndarray)) else [value] * count
 
-                # If x is outside the range of known x-values, use the nearest endpoint
-                if i == 0:
-                    y_values.append(known_y[0])
-                elif i == len(known_x):
-                    y_values.append(known_y[-1])
-                else:
-                    # Perform linear interpolation
-                    x0, x1 = known_x[i - 1], known_x[i]
-                    y0, y1 = known_y[i - 1], known_y[i]
+    open_uppers = per_forecast(open_upper_bound)
+    open_lowers = per_forecast(open_lower_bound)
+    uppers = np.array(per_forecast(upper_bound), dtype=float)
+    lowers = np.array(per_forecast(lower_bound), dtype=float)
+    zero_points = np.array([np.nan if z is None else z for z in per_forecast(zero_point)], dtype=float)
 
-                    # Linear interpolation formula
-                    y = y0 + (x - x0) * (y1 - y0) / (x1 - x0)
-                    y_values.append(y)
+    points = [
+        _percentile_points(values, open_uppers[i], open_lowers[i], uppers[i], lowers[i])
+        for i, values in enumerate(percentile_value_sets)
+    ]
+    # Pad the known points to a rectangle: values with +inf, percentiles with the last percentile
+    width = max(len(known_values) for known_values, _ in points)
+    known_values = np.full((count, width), np.inf)
+    known_percentiles = np.empty((count, width))
+    known_counts = np.empty(count, dtype=int)
+    for i, (values, percentiles) in enumerate(points):
+        known_values[i, :len(values)] = values
+        known_percentiles[i, :len(percentiles)] = percentiles
+        known_percentiles[i, len(percentiles):] = percentiles[-1]
+        known_counts[i] = len(values)
+
+    locations = generate_cdf_locations(lowers, uppers, zero_points, cdf_size)
+
+    # Per row, the index of the first known value >= each location (a row-wise searchsorted)
+    index = (known_values[:, None, :] < locations[:, :, None]).sum(axis=2)
+    below = np.clip(index - 1, 0, None)
+    above = np.minimum(index, known_counts[:, None] - 1)
+    x0 = np.take_along_axis(known_values, below, axis=1)
+    x1 = np.take_along_axis(known_values, above, axis=1)
+    y0 = np.take_along_axis(known_percentiles, below, axis=1)
+    y1 = np.take_along_axis(known_percentiles, above, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        interpolated = y0 + (locations - x0) * (y1 - y0) / (x1 - x0)
+
+    # Outside the known values use the nearest endpoint
+    last_percentiles = known_percentiles[np.arange(count), known_counts - 1][:, None]
+    cdfs = np.where(index == 0, known_percentiles[:, :1], interpolated)
+    return np.where(index >= known_counts[:, None], last_percentiles, cdfs)
 
-        return y_values
 
-    continuous_cdf = linear_interpolation(cdf_xaxis, value_percentiles)
-    return continuous_cdf
+def generate_continuous_cdf(
+    percentile_values: dict,
+    question_type: str,
+    open_upper_bound: bool,
+    open_lower_bound: bool,
+    upper_bound: float,
+    lower_bound: float,
+    zero_point: float | None,
+    cdf_size: int,
+) -> list[float]:
+    """
+    Returns: list[float]: A list of 201 float values representing the CDF.
+    """
+    return generate_continuous_cdfs(
+        [percentile_values],
+        open_upper_bound,
+        open_lower_bound,
+        upper_bound,
+        lower_bound,
+        zero_point,
+        cdf_size,
+    )[0].tolist()
 
 
 async def get_numeric_gpt_prediction(
@@ -740,7 +785,7 @@ async def get_numeric_gpt_prediction(
         units=unit_of_measure,
     )
 
-    async def ask_llm_to_get_cdf(content: str) -> tuple[list[float], str]:
+    async def ask_llm_for_percentiles(content: str) -> tuple[dict, str]:
         rationale = await call_llm(content)
         percentile_values = extract_percentiles_from_response(rationale)
 
@@ -749,28 +794,25 @@ async def get_numeric_gpt_prediction(
             f"{rationale}\n\n\n"
         )
 
-        cdf = generate_continuous_cdf(
-            percentile_values,
-            question_type,
-            open_upper_bound,
-            open_lower_bound,
-            upper_bound,
-            lower_bound,
-            zero_point,
-            cdf_size,
-        )
-
-        return cdf, comment
+        return percentile_values, comment
 
-    cdf_and_comment_pairs = await asyncio.gather(
-        *[ask_llm_to_get_cdf(content) for _ in range(num_runs)]
+    percentiles_and_comment_pairs = await asyncio.gather(
+        *[ask_llm_for_percentiles(content) for _ in range(num_runs)]
     )
-    comments = [pair[1] for pair in cdf_and_comment_pairs]
+    comments = [pair[1] for pair in percentiles_and_comment_pairs]
     final_comment_sections = [
         f"## Rationale {i+1}\n{comment}" for i, comment in enumerate(comments)
     ]
-    cdfs: list[list[float]] = [pair[0] for pair in cdf_and_comment_pairs]
-    all_cdfs = np.array(cdfs)
+    # Build every run's CDF in one vectorized pass
+    all_cdfs = generate_continuous_cdfs(
+        [pair[0] for pair in percentiles_and_comment_pairs],
+        open_upper_bound,
+        open_lower_bound,
+        upper_bound,
+        lower_bound,
+        zero_point,
+        cdf_size,
+    )
     median_cdf: list[float] = np.median(all_cdfs, axis=0).tolist()
 
     final_comment = f"Median CDF: `{str(median_cdf)[:100]}...`\n\n" + "\n\n".join(
@@ -0,0 +1,139 @@
+"""
+Near-duplicate article detection with word shingles and MinHash.
+Collapses syndicated copies of the same story (and overlapping results from different
+searches) into one representative per cluster before relevance rating and summarization.
+"""
+
+import hashlib
+import logging
+import re
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """
+    Overlapping word n-grams of a lowercased text (the whole text if it is shorter than size words).
+    """
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _hash_shingle(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class MinHasher:
+    """
+    MinHash signatures whose per-position agreement estimates Jaccard similarity of shingle sets.
+    """
+
+    def __init__(self, num_permutations: int = 64, seed: int = 1):
+        generator = hashlib.blake2b(f"minhash-{seed}".encode("utf-8"), digest_size=64)
+        self._coefficients: List[Tuple[int, int]] = []
+        counter = 0
+        while len(self._coefficients) < num_permutations:
+            generator.update(counter.to_bytes(4, "big"))
+            digest = generator.digest()
+            a = int.from_bytes(digest[:8], "big") % (_MERSENNE_PRIME - 1) + 1
+            b = int.from_bytes(digest[8:16], "big") % _MERSENNE_PRIME
+            self._coefficients.append((a, b))
+            counter += 1
+        self.num_permutations = num_permutations
+
+    def signature(self, shingle_set: Set[str]) -> Tuple[int, ...]:
+        if not shingle_set:
+            return tuple([_MERSENNE_PRIME] * self.num_permutations)
+        hashes = [_hash_shingle(s) for s in shingle_set]
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._coefficients
+        )
+
+    @staticmethod
+    def similarity(signature_a: Sequence[int], signature_b: Sequence[int]) -> float:
+        matches = sum(1 for x, y in zip(signature_a, signature_b) if x == y)
+        return matches / len(signature_a)
+
+
+def _article_text(article: Dict[str, Any]) -> str:
+    return f"{article.get('title', '')} {article.get('summary', '')}"
+
+
+def cluster_near_duplicates(
+    articles: List[Dict[str, Any]],
+    threshold: float = 0.6,
+    num_permutations: int = 64,
+    bands: int = 16,
+) -> List[List[int]]:
+    """
+    Group article indexes whose title + summary are near duplicates.
+
+    Candidate pairs come from locality-sensitive hashing over signature bands and are kept
+    only if their estimated Jaccard similarity is at least threshold.
+    """
+    hasher = MinHasher(num_permutations)
+    signatures = [hasher.signature(shingles(_article_text(article))) for article in articles]
+    rows_per_band = max(1, num_permutations // bands)
+
+    parent = list(range(len(articles)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    for band in range(0, num_permutations, rows_per_band):
+        buckets: Dict[Tuple[int, ...], List[int]] = {}
+        for index, signature in enumerate(signatures):
+            buckets.setdefault(signature[band:band + rows_per_band], []).append(index)
+        for members in buckets.values():
+            for position, i in enumerate(members):
+                for j in members[position + 1:]:
+                    if (i, j) in checked:
+                        continue
+                    checked.add((i, j))
+                    if MinHasher.similarity(signatures[i], signatures[j]) >= threshold:
+                        parent[find(j)] = find(i)
+
+    clusters: Dict[int, List[int]] = {}
+    for index in range(len(articles)):
+        clusters.setdefault(find(index), []).append(index)
+    return list(clusters.values())
+
+
+def collapse_near_duplicates(articles: List[Dict[str, Any]], threshold: float = 0.6) -> List[Dict[str, Any]]:
+    """
+    Keep one representative per near-duplicate cluster, in original order.
+
+    The representative is the member with the longest summary (preferring ones with a URL).
+    It gains 'duplicate_count' (cluster size) and 'sources' (distinct sources in the cluster).
+    """
+    if len(articles) < 2:
+        return list(articles)
+    clusters = cluster_near_duplicates(articles, threshold)
+    representatives = []
+    for members in clusters:
+        best = max(
+            members,
+            key=lambda i: (bool(articles[i].get('url')), len(articles[i].get('summary', '') or ''), -i),
+        )
+        representative = dict(articles[best])
+        if len(members) > 1:
+            representative['duplicate_count'] = len(members)
+            representative['sources'] = sorted({
+                articles[i].get('source') for i in members if articles[i].get('source')
+            })
+        representatives.append((min(members), representative))
+    representatives.sort(key=lambda item: item[0])
+    collapsed = [article for _, article in representatives]
+    if len(collapsed) < len(articles):
+        logger.info(f"Collapsed {len(articles)} articles into {len(collapsed)} after near-duplicate detection")
+    return collapsed
@@ -0,0 +1,280 @@
+"""
+Bot notifications over email and ntfy behind one facade.
+Email is sent by a background worker thread that keeps one authenticated SMTP connection
+for the whole run and batches notices queued close together into one message, so sending
+a notice never blocks forecasting.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import smtplib
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EmailNotifier:
+    """
+    Background email channel.
+
+    notify() queues a notice and returns immediately. The worker waits batch_window seconds
+    after the first queued notice, then sends everything queued so far as one message over
+    a reused SMTP connection (reconnecting once if the server dropped it). Every SMTP
+    operation is bounded by timeout so an unreachable server fails fast.
+    """
+
+    def __init__(
+        self,
+        sender_email: str,
+        sender_password: Optional[str] = None,
+        recipient_email: Optional[str] = None,
+        smtp_server: str = "smtp.gmail.com",
+        smtp_port: int = 587,
+        use_starttls: bool = True,
+        timeout: float = 10,
+        batch_window: float = 0.0,
+    ):
+        """
+        Initialize the email channel.
+
+        Args:
+            sender_email: From address (and login user)
+            sender_password: SMTP password; no login is attempted without one (e.g. a local test server)
+            recipient_email: To address (default: sender_email)
+            smtp_server: SMTP host
+            smtp_port: SMTP port
+            use_starttls: Upgrade the connection with STARTTLS before logging in
+            timeout: Seconds allowed for connecting and for each SMTP command
+            batch_window: Seconds to collect further notices into the same message
+        """
+        self.sender_email = sender_email
+        self.sender_password = sender_password
+        self.recipient_email = recipient_email or sender_email
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.use_starttls = use_starttls
+        self.timeout = timeout
+        self.batch_window = batch_window
+
+        self._queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._closed = False
+        self.stats = {"queued": 0, "sent_messages": 0, "failed_messages": 0, "connections": 0}
+        atexit.register(self.close)
+
+    @classmethod
+    def from_env(cls) -> Optional["EmailNotifier"]:
+        """
+        Build the channel from NOTIFICATION_* environment variables, or None if not configured.
+        """
+        sender_email = os.getenv('NOTIFICATION_SENDER_EMAIL')
+        sender_password = os.getenv('NOTIFICATION_SENDER_PASSWORD')
+        if not sender_email or not sender_password:
+            logger.warning("Email notification configuration incomplete. Set NOTIFICATION_SENDER_EMAIL and NOTIFICATION_SENDER_PASSWORD to enable notifications.")
+            return None
+        return cls(
+            sender_email=sender_email,
+            sender_password=sender_password,
+            recipient_email=os.getenv('NOTIFICATION_RECIPIENT_EMAIL', sender_email),
+            smtp_server=os.getenv('NOTIFICATION_SMTP_SERVER', 'smtp.gmail.com'),
+            smtp_port=int(os.getenv('NOTIFICATION_SMTP_PORT', '587')),
+            use_starttls=os.getenv('NOTIFICATION_SMTP_STARTTLS', 'true').lower() == 'true',
+            timeout=float(os.getenv('NOTIFICATION_SMTP_TIMEOUT', '10')),
+            batch_window=float(os.getenv('NOTIFICATION_EMAIL_BATCH_WINDOW', '0')),
+        )
+
+    def notify(self, subject: str, body: str, status: str = "info", priority: int = 3, summary: Optional[str] = None) -> bool:
+        """
+        Queue a notice for sending. Returns False only if the channel is closed.
+        """
+        if self._closed:
+            logger.warning(f"Email channel closed, dropping notice: {subject}")
+            return False
+        self.stats["queued"] += 1
+        self._queue.put((subject, body))
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name="email-notifier", daemon=True)
+                self._worker.start()
+        return True
+
+    def _run_worker(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                self._queue.task_done()
+                self._disconnect()
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.batch_window
+            stop = False
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic())) if self.batch_window else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            try:
+                self._send_batch(batch)
+            except Exception as e:
+                self.stats["failed_messages"] += 1
+                logger.error(f"Failed to send notification email: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                self._queue.task_done()
+                self._disconnect()
+                return
+
+    def _build_message(self, batch: List[Tuple[str, str]]) -> MIMEMultipart:
+        if len(batch) == 1:
+            subject, body = batch[0]
+        else:
+            subject = f"{len(batch)} bot notifications: " + "; ".join(s for s, _ in batch)
+            body = "\n\n".join(f"=== {s} ===\n{b.strip()}" for s, b in batch)
+        msg = MIMEMultipart()
+        msg['From'] = self.sender_email
+        msg['To'] = self.recipient_email
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain'))
+        return msg
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        if self.use_starttls:
+            server.starttls()  # Enable security
+        if self.sender_password:
+            server.login(self.sender_email, self.sender_password)
+        self.stats["connections"] += 1
+        return server
+
+    def _get_connection(self) -> smtplib.SMTP:
+        """
+        The open SMTP session if it still answers NOOP, otherwise a new one.
+        """
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._disconnect()
+        self._smtp = self._connect()
+        return self._smtp
+
+    def _disconnect(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._smtp = None
+
+    def _send_batch(self, batch: List[Tuple[str, str]]) -> None:
+        text = self._build_message(batch).as_string()
+        try:
+            self._get_connection().sendmail(self.sender_email, self.recipient_email, text)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # The reused session went away between NOOP and send; retry once on a fresh one
+            self._disconnect()
+            self._get_connection().sendmail(self.sender_email, self.recipient_email, text)
+        self.stats["sent_messages"] += 1
+        logger.info(f"Notification email with {len(batch)} notice(s) sent to {self.recipient_email}")
+
+    def flush(self, timeout: float = 30) -> bool:
+        """
+        Wait up to timeout seconds for every queued notice to be sent (or fail).
+        """
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Email flush timed out with {self._queue.unfinished_tasks} notices unsent")
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 30) -> None:
+        """
+        Send what is queued, then close the SMTP connection and stop the worker.
+        """
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout=self.timeout)
+        else:
+            self._disconnect()
+
+
+class Notifier:
+    """
+    One interface for every notification channel configured for the run.
+
+    Each channel implements notify(subject, body, status, priority, summary), flush(timeout)
+    and close(); long-form channels (email) use subject and body, short ones (ntfy) use
+    status, priority and summary.
+    """
+
+    def __init__(self, channels: List[Any]):
+        self.channels = [channel for channel in channels if channel is not None]
+
+    def notify(self, subject: str, body: str, status: str = "info", priority: int = 3, summary: Optional[str] = None) -> bool:
+        """
+        Send a notice to every channel. Returns True if at least one accepted it.
+        """
+        accepted = False
+        for channel in self.channels:
+            try:
+                accepted = channel.notify(subject, body, status=status, priority=priority, summary=summary) or accepted
+            except Exception as e:
+                logger.warning(f"Failed to send notification via {type(channel).__name__}: {e}")
+        return accepted
+
+    def flush(self, timeout: float = 30) -> bool:
+        """
+        Deliver everything pending on every channel, sharing one overall timeout.
+        """
+        deadline = time.monotonic() + timeout
+        flushed = True
+        for channel in self.channels:
+            flushed = channel.flush(max(0.0, deadline - time.monotonic())) and flushed
+        return flushed
+
+    def close(self) -> None:
+        for channel in self.channels:
+            channel.close()
+
+
+# Global instance for the run
+_notifier_instance: Optional[Notifier] = None
+
+
+def get_notifier() -> Notifier:
+    """
+    Get the global notifier: email (if NOTIFICATION_SENDER_EMAIL/PASSWORD are set) and ntfy.
+    """
+    global _notifier_instance
+    if _notifier_instance is None:
+        from ntfy_alerts import get_ntfy_instance
+
+        _notifier_instance = Notifier([EmailNotifier.from_env(), get_ntfy_instance()])
+        logger.info(f"Notification channels: {[type(c).__name__ for c in _notifier_instance.channels]}")
+    return _notifier_instance
+
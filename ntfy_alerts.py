@@ -2,26 +2,44 @@
 """
 ntfy alert system for Metaculus bot notifications.
 Sends alerts when new questions drop or when bot activity occurs.
+
+Alerts are delivered by a background worker over a pooled HTTP session so sending never
+blocks forecasting; bursts of new-question alerts are coalesced into one digest per tournament.
 """
 import requests
+import atexit
 import json
 import os
 import logging
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
 logger = logging.getLogger(__name__)
 
 class NtfyAlerts:
     """
     Simple ntfy alert system for bot notifications.
+
+    In background mode (the default) send_* methods only queue the alert and return True;
+    a worker thread delivers queued alerts over one pooled session, retrying failures with
+    exponential backoff. New-question alerts are held for digest_window seconds and sent as
+    one digest per tournament if more arrive. Call flush() (also run at exit) to deliver
+    everything still pending.
     """
 
     def __init__(self,
                  topic: str = None,
                  server_url: str = "https://ntfy.sh",
                  username: Optional[str] = None,
-                 password: Optional[str] = None):
+                 password: Optional[str] = None,
+                 background: Optional[bool] = None,
+                 digest_window: Optional[float] = None,
+                 max_retries: int = 3,
+                 retry_backoff: float = 1.0,
+                 timeout: float = 10):
         """
         Initialize ntfy alert system.
 
@@ -30,6 +48,13 @@ class NtfyAlerts:
             server_url: ntfy server URL (default: public ntfy.sh)
             username: Optional username for authentication
             password: Optional password for authentication
+            background: Deliver from a background worker instead of blocking the caller
+                (falls back to NTFY_BACKGROUND env var, default on)
+            digest_window: Seconds to collect new-question alerts into one digest
+                (falls back to NTFY_DIGEST_WINDOW env var, default 5; 0 disables digests)
+            max_retries: Delivery retries after a failed attempt
+            retry_backoff: Delay before the first retry, doubled on each further retry
+            timeout: HTTP timeout in seconds per attempt
         """
         self.topic = topic or os.getenv('NTFY_TOPIC', 'metaculus-bot-alerts')
         self.server_url = server_url.rstrip('/')
@@ -40,6 +65,29 @@ class NtfyAlerts:
         if not self.topic:
             raise ValueError("ntfy topic must be specified either as parameter or NTFY_TOPIC environment variable")
 
+        if background is None:
+            background = os.getenv('NTFY_BACKGROUND', 'true').lower() == 'true'
+        if digest_window is None:
+            digest_window = float(os.getenv('NTFY_DIGEST_WINDOW', '5'))
+        self.background = background
+        self.digest_window = digest_window
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+
+        self._session = requests.Session()
+        self._session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self._session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self._queue: "queue.Queue[Optional[Tuple[str, bytes, Dict[str, str]]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        # Pending new-question alerts per tournament: (first queued at, [(title, url, type)])
+        self._digests: Dict[Optional[str], Tuple[float, List[Tuple[str, str, str]]]] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self.stats = {"queued": 0, "sent": 0, "failed": 0, "retries": 0, "coalesced": 0}
+        if self.background:
+            atexit.register(self.close)
+
     def send_alert(self,
                    message: str,
                    title: Optional[str] = None,
@@ -59,47 +107,181 @@ class NtfyAlerts:
             attach_url: Optional URL for image/file attachment
 
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if successful (in background mode: queued), False otherwise
         """
-        try:
-            # Prepare headers
-            headers = {
-                'Content-Type': 'application/json',
-                'X-Priority': str(priority)
-            }
-
-            # Add optional headers
-            if title:
-                headers['X-Title'] = title
-            if tags:
-                headers['X-Tags'] = ','.join(str(tag) for tag in tags)
-            if click_url:
-                headers['X-Click'] = click_url
-            if attach_url:
-                headers['X-Attach'] = attach_url
-
-            # Add authentication if provided
-            if self.username and self.password:
-                import base64
-                auth_string = f"{self.username}:{self.password}"
-                auth_bytes = auth_string.encode('utf-8')
-                auth_header = base64.b64encode(auth_bytes).decode('utf-8')
-                headers['Authorization'] = f'Basic {auth_header}'
-
-            # Send the request
-            url = f"{self.server_url}/{self.topic}"
-            response = requests.post(url, data=message.encode('utf-8'), headers=headers, timeout=10)
+        request = self._build_request(message, title, priority, tags, click_url, attach_url)
+        if self.background and not self._closed:
+            self._enqueue(request)
+            return True
+        return self._deliver(request)
+
+    def _build_request(self,
+                       message: str,
+                       title: Optional[str],
+                       priority: int,
+                       tags: Optional[list],
+                       click_url: Optional[str],
+                       attach_url: Optional[str]) -> Tuple[str, bytes, Dict[str, str]]:
+        # Prepare headers
+        headers = {
+            'Content-Type': 'application/json',
+            'X-Priority': str(priority)
+        }
+
+        # Add optional headers
+        if title:
+            headers['X-Title'] = title
+        if tags:
+            headers['X-Tags'] = ','.join(str(tag) for tag in tags)
+        if click_url:
+            headers['X-Click'] = click_url
+        if attach_url:
+            headers['X-Attach'] = attach_url
+
+        # Add authentication if provided
+        if self.username and self.password:
+            import base64
+            auth_string = f"{self.username}:{self.password}"
+            auth_bytes = auth_string.encode('utf-8')
+            auth_header = base64.b64encode(auth_bytes).decode('utf-8')
+            headers['Authorization'] = f'Basic {auth_header}'
+
+        url = f"{self.server_url}/{self.topic}"
+        return url, message.encode('utf-8'), headers
+
+    def _deliver(self, request: Tuple[str, bytes, Dict[str, str]]) -> bool:
+        """
+        POST one alert over the pooled session, retrying errors, 429s and 5xx with exponential backoff.
+        """
+        url, data, headers = request
+        title = headers.get('X-Title', 'No title')
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            try:
+                response = self._session.post(url, data=data, headers=headers, timeout=self.timeout)
+            except Exception as e:
+                logger.warning(f"Exception sending ntfy alert '{title}' (attempt {attempt + 1}): {e}")
+                continue
 
             if response.status_code == 200:
-                logger.info(f"Successfully sent ntfy alert: {title or 'No title'}")
+                logger.info(f"Successfully sent ntfy alert: {title}")
+                self.stats["sent"] += 1
                 return True
-            else:
+            if response.status_code != 429 and response.status_code < 500:
                 logger.error(f"Failed to send ntfy alert: HTTP {response.status_code} - {response.text}")
-                return False
+                break
+            logger.warning(f"ntfy alert '{title}' got HTTP {response.status_code} (attempt {attempt + 1})")
+
+        self.stats["failed"] += 1
+        logger.error(f"Giving up on ntfy alert: {title}")
+        return False
+
+    def _enqueue(self, request: Tuple[str, bytes, Dict[str, str]]) -> None:
+        self.stats["queued"] += 1
+        self._queue.put(request)
+        self._ensure_worker()
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name="ntfy-alerts", daemon=True)
+                self._worker.start()
+
+    def _run_worker(self) -> None:
+        while True:
+            try:
+                request = self._queue.get(timeout=self._time_until_next_digest())
+            except queue.Empty:
+                self._queue_due_digests()
+                continue
+            try:
+                if request is None:
+                    return
+                self._deliver(request)
+            except Exception as e:
+                logger.error(f"ntfy worker failed to deliver alert: {e}")
+            finally:
+                self._queue.task_done()
+            self._queue_due_digests()
+
+    def _time_until_next_digest(self) -> Optional[float]:
+        with self._lock:
+            if not self._digests:
+                return 1.0
+            oldest = min(started for started, _ in self._digests.values())
+        return max(0.01, oldest + self.digest_window - time.monotonic())
+
+    def _queue_due_digests(self, force: bool = False) -> None:
+        """
+        Turn new-question batches whose window has passed (or all of them if force) into alerts.
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                tournament for tournament, (started, _) in self._digests.items()
+                if force or now - started >= self.digest_window
+            ]
+            batches = [(tournament, self._digests.pop(tournament)[1]) for tournament in due]
+        for tournament, questions in batches:
+            if len(questions) == 1:
+                question_title, question_url, question_type = questions[0]
+                request = self._build_new_question_request(question_title, question_url, question_type, tournament)
+            else:
+                self.stats["coalesced"] += len(questions) - 1
+                request = self._build_digest_request(questions, tournament)
+            self.stats["queued"] += 1
+            self._queue.put(request)
+
+    def flush(self, timeout: float = 30) -> bool:
+        """
+        Deliver every pending alert and digest, waiting up to timeout seconds.
 
-        except Exception as e:
-            logger.error(f"Exception sending ntfy alert: {e}")
-            return False
+        Returns:
+            bool: True if everything pending was delivered (or given up on) in time
+        """
+        if not self.background:
+            return True
+        self._queue_due_digests(force=True)
+        if self._queue.unfinished_tasks == 0:
+            return True
+        self._ensure_worker()
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"ntfy flush timed out with {self._queue.unfinished_tasks} alerts undelivered")
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        logger.info(f"ntfy alerts flushed: {self.stats}")
+        return True
+
+    def close(self, timeout: float = 30) -> None:
+        """
+        Flush pending alerts and stop the worker; later alerts are sent synchronously.
+        """
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout=1)
+        self._session.close()
+
+    def notify(self,
+               subject: str,
+               body: str,
+               status: str = "info",
+               priority: int = 3,
+               summary: Optional[str] = None) -> bool:
+        """
+        Notification channel interface shared with notifications.EmailNotifier:
+        sent as a bot status alert with the short summary (or the subject).
+        """
+        return self.send_bot_status_alert(status, summary or subject, priority)
 
     def send_new_question_alert(self,
                               question_title: str,
@@ -116,8 +298,22 @@ class NtfyAlerts:
             tournament: Optional tournament name
 
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if successful (in background mode: queued for the digest), False otherwise
         """
+        if self.background and self.digest_window > 0 and not self._closed:
+            with self._lock:
+                started, questions = self._digests.get(tournament, (time.monotonic(), []))
+                questions.append((question_title, question_url, question_type))
+                self._digests[tournament] = (started, questions)
+            self._ensure_worker()
+            return True
+        return self._deliver(self._build_new_question_request(question_title, question_url, question_type, tournament))
+
+    def _build_new_question_request(self,
+                                    question_title: str,
+                                    question_url: str,
+                                    question_type: str,
+                                    tournament: Optional[str]) -> Tuple[str, bytes, Dict[str, str]]:
         # Create alert message
         message = f"New {question_type} question: {question_title}"
 
@@ -139,12 +335,31 @@ class NtfyAlerts:
         if tournament:
             tags.append("tournament")
 
-        return self.send_alert(
+        return self._build_request(
             message=message,
             title=title,
             priority=4,  # High priority for new questions
             tags=tags,
-            click_url=question_url
+            click_url=question_url,
+            attach_url=None
+        )
+
+    def _build_digest_request(self,
+                              questions: List[Tuple[str, str, str]],
+                              tournament: Optional[str]) -> Tuple[str, bytes, Dict[str, str]]:
+        """
+        One alert listing several new questions from the same tournament.
+        """
+        lines = [f"- [{question_type}] {question_title}\n  {question_url}" for question_title, question_url, question_type in questions]
+        title = f"{len(questions)} New {tournament} Questions" if tournament else f"{len(questions)} New Metaculus Questions"
+        tags = ["new", "metaculus"] + (["tournament"] if tournament else [])
+        return self._build_request(
+            message="\n".join(lines),
+            title=title,
+            priority=4,  # High priority for new questions
+            tags=tags,
+            click_url=questions[0][1],
+            attach_url=None
         )
 
     def send_bot_status_alert(self,
@@ -261,6 +476,14 @@ def send_forecast_alert(question_title: str, prediction: float,
         question_title, prediction, confidence, question_url
     )
 
+def flush_ntfy_alerts(timeout: float = 30) -> bool:
+    """
+    Convenience function to deliver all pending alerts before the process exits.
+    """
+    if _ntfy_instance is None:
+        return True
+    return _ntfy_instance.flush(timeout)
+
 def test_ntfy_connection() -> bool:
     """
     Test the ntfy connection.
@@ -308,6 +531,7 @@ if __name__ == "__main__":
             question_url="https://www.metaculus.com/questions/1234"
         )
 
+        ntfy.flush()
         print("✅ All test alerts sent successfully!")
         print(f"📱 Check your device or visit: https://ntfy.sh/{topic}")
 
@@ -1,7 +1,8 @@
 import asyncio
 import logging
+import re
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any
 
 from forecasting_tools import (
     BinaryQuestion,
@@ -17,8 +18,67 @@ from forecasting_tools import (
 )
 from forecasting_tools.helpers.metaculus_api import MetaculusQuestion
 
+from context_packing import get_context_budget, pack_text
+from stage_profiler import profile_call, profile_span
+
 logger = logging.getLogger(__name__)
 
+_ASTERISK_PROBABILITY = re.compile(r'\*\s*(0?\.[0-9]+|[01](?:\.0*)?)\s*\*')
+_ASTERISK_NUMBER = re.compile(r'\*\s*(-?[0-9][0-9,]*(?:\.[0-9]+)?|-?\.[0-9]+)\s*\*')
+
+
+def _step_headings(text: str, step: int) -> List[int]:
+    """
+    Positions of the numbered headings of one scratchpad step ("7." or "Step 7:" at a line start).
+    """
+    pattern = re.compile(rf'(?:^|\n)[\s#*]*(?:step\s*)?{step}\s*[.):]', re.IGNORECASE)
+    return [match.start() for match in pattern.finditer(text)]
+
+
+def _final_answer_start(text: str, final_step: int) -> int:
+    """
+    Position where the final answer step of a scratchpad response begins, or -1 if not reached.
+
+    Only numbered headings count, in order: the last heading of the initial estimate step
+    (final_step - 2), then the evaluation step after it, then the final step's last heading.
+    Phrases like "before the final prediction" or options re-listed as 1-7 in earlier steps
+    therefore don't end the stream at the initial estimate.
+    """
+    estimate = _step_headings(text, final_step - 2)
+    after = estimate[-1] if estimate else -1
+    evaluation = [start for start in _step_headings(text, final_step - 1) if start > after]
+    if not evaluation:
+        return -1
+    starts = [start for start in _step_headings(text, final_step) if start > evaluation[0]]
+    return starts[-1] if starts else -1
+
+
+def final_probability_seen(text: str) -> bool:
+    """
+    Stop predicate for binary scratchpads: an asterisk-delimited probability after the final step.
+    """
+    start = _final_answer_start(text, 7)
+    return start >= 0 and _ASTERISK_PROBABILITY.search(text, start) is not None
+
+
+def option_probabilities_seen(num_options: int) -> Callable[[str], bool]:
+    """
+    Stop predicate for multiple choice scratchpads: a probability for every option after the final step.
+    """
+    def predicate(text: str) -> bool:
+        start = _final_answer_start(text, 7)
+        return start >= 0 and len(_ASTERISK_PROBABILITY.findall(text, start)) >= num_options
+    predicate.__name__ = f"option_probabilities_seen_{num_options}"
+    return predicate
+
+
+def all_percentiles_seen(text: str) -> bool:
+    """
+    Stop predicate for numeric scratchpads: all six asterisk-delimited percentiles after the final step.
+    """
+    start = _final_answer_start(text, 9)
+    return start >= 0 and len(_ASTERISK_NUMBER.findall(text, start)) >= 6
+
 
 class OptimizedReasoningSystem:
     """
@@ -28,6 +88,24 @@ class OptimizedReasoningSystem:
     
     def __init__(self, llm: GeneralLlm):
         self.llm = llm
+
+    def _pack_research(self, research: str) -> str:
+        """
+        Trim research to the forecasting model's context budget.
+        """
+        packed = pack_text(research, get_context_budget(getattr(self.llm, 'model', None)))
+        if packed.truncated:
+            logger.info(f"Packed research for {getattr(self.llm, 'model', 'forecaster')}: {packed.describe()}")
+        return packed.text
+
+    async def _invoke(self, prompt: str, stop_when: Callable[[str], bool]) -> str:
+        """
+        Stream the completion and stop once stop_when sees the final answer, when the LLM supports it.
+        """
+        async with profile_span("reasoning", model=getattr(self.llm, 'model', None)):
+            if hasattr(self.llm, 'invoke_streaming'):
+                return await self.llm.invoke_streaming(prompt, stop_when)
+            return await self.llm.invoke(prompt)
     
     async def get_optimized_binary_reasoning_prompt(
         self, 
@@ -56,7 +134,7 @@ class OptimizedReasoningSystem:
             Question close date: {getattr(question, 'scheduled_close_time', None) and question.scheduled_close_time.strftime("%Y-%m-%d") or "N/A"}
 
             Your research assistant says:
-            {research}
+            {self._pack_research(research)}
 
             Instructions:
             1. Rephrase and expand the question to help you do better answering. Maintain all information in the original question.
@@ -108,7 +186,7 @@ class OptimizedReasoningSystem:
             Question close date: {getattr(question, 'scheduled_close_time', None) and question.scheduled_close_time.strftime("%Y-%m-%d") or "N/A"}
 
             Your research assistant says:
-            {research}
+            {self._pack_research(research)}
 
             Instructions:
             1. Rephrase and expand the question to help you do better answering. Maintain all information in the original question.
@@ -159,7 +237,7 @@ class OptimizedReasoningSystem:
             Question close date: {getattr(question, 'scheduled_close_time', None) and question.scheduled_close_time.strftime("%Y-%m-%d") or "N/A"}
 
             Your research assistant says:
-            {research}
+            {self._pack_research(research)}
 
             Instructions:
             1. Rephrase and expand the question to help you do better answering. Maintain all information in the original question.
@@ -199,8 +277,8 @@ class OptimizedReasoningSystem:
         """
         Run an optimized binary forecast using the best prompting strategy.
         """
-        prompt = await self.get_optimized_binary_reasoning_prompt(question, research)
-        reasoning = await self.llm.invoke(prompt)
+        prompt = await profile_call("prompt_building", self.get_optimized_binary_reasoning_prompt(question, research))
+        reasoning = await self._invoke(prompt, final_probability_seen)
         
         # Extract the final prediction from the reasoning
         try:
@@ -237,8 +315,8 @@ class OptimizedReasoningSystem:
         """
         Run an optimized multiple choice forecast using the best prompting strategy.
         """
-        prompt = await self.get_optimized_multiple_choice_reasoning_prompt(question, research)
-        reasoning = await self.llm.invoke(prompt)
+        prompt = await profile_call("prompt_building", self.get_optimized_multiple_choice_reasoning_prompt(question, research))
+        reasoning = await self._invoke(prompt, option_probabilities_seen(len(question.options)))
         
         # Extract the final predictions from the reasoning
         try:
@@ -276,8 +354,8 @@ class OptimizedReasoningSystem:
         """
         Run an optimized numeric forecast using the best prompting strategy.
         """
-        prompt = await self.get_optimized_numeric_reasoning_prompt(question, research)
-        reasoning = await self.llm.invoke(prompt)
+        prompt = await profile_call("prompt_building", self.get_optimized_numeric_reasoning_prompt(question, research))
+        reasoning = await self._invoke(prompt, all_percentiles_seen)
         
         # Extract the final percentiles from the reasoning
         try:
@@ -0,0 +1,228 @@
+"""
+Deterministic local parsing of forecaster and synthesizer output.
+Reads probabilities, option distributions and percentile lists from the formats our prompts
+ask for ("Probability: ZZ%", "Option: Probability", "Percentile 10: XX") with a confidence
+score, so the LLM parser (structure_output) only runs when the text is ambiguous.
+"""
+
+import logging
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from forecasting_tools import BinaryPrediction, Percentile, PredictedOption, PredictedOptionList
+
+logger = logging.getLogger(__name__)
+
+# Confidence at or above which a local parse is used without asking the LLM parser
+DEFAULT_MIN_CONFIDENCE = 0.8
+
+STANDARD_PERCENTILES = (10, 20, 40, 60, 80, 90)
+
+_NUMBER = r'[-−–]?\s*[$€£]?\s*(?:[0-9]{1,3}(?:,[0-9]{3})+|[0-9]+)(?:\.[0-9]+)?|[-−–]?\.[0-9]+'
+# Scale suffixes. Single letters are limited to k/K, M and B: a lowercase m, b or t is far more
+# often a unit (metres, minutes, bytes, tonnes) than millions, billions or trillions
+_SUFFIX = r'\s*(?:(?i:thousand|million|billion|trillion|bn)|(?-i:[kKMB]))\b'
+_NUMBER_WITH_SUFFIX = re.compile(rf'(?P<number>{_NUMBER})(?P<suffix>{_SUFFIX})?')
+
+_MULTIPLIERS = {
+    'k': 1e3, 'thousand': 1e3,
+    'm': 1e6, 'million': 1e6,
+    'b': 1e9, 'bn': 1e9, 'billion': 1e9,
+    'trillion': 1e12,
+}
+
+_LABELLED_PROBABILITY = re.compile(
+    r'probability\W{0,3}\s*[:=]?\s*\**\s*(?P<value>[0-9]+(?:\.[0-9]+)?)\s*(?P<percent>%)?',
+    re.IGNORECASE,
+)
+_PERCENTAGE = re.compile(r'(?<![\w.])(?P<value>[0-9]+(?:\.[0-9]+)?)\s*%')
+_PERCENTILE_LINE = re.compile(
+    rf'(?:percentile\s*(?P<level>[0-9]{{1,2}})(?:th)?|(?P<ordinal>[0-9]{{1,2}})(?:st|nd|rd|th)\s*percentile)'
+    rf'\s*%?\**\s*(?:[:=]|-\s)\s*\**\s*(?P<value>(?:{_NUMBER})(?:{_SUFFIX})?)',
+    re.IGNORECASE,
+)
+_OPTION_LINE = re.compile(
+    r'^[\s\-*#>•]*(?P<name>.+)[\s*"\']*[:=\-–]\s*\**\s*(?P<value>[0-9]+(?:\.[0-9]+)?)\s*(?P<percent>%)?\**\s*$'
+)
+
+
+def parse_number(text: str) -> Optional[float]:
+    """
+    Parse a number as forecasters write it: "1,250", "$3.5M", "-2.1 billion", "40k".
+    Units that look like suffixes ("10 m", "5 t") are left unscaled.
+
+    Returns None if text does not start with a number.
+    """
+    match = _NUMBER_WITH_SUFFIX.match(text.strip())
+    if not match:
+        return None
+    number = re.sub(r'[\s$€£,]', '', match.group('number')).replace('−', '-').replace('–', '-')
+    try:
+        value = float(number)
+    except ValueError:
+        return None
+    suffix = (match.group('suffix') or '').strip().lower()
+    return value * _MULTIPLIERS.get(suffix, 1)
+
+
+class ParsedPrediction:
+    """
+    Result of a local parse: the structured value (or None) and how sure we are of it.
+    """
+
+    def __init__(self, value: Any, confidence: float, reason: str):
+        self.value = value
+        self.confidence = confidence
+        self.reason = reason
+
+    def is_confident(self, min_confidence: Optional[float] = None) -> bool:
+        if min_confidence is None:
+            min_confidence = get_min_parse_confidence()
+        return self.value is not None and self.confidence >= min_confidence
+
+    def describe(self) -> str:
+        return f"confidence {self.confidence:.2f}: {self.reason}"
+
+
+def get_min_parse_confidence() -> float:
+    """
+    Confidence needed to skip the LLM parser, configured by PARSER_MIN_CONFIDENCE.
+    """
+    return float(os.getenv('PARSER_MIN_CONFIDENCE', str(DEFAULT_MIN_CONFIDENCE)))
+
+
+def _to_decimal(value: float, is_percent: bool) -> Optional[float]:
+    if is_percent or value > 1:
+        value = value / 100
+    return value if 0 <= value <= 1 else None
+
+
+def parse_binary_prediction(text: str) -> ParsedPrediction:
+    """
+    Read a binary probability, preferring the last "Probability: ZZ%" in the text.
+    """
+    labelled = [
+        _to_decimal(float(m.group('value')), bool(m.group('percent')))
+        for m in _LABELLED_PROBABILITY.finditer(text or "")
+    ]
+    labelled = [value for value in labelled if value is not None]
+    if labelled:
+        value = labelled[-1]
+        # The prompts ask for the answer last, so an earlier, different labelled value is a draft
+        confidence = 1.0 if len(set(labelled)) == 1 else 0.9
+        return ParsedPrediction(BinaryPrediction(prediction_in_decimal=value), confidence, f"labelled probability {value}")
+
+    percentages = [_to_decimal(float(m.group('value')), True) for m in _PERCENTAGE.finditer(text or "")]
+    percentages = [value for value in percentages if value is not None]
+    if not percentages:
+        return ParsedPrediction(None, 0.0, "no probability found")
+    value = percentages[-1]
+    if len(set(percentages)) == 1:
+        return ParsedPrediction(BinaryPrediction(prediction_in_decimal=value), 0.85, f"only percentage {value}")
+    return ParsedPrediction(BinaryPrediction(prediction_in_decimal=value), 0.4, f"last of {len(percentages)} unlabelled percentages")
+
+
+def _normalize_option_name(name: str) -> str:
+    name = re.sub(r'^\W*option\b[\s_:]*', '', name.strip(), flags=re.IGNORECASE)
+    return re.sub(r'[^\w]+', ' ', name).strip().lower()
+
+
+def parse_option_list(text: str, options: List[str]) -> ParsedPrediction:
+    """
+    Read "Option: Probability" lines for every option, using the last line seen for each.
+
+    Probabilities may be decimals or percentages; they are normalized to sum to 1, with a
+    lower confidence when the raw sum was far from it.
+    """
+    if not options:
+        return ParsedPrediction(None, 0.0, "question has no options")
+    lookup: Dict[str, str] = {}
+    for option in options:
+        lookup.setdefault(_normalize_option_name(option), option)
+        lookup.setdefault(option.strip().lower(), option)
+
+    found: Dict[str, float] = {}
+    any_percent = False
+    for line in (text or "").splitlines():
+        match = _OPTION_LINE.match(line)
+        if not match:
+            continue
+        name = match.group('name')
+        option = lookup.get(_normalize_option_name(name)) or lookup.get(name.strip().strip('*"\'').lower())
+        if option is None:
+            continue
+        found[option] = float(match.group('value'))
+        any_percent = any_percent or bool(match.group('percent'))
+
+    missing = [option for option in options if option not in found]
+    if missing:
+        return ParsedPrediction(None, 0.3 if found else 0.0, f"no probability for {len(missing)} of {len(options)} options")
+
+    raw = [found[option] for option in options]
+    if any_percent or sum(raw) > 1.5:
+        raw = [value / 100 for value in raw]
+    total = sum(raw)
+    if total <= 0:
+        return ParsedPrediction(None, 0.0, "option probabilities sum to zero")
+    if abs(total - 1) <= 0.02:
+        confidence = 1.0
+    elif abs(total - 1) <= 0.1:
+        confidence = 0.85
+    else:
+        confidence = 0.5
+    normalized = [value / total for value in raw]
+    value = PredictedOptionList(predicted_options=[
+        PredictedOption(option_name=option, probability=probability)
+        for option, probability in zip(options, normalized)
+    ])
+    return ParsedPrediction(value, confidence, f"{len(options)} options summing to {total:.3f}")
+
+
+def parse_percentile_list(text: str, expected: tuple = STANDARD_PERCENTILES) -> ParsedPrediction:
+    """
+    Read "Percentile NN: value" lines, using the last value seen for each percentile.
+
+    Values may carry units, thousands separators and k/M/B suffixes. Values listed in
+    decreasing order are flipped with a lower confidence; any other disorder is ambiguous.
+    """
+    found: Dict[int, float] = {}
+    for match in _PERCENTILE_LINE.finditer(text or ""):
+        value = parse_number(match.group('value'))
+        if value is not None:
+            found[int(match.group('level') or match.group('ordinal'))] = value
+
+    missing = [level for level in expected if level not in found]
+    if missing:
+        return ParsedPrediction(None, 0.3 if found else 0.0, f"missing percentiles {missing}")
+
+    levels = sorted(found)
+    values = [found[level] for level in levels]
+    if all(a <= b for a, b in zip(values, values[1:])):
+        confidence, reason = 1.0, f"{len(levels)} increasing percentiles"
+    elif all(a >= b for a, b in zip(values, values[1:])):
+        values = values[::-1]
+        confidence, reason = 0.6, f"{len(levels)} percentiles in decreasing order"
+    else:
+        return ParsedPrediction(None, 0.2, "percentile values out of order")
+
+    percentiles = [Percentile(percentile=level / 100, value=value) for level, value in zip(levels, values)]
+    return ParsedPrediction(percentiles, confidence, reason)
+
+
+def parse_prediction(text: str, output_type: Any, options: Optional[List[str]] = None) -> ParsedPrediction:
+    """
+    Parse text locally into the type structure_output would have produced.
+
+    Args:
+        text: Forecaster or synthesizer output
+        output_type: BinaryPrediction, PredictedOptionList or list[Percentile]
+        options: Option names, for multiple choice questions
+    """
+    if output_type is BinaryPrediction:
+        return parse_binary_prediction(text)
+    if output_type is PredictedOptionList:
+        return parse_option_list(text, options or [])
+    if output_type == list[Percentile]:
+        return parse_percentile_list(text)
+    return ParsedPrediction(None, 0.0, f"no local parser for {output_type}")
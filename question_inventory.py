@@ -0,0 +1,157 @@
+"""
+Run-scoped inventory of Metaculus questions.
+Fetches every tournament the run needs plus the global open set once, concurrently,
+and serves all per-tournament selections (tournament filters, keyword and metadata
+fallbacks, community detection) from memory.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Union
+
+from forecasting_tools import MetaculusApi, MetaculusQuestion
+from forecasting_tools.helpers.metaculus_api import ApiFilter
+
+logger = logging.getLogger(__name__)
+
+TournamentId = Union[int, str]
+
+
+def get_question_key(question: MetaculusQuestion) -> Union[int, str]:
+    """
+    Stable identity for a question: question id, then post id, then URL.
+    """
+    for attribute in ('id_of_question', 'id_of_post', 'id'):
+        value = getattr(question, attribute, None)
+        if value is not None:
+            return value
+    return question.page_url
+
+
+class QuestionInventory:
+    """
+    In-memory index of the questions available to a run.
+
+    Questions are indexed by id, by the tournament they were fetched for (and any
+    tournament slugs they carry), by project and by community slug. Keyword lookups
+    run over lowercased question text computed once per question.
+    """
+
+    def __init__(self):
+        self.questions_by_id: Dict[Union[int, str], MetaculusQuestion] = {}
+        self.open_questions: List[MetaculusQuestion] = []
+        self._by_tournament: Dict[str, List[MetaculusQuestion]] = {}
+        self._by_project: Dict[str, List[MetaculusQuestion]] = {}
+        self._by_community: Dict[str, List[MetaculusQuestion]] = {}
+        self._lowercase_text: Dict[Union[int, str], str] = {}
+        self._loaded_tournaments: set = set()
+
+    async def load(self, tournaments: Iterable[TournamentId], include_all_open: bool = True) -> "QuestionInventory":
+        """
+        Fetch open questions for every tournament (and optionally all open questions) concurrently.
+        A failed fetch is logged and leaves that tournament empty rather than failing the run.
+        """
+        tournaments = [t for t in dict.fromkeys(tournaments) if t not in self._loaded_tournaments]
+        filters = [ApiFilter(allowed_statuses=["open"], allowed_tournaments=[t]) for t in tournaments]
+        if include_all_open:
+            filters.append(ApiFilter(allowed_statuses=["open"]))
+
+        logger.info(f"Loading question inventory: {len(tournaments)} tournaments{' + all open questions' if include_all_open else ''}")
+        results = await asyncio.gather(
+            *[MetaculusApi.get_questions_matching_filter(api_filter) for api_filter in filters],
+            return_exceptions=True,
+        )
+
+        for tournament, result in zip(tournaments, results):
+            self._loaded_tournaments.add(tournament)
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to fetch open questions for tournament {tournament}: {result}")
+                self._by_tournament.setdefault(str(tournament), [])
+                continue
+            self._by_tournament[str(tournament)] = [self._add(q) for q in result]
+            logger.info(f"Inventory: {len(result)} open questions for tournament {tournament}")
+
+        if include_all_open:
+            result = results[-1]
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to fetch all open questions: {result}")
+            else:
+                self.open_questions = [self._add(q) for q in result]
+                logger.info(f"Inventory: {len(self.open_questions)} open questions overall")
+
+        logger.info(f"Question inventory holds {len(self.questions_by_id)} unique questions")
+        return self
+
+    def _add(self, question: MetaculusQuestion) -> MetaculusQuestion:
+        """
+        Register a question, returning the canonical instance if it was already seen.
+        """
+        key = get_question_key(question)
+        if key in self.questions_by_id:
+            return self.questions_by_id[key]
+        self.questions_by_id[key] = question
+        self._lowercase_text[key] = (getattr(question, 'question_text', '') or '').lower()
+
+        for slug in getattr(question, 'tournament_slugs', None) or []:
+            self._append_unique(self._by_tournament, str(slug), question)
+
+        projects = list(getattr(question, 'projects', None) or [])
+        if getattr(question, 'series', None):
+            projects.append(question.series)
+        for project in projects:
+            for name in (getattr(project, 'slug', None), getattr(project, 'title', None)):
+                if name:
+                    self._append_unique(self._by_project, name.lower(), question)
+        if getattr(question, 'default_project_id', None) is not None:
+            self._append_unique(self._by_project, str(question.default_project_id), question)
+
+        community_slug = None
+        if getattr(question, 'community', None) and getattr(question.community, 'slug', None):
+            community_slug = question.community.slug
+        elif getattr(question, 'community_slug', None):
+            community_slug = question.community_slug
+        if community_slug:
+            self._append_unique(self._by_community, community_slug, question)
+        return question
+
+    @staticmethod
+    def _append_unique(index: Dict[str, List[MetaculusQuestion]], key: str, question: MetaculusQuestion) -> None:
+        bucket = index.setdefault(key, [])
+        if all(existing is not question for existing in bucket):
+            bucket.append(question)
+
+    def get(self, question_id: Union[int, str]) -> Optional[MetaculusQuestion]:
+        return self.questions_by_id.get(question_id)
+
+    def get_tournament_questions(self, tournament: TournamentId) -> List[MetaculusQuestion]:
+        """
+        Open questions fetched for this tournament id or slug.
+        """
+        return list(self._by_tournament.get(str(tournament), []))
+
+    def get_community_questions(self, community_slug: str) -> List[MetaculusQuestion]:
+        return list(self._by_community.get(community_slug, []))
+
+    def find_by_keywords(self, keywords: Iterable[str], questions: Optional[List[MetaculusQuestion]] = None) -> List[MetaculusQuestion]:
+        """
+        Questions (all open questions by default) whose text contains any keyword, case-insensitively.
+        """
+        lowered_keywords = [keyword.lower() for keyword in keywords]
+        candidates = self.open_questions if questions is None else questions
+        return [
+            q for q in candidates
+            if any(keyword in self._lowercase_text.get(get_question_key(q), '') for keyword in lowered_keywords)
+        ]
+
+    def find_by_project_term(self, term: str) -> List[MetaculusQuestion]:
+        """
+        Questions whose project or series slug/title contains term, case-insensitively.
+        """
+        term = term.lower()
+        matches: List[MetaculusQuestion] = []
+        for name, questions in self._by_project.items():
+            if term in name:
+                for q in questions:
+                    if all(existing is not q for existing in matches):
+                        matches.append(q)
+        return matches
@@ -0,0 +1,137 @@
+"""
+Cross-tournament question scheduler.
+Merges the question lists of every tournament in a run into one deduplicated work queue,
+forecasts it with a bounded pool of workers (soonest-closing questions first) inside a single
+event loop, and hands back the reports grouped per tournament.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+from forecasting_tools import ForecastBot, ForecastReport, MetaculusQuestion
+
+from question_inventory import get_question_key
+
+logger = logging.getLogger(__name__)
+
+QuestionKey = Union[int, str]
+ReportOrError = Union[ForecastReport, BaseException]
+
+
+def get_close_timestamp(question: MetaculusQuestion) -> float:
+    """
+    Close time of a question as a POSIX timestamp, or +inf if it has none.
+    """
+    for attribute in ('scheduled_close_time', 'close_time'):
+        close_time = getattr(question, attribute, None)
+        if close_time is not None:
+            try:
+                return close_time.timestamp()
+            except (AttributeError, OverflowError, ValueError):
+                continue
+    return float('inf')
+
+
+class QuestionScheduler:
+    """
+    Forecast the questions of several tournaments through one bounded work queue.
+
+    A question that appears in more than one tournament is forecast once and its report is
+    shared by every tournament that listed it. Questions are dequeued in order of close time,
+    so questions about to close are not stuck behind a slow tournament.
+    """
+
+    def __init__(self, bot: ForecastBot, max_workers: Optional[int] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            bot: Forecast bot used to forecast each question
+            max_workers: Questions forecast concurrently (default from TOURNAMENT_QUESTION_WORKERS, 4)
+        """
+        self.bot = bot
+        self.max_workers = max(1, max_workers or int(os.getenv('TOURNAMENT_QUESTION_WORKERS', '4')))
+
+    @staticmethod
+    def merge(tournament_questions: Dict[str, List[MetaculusQuestion]]) -> Tuple[Dict[QuestionKey, MetaculusQuestion], Dict[str, List[QuestionKey]]]:
+        """
+        Build the deduplicated question set and each tournament's ordered list of question keys.
+        """
+        unique_questions: Dict[QuestionKey, MetaculusQuestion] = {}
+        tournament_keys: Dict[str, List[QuestionKey]] = {}
+        for tournament, questions in tournament_questions.items():
+            keys = tournament_keys.setdefault(tournament, [])
+            for question in questions:
+                key = get_question_key(question)
+                unique_questions.setdefault(key, question)
+                if key not in keys:
+                    keys.append(key)
+        return unique_questions, tournament_keys
+
+    async def run(self, tournament_questions: Dict[str, List[MetaculusQuestion]]) -> Tuple[List[ReportOrError], Dict[str, List[ReportOrError]]]:
+        """
+        Forecast every question once and group the results by tournament.
+
+        Args:
+            tournament_questions: Tournament name -> questions selected for it
+
+        Returns:
+            (reports, reports_by_tournament): one entry per unique forecast question in
+            completion order, and each tournament's entries in its own question order.
+            Failed questions are returned as exceptions; questions the bot skipped
+            (e.g. already forecasted) have no entry.
+        """
+        unique_questions, tournament_keys = self.merge(tournament_questions)
+        total_listed = sum(len(keys) for keys in tournament_keys.values())
+        logger.info(
+            f"Scheduling {len(unique_questions)} unique questions "
+            f"({total_listed - len(unique_questions)} cross-tournament duplicates) "
+            f"across {len(tournament_keys)} tournaments with {self.max_workers} workers"
+        )
+
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        for sequence, (key, question) in enumerate(unique_questions.items()):
+            queue.put_nowait((get_close_timestamp(question), sequence, key))
+
+        results: Dict[QuestionKey, ReportOrError] = {}
+        completion_order: List[QuestionKey] = []
+        start_time = time.time()
+
+        async def worker(worker_id: int) -> None:
+            while True:
+                try:
+                    _, _, key = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                question = unique_questions[key]
+                try:
+                    reports = await self.bot.forecast_questions([question], return_exceptions=True)
+                    if reports:
+                        results[key] = reports[0]
+                        completion_order.append(key)
+                except Exception as e:
+                    logger.error(f"Worker {worker_id} failed on {question.page_url}: {e}")
+                    results[key] = e
+                    completion_order.append(key)
+                finally:
+                    queue.task_done()
+                logger.info(
+                    f"Scheduler progress: {len(unique_questions) - queue.qsize()}/{len(unique_questions)} "
+                    f"dispatched, {len(results)} finished ({time.time() - start_time:.1f}s)"
+                )
+
+        await asyncio.gather(*[worker(i) for i in range(min(self.max_workers, len(unique_questions)))])
+
+        reports = [results[key] for key in completion_order]
+        reports_by_tournament = {
+            tournament: [results[key] for key in keys if key in results]
+            for tournament, keys in tournament_keys.items()
+        }
+        for tournament, tournament_reports in reports_by_tournament.items():
+            errors = len([r for r in tournament_reports if isinstance(r, BaseException)])
+            logger.info(f"{tournament}: {len(tournament_reports) - errors} reports, {errors} errors")
+        logger.info(f"Scheduler finished {len(reports)} questions in {time.time() - start_time:.1f}s")
+        return reports, reports_by_tournament
@@ -0,0 +1,300 @@
+"""
+Adaptive token-bucket rate limiting for LLM and search API calls.
+Keeps a requests-per-minute and tokens-per-minute budget per provider and per model,
+and adapts the request rate to what the provider actually allows: additive increase
+while calls succeed, multiplicative decrease (and a pause honouring Retry-After) on 429s.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: Any) -> int:
+    """
+    Rough token count for budgeting (about four characters per token).
+    """
+    return max(1, len(str(text or "")) // 4)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Whether an exception is a provider rate limit (HTTP 429) response.
+    """
+    if type(error).__name__ == "RateLimitError":
+        return True
+    for attribute in ("status_code", "status"):
+        if getattr(error, attribute, None) == 429:
+            return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "too many requests" in message
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Retry-After delay in seconds carried by a rate limit error, if any.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket for one provider or model with AIMD adaptation of its request rate.
+
+    The request bucket refills at the current rate and holds at most one minute of burst;
+    the token bucket does the same for tokens_per_minute. A rate limit response halves the
+    current rate (down to min_requests_per_minute) and blocks new calls until the provider's
+    Retry-After (or a default backoff) has passed. Each success adds additive_increase
+    requests per minute back, up to max_requests_per_minute.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = 60,
+        tokens_per_minute: Optional[float] = None,
+        min_requests_per_minute: float = 2,
+        max_requests_per_minute: Optional[float] = None,
+        additive_increase: float = 1,
+        decrease_factor: float = 0.5,
+        default_backoff: float = 10,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Provider or model this limiter guards
+            requests_per_minute: Starting request rate
+            tokens_per_minute: Token budget per minute (None = unlimited)
+            min_requests_per_minute: Floor for the adapted request rate
+            max_requests_per_minute: Ceiling for the adapted request rate (default: starting rate)
+            additive_increase: Requests per minute added back after each success
+            decrease_factor: Multiplier applied to the rate on a rate limit response
+            default_backoff: Pause in seconds after a 429 without Retry-After
+        """
+        self.name = name
+        self.requests_per_minute = float(requests_per_minute)
+        self.tokens_per_minute = float(tokens_per_minute) if tokens_per_minute else None
+        self.min_requests_per_minute = float(min_requests_per_minute)
+        self.max_requests_per_minute = float(max_requests_per_minute or requests_per_minute)
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+        self.default_backoff = default_backoff
+
+        now = time.monotonic()
+        self._request_tokens = 1.0
+        self._token_budget = self.tokens_per_minute or 0.0
+        self._last_refill = now
+        self._blocked_until = 0.0
+
+        self.waiting = 0
+        self.max_waiting = 0
+        self.acquired = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._request_tokens = min(
+            max(1.0, self.requests_per_minute),
+            self._request_tokens + elapsed * self.requests_per_minute / 60,
+        )
+        if self.tokens_per_minute:
+            self._token_budget = min(self.tokens_per_minute, self._token_budget + elapsed * self.tokens_per_minute / 60)
+
+    def _time_until_available(self, tokens: int, now: float) -> float:
+        self._refill(now)
+        delay = max(0.0, self._blocked_until - now)
+        if self._request_tokens < 1:
+            delay = max(delay, (1 - self._request_tokens) * 60 / self.requests_per_minute)
+        if self.tokens_per_minute:
+            # A single request larger than the whole budget only has to wait for a full bucket
+            needed = min(tokens, self.tokens_per_minute)
+            if self._token_budget < needed:
+                delay = max(delay, (needed - self._token_budget) * 60 / self.tokens_per_minute)
+        return delay
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until a request of the given size fits the budgets, then consume it.
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            while True:
+                now = time.monotonic()
+                delay = self._time_until_available(tokens, now)
+                if delay <= 0:
+                    self._request_tokens -= 1
+                    if self.tokens_per_minute:
+                        self._token_budget -= min(tokens, self.tokens_per_minute)
+                    break
+                await asyncio.sleep(delay)
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if waited > 1:
+            logger.info(f"Rate limiter {self.name}: waited {waited:.1f}s ({self.waiting} still queued, {self.requests_per_minute:.1f} rpm)")
+        return waited
+
+    def record_success(self) -> None:
+        self.requests_per_minute = min(self.max_requests_per_minute, self.requests_per_minute + self.additive_increase)
+
+    def record_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        self.rate_limited += 1
+        self.requests_per_minute = max(self.min_requests_per_minute, self.requests_per_minute * self.decrease_factor)
+        pause = retry_after if retry_after is not None else self.default_backoff
+        self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+        self._request_tokens = min(self._request_tokens, 0.0)
+        logger.warning(f"Rate limited by {self.name}: backing off {pause:.1f}s, rate now {self.requests_per_minute:.1f} rpm")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests_per_minute": round(self.requests_per_minute, 2),
+            "tokens_per_minute": self.tokens_per_minute,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "acquired": self.acquired,
+            "rate_limited": self.rate_limited,
+            "avg_wait": round(self.total_wait / self.acquired, 3) if self.acquired else 0.0,
+            "max_wait": round(self.max_wait, 3),
+        }
+
+
+class RateLimiterRegistry:
+    """
+    Shared per-provider and per-model limiters.
+
+    A call to "openrouter/deepseek/deepseek-chat" must fit both the "openrouter" provider
+    budget and the budget of that model. Limits come from the defaults passed in, with
+    optional per-provider overrides from RATE_LIMIT_RPM_<PROVIDER> / RATE_LIMIT_TPM_<PROVIDER>.
+    """
+
+    def __init__(
+        self,
+        provider_requests_per_minute: float = 60,
+        provider_tokens_per_minute: Optional[float] = None,
+        model_requests_per_minute: float = 20,
+        model_tokens_per_minute: Optional[float] = None,
+    ):
+        self.provider_requests_per_minute = provider_requests_per_minute
+        self.provider_tokens_per_minute = provider_tokens_per_minute
+        self.model_requests_per_minute = model_requests_per_minute
+        self.model_tokens_per_minute = model_tokens_per_minute
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
+
+    @staticmethod
+    def get_provider(model: str) -> str:
+        return model.split("/", 1)[0] if "/" in model else model
+
+    def _get_limiter(self, name: str, is_provider: bool) -> AdaptiveRateLimiter:
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            if is_provider:
+                env_suffix = name.upper().replace("-", "_").replace(".", "_")
+                rpm = float(os.getenv(f"RATE_LIMIT_RPM_{env_suffix}", self.provider_requests_per_minute))
+                tpm = os.getenv(f"RATE_LIMIT_TPM_{env_suffix}")
+                limiter = AdaptiveRateLimiter(name, rpm, float(tpm) if tpm else self.provider_tokens_per_minute)
+            else:
+                limiter = AdaptiveRateLimiter(name, self.model_requests_per_minute, self.model_tokens_per_minute)
+            self._limiters[name] = limiter
+        return limiter
+
+    def _limiters_for(self, model: str) -> List[AdaptiveRateLimiter]:
+        provider = self.get_provider(model)
+        limiters = [self._get_limiter(provider, is_provider=True)]
+        if provider != model:
+            limiters.append(self._get_limiter(model, is_provider=False))
+        return limiters
+
+    async def acquire(self, model: str, tokens: int = 0) -> float:
+        """
+        Wait for room in the provider and model budgets. Returns seconds waited.
+        """
+        waited = 0.0
+        for limiter in self._limiters_for(model):
+            waited += await limiter.acquire(tokens)
+        return waited
+
+    def record_success(self, model: str) -> None:
+        for limiter in self._limiters_for(model):
+            limiter.record_success()
+
+    def record_rate_limited(self, model: str, retry_after: Optional[float] = None) -> None:
+        """
+        A 429 backs off the model; it only throttles the whole provider when the model is the provider.
+        """
+        limiters = self._limiters_for(model)
+        limiters[-1].record_rate_limited(retry_after)
+
+    def record_error(self, model: str, error: BaseException) -> None:
+        if is_rate_limit_error(error):
+            self.record_rate_limited(model, get_retry_after(error))
+
+    @asynccontextmanager
+    async def limit(self, model: str, prompt: Any = "") -> AsyncIterator[float]:
+        """
+        Rate limit one call to model, adapting to its outcome:
+
+            async with get_rate_limiter().limit(model_name, prompt):
+                response = await llm.invoke(prompt)
+        """
+        waited = await self.acquire(model, estimate_tokens(prompt))
+        try:
+            yield waited
+        except Exception as e:
+            self.record_error(model, e)
+            raise
+        self.record_success(model)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limiter.get_stats() for name, limiter in self._limiters.items()}
+
+
+# Global instance shared by every caller in the process
+_rate_limiter_instance: Optional[RateLimiterRegistry] = None
+
+
+def get_rate_limiter() -> RateLimiterRegistry:
+    """
+    Get the global rate limiter registry.
+
+    Configured by RATE_LIMIT_PROVIDER_RPM (default 60), RATE_LIMIT_PROVIDER_TPM (default unlimited),
+    RATE_LIMIT_MODEL_RPM (default 20) and RATE_LIMIT_MODEL_TPM (default unlimited).
+    """
+    global _rate_limiter_instance
+    if _rate_limiter_instance is None:
+        provider_tpm = os.getenv('RATE_LIMIT_PROVIDER_TPM')
+        model_tpm = os.getenv('RATE_LIMIT_MODEL_TPM')
+        _rate_limiter_instance = RateLimiterRegistry(
+            provider_requests_per_minute=float(os.getenv('RATE_LIMIT_PROVIDER_RPM', '60')),
+            provider_tokens_per_minute=float(provider_tpm) if provider_tpm else None,
+            model_requests_per_minute=float(os.getenv('RATE_LIMIT_MODEL_RPM', '20')),
+            model_tokens_per_minute=float(model_tpm) if model_tpm else None,
+        )
+    return _rate_limiter_instance
@@ -0,0 +1,180 @@
+"""
+Persistent research store keyed by question.
+Keeps the research text and rated article list from earlier runs so scheduled re-forecasts of
+long-lived questions can reuse fresh research, refresh stale research incrementally, or
+rebuild it from scratch once it is too old.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from forecasting_tools import MetaculusQuestion
+
+from async_utils import LoopLocalSemaphore
+from question_inventory import get_question_key
+
+logger = logging.getLogger(__name__)
+
+
+class ResearchStore:
+    """
+    One JSON file per question holding its research text, the rated articles it was built
+    from and when it was created and last updated.
+
+    Freshness:
+        reuse: updated less than reuse_seconds ago, use the stored research as is
+        incremental: otherwise, while the last full build is younger than refresh_seconds,
+            search again but only rate and merge articles not seen before, re-summarizing
+            only if something new turned up
+        rebuild: last full build older than refresh_seconds (incremental refreshes do not
+            reset this), or the question text changed, run the full pipeline
+
+    The merged article list is capped at max_articles, keeping the most relevant.
+    """
+
+    REUSE = "reuse"
+    INCREMENTAL = "incremental"
+    REBUILD = "rebuild"
+
+    def __init__(
+        self,
+        store_dir: str = ".research_cache",
+        reuse_seconds: float = 2 * 60 * 60,
+        refresh_seconds: float = 24 * 60 * 60,
+        max_articles: int = 50,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            store_dir: Directory holding one JSON file per question
+            reuse_seconds: Age below which stored research is reused as is
+            refresh_seconds: Time since the last full build below which stored research is
+                refreshed incrementally rather than rebuilt
+            max_articles: Most rated articles kept per question
+        """
+        self.store_dir = store_dir
+        self.reuse_seconds = reuse_seconds
+        self.refresh_seconds = max(refresh_seconds, reuse_seconds)
+        self.max_articles = max_articles
+        self.counts = {self.REUSE: 0, self.INCREMENTAL: 0, self.REBUILD: 0}
+        self._lock = LoopLocalSemaphore(1)
+
+    @staticmethod
+    def _text_hash(question: MetaculusQuestion) -> str:
+        return hashlib.sha256((question.question_text or "").encode("utf-8")).hexdigest()
+
+    def _path_for(self, question: MetaculusQuestion) -> str:
+        digest = hashlib.sha256(str(get_question_key(question)).encode("utf-8")).hexdigest()
+        return os.path.join(self.store_dir, f"{digest}.json")
+
+    async def get(self, question: MetaculusQuestion) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored entry for this question, or None if there is none for its current text.
+        """
+        async with self._lock:
+            entry = await asyncio.to_thread(self._read_entry, self._path_for(question))
+        if entry is not None and entry.get("question_text_sha256") != self._text_hash(question):
+            logger.info(f"Question text changed since research was stored for {question.page_url}, ignoring it")
+            return None
+        return entry
+
+    def classify(self, entry: Optional[Dict[str, Any]]) -> str:
+        """
+        Decide whether stored research is reused, refreshed incrementally or rebuilt.
+        """
+        if entry is None:
+            decision = self.REBUILD
+        else:
+            now = time.time()
+            built_age = now - entry.get("created_at", entry.get("updated_at", 0))
+            updated_age = now - entry.get("updated_at", 0)
+            if built_age >= self.refresh_seconds:
+                decision = self.REBUILD
+            elif updated_age < self.reuse_seconds:
+                decision = self.REUSE
+            else:
+                decision = self.INCREMENTAL
+        self.counts[decision] += 1
+        return decision
+
+    async def put(
+        self,
+        question: MetaculusQuestion,
+        research: str,
+        articles: List[Dict[str, Any]],
+        previous: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Store research for a question.
+
+        Pass previous (the entry being refreshed) on incremental refreshes only: it keeps the
+        time of the last full build, so the entry is still rebuilt once that is too old.
+        Articles are trimmed to the max_articles most relevant.
+        """
+        now = time.time()
+        if len(articles) > self.max_articles:
+            articles = sorted(articles, key=lambda a: a.get('relevance_score', 3), reverse=True)[:self.max_articles]
+        entry = {
+            "question_key": str(get_question_key(question)),
+            "page_url": question.page_url,
+            "question_text_sha256": self._text_hash(question),
+            "research": research,
+            "articles": articles,
+            "created_at": previous.get("created_at", now) if previous else now,
+            "updated_at": now,
+        }
+        async with self._lock:
+            await asyncio.to_thread(self._write_entry, self._path_for(question), entry)
+
+    @staticmethod
+    def _read_entry(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable research store entry {path}: {e}")
+            return None
+
+    def _write_entry(self, path: str, entry: Dict[str, Any]) -> None:
+        os.makedirs(self.store_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, default=str)
+        os.replace(temp_path, path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"dir": self.store_dir, **self.counts}
+
+
+# Global instance configured from the environment
+_research_store_instance: Optional[ResearchStore] = None
+_research_store_configured = False
+
+
+def get_research_store() -> Optional[ResearchStore]:
+    """
+    Get the global research store, or None if RESEARCH_CACHE is set to false.
+
+    Configured by RESEARCH_CACHE_DIR (default .research_cache), RESEARCH_REUSE_HOURS
+    (default 2), RESEARCH_REFRESH_HOURS (default 24) and RESEARCH_MAX_ARTICLES (default 50).
+    """
+    global _research_store_instance, _research_store_configured
+    if not _research_store_configured:
+        _research_store_configured = True
+        if os.getenv('RESEARCH_CACHE', 'true').lower() == 'true':
+            _research_store_instance = ResearchStore(
+                store_dir=os.getenv('RESEARCH_CACHE_DIR', '.research_cache'),
+                reuse_seconds=float(os.getenv('RESEARCH_REUSE_HOURS', '2')) * 60 * 60,
+                refresh_seconds=float(os.getenv('RESEARCH_REFRESH_HOURS', '24')) * 60 * 60,
+                max_articles=int(os.getenv('RESEARCH_MAX_ARTICLES', '50')),
+            )
+            logger.info(f"Research store enabled: dir={_research_store_instance.store_dir}")
+    return _research_store_instance
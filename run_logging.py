@@ -0,0 +1,322 @@
+"""
+Structured, non-blocking run logging.
+Log calls only enqueue records (QueueHandler); a QueueListener thread writes them to the console
+and to a JSONL run log. Large bodies such as prompts, responses and reasoning are passed with the
+record instead of inside the message, and the listener stores them gzip-compressed in a
+content-addressed blob store, so the JSONL holds only their hash, length and a short preview.
+The markdown report is rendered from the JSONL after the run.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_STANDARD_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+def structured(event: str, bodies: Optional[Dict[str, Optional[str]]] = None, **fields: Any) -> Dict[str, Any]:
+    """
+    Build the `extra` for a structured log record.
+
+    Example:
+        logger.info(f"Model {name} succeeded", extra=structured("llm_response", {"response": text}, model=name))
+
+    Args:
+        event: Short machine-readable event name
+        bodies: Large texts (prompt, response, reasoning) to store as blobs instead of inline
+        **fields: Small JSON-serializable fields recorded inline
+    """
+    return {"event": event, "fields": fields, "bodies": {k: v for k, v in (bodies or {}).items() if v is not None}}
+
+
+def truncate(text: str, max_chars: int) -> str:
+    """
+    Cut text to max_chars, noting how much was dropped (max_chars <= 0 keeps everything).
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [truncated {len(text) - max_chars} chars]"
+
+
+class BlobStore:
+    """
+    Gzip-compressed, content-addressed text store.
+
+    Each text is written once to <blob_dir>/<hash[:2]>/<sha256>.txt.gz; storing the same text
+    again (a repeated prompt, a cached response) only returns its hash.
+    """
+
+    def __init__(self, blob_dir: str, compress_level: int = 6):
+        self.blob_dir = blob_dir
+        self.compress_level = compress_level
+        self._known: set = set()
+        self._lock = threading.Lock()
+        self.stats = {"stored": 0, "deduplicated": 0, "raw_bytes": 0, "stored_bytes": 0}
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.txt.gz")
+
+    def put(self, text: str) -> str:
+        """
+        Store text and return its SHA-256 hex digest.
+        """
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest in self._known or os.path.exists(self._path(digest)):
+                self._known.add(digest)
+                self.stats["deduplicated"] += 1
+                return digest
+            path = self._path(digest)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = gzip.compress(data, compresslevel=self.compress_level)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(temp_path, path)
+            self._known.add(digest)
+            self.stats["stored"] += 1
+            self.stats["raw_bytes"] += len(data)
+            self.stats["stored_bytes"] += len(compressed)
+        return digest
+
+    def get(self, digest: str) -> Optional[str]:
+        """
+        Read a stored text back, or None if it is not in the store.
+        """
+        try:
+            with gzip.open(self._path(digest), "rb") as f:
+                return f.read().decode("utf-8")
+        except FileNotFoundError:
+            return None
+
+
+class JsonlBlobHandler(logging.Handler):
+    """
+    Writes one JSON object per record; bodies go to the blob store and are referenced by hash.
+
+    Runs on the QueueListener thread, so hashing, compression and disk I/O stay off the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        blob_store: Optional[BlobStore],
+        max_message_chars: int = 2000,
+        preview_chars: int = 200,
+    ):
+        super().__init__()
+        self.path = path
+        self.blob_store = blob_store
+        self.max_message_chars = max_message_chars
+        self.preview_chars = preview_chars
+        self._file = open(path, "a", encoding="utf-8")
+
+    def to_entry(self, record: logging.LogRecord) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": truncate(record.getMessage(), self.max_message_chars),
+        }
+        if getattr(record, "event", None):
+            entry["event"] = record.event
+        fields = dict(getattr(record, "fields", None) or {})
+        # Plain `extra` keys are kept too, so existing extra= calls stay visible
+        fields.update({
+            key: value for key, value in vars(record).items()
+            if key not in _STANDARD_RECORD_ATTRS and key not in ("event", "fields", "bodies")
+        })
+        if fields:
+            entry["fields"] = fields
+        bodies = getattr(record, "bodies", None) or {}
+        if bodies:
+            entry["bodies"] = {}
+            for name, text in bodies.items():
+                text = str(text)
+                body: Dict[str, Any] = {"chars": len(text), "preview": truncate(text, self.preview_chars)}
+                if self.blob_store is not None:
+                    body["blob"] = self.blob_store.put(text)
+                entry["bodies"][name] = body
+        return entry
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._file.write(json.dumps(self.to_entry(record), default=str, ensure_ascii=False) + "\n")
+            self._file.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        try:
+            self._file.close()
+        finally:
+            super().close()
+
+
+class RunLogging:
+    """
+    The logging pipeline for one run: root QueueHandler -> QueueListener -> console + JSONL.
+    """
+
+    def __init__(
+        self,
+        jsonl_path: str,
+        blob_dir: Optional[str] = None,
+        level: int = logging.INFO,
+        max_message_chars: int = 2000,
+        preview_chars: int = 200,
+        console_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    ):
+        """
+        Args:
+            jsonl_path: Structured run log to append to
+            blob_dir: Blob store directory for bodies (None keeps only their previews)
+            level: Root logger level
+            max_message_chars: Messages longer than this are truncated in the JSONL (0 = never)
+            preview_chars: Length of the inline preview of each body
+            console_format: Format of the console output
+        """
+        self.jsonl_path = jsonl_path
+        self.blob_store = BlobStore(blob_dir) if blob_dir else None
+        self.level = level
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(console_format))
+        self.jsonl_handler = JsonlBlobHandler(jsonl_path, self.blob_store, max_message_chars, preview_chars)
+
+        self._queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        self.queue_handler = logging.handlers.QueueHandler(self._queue)
+        self.listener = logging.handlers.QueueListener(
+            self._queue, console_handler, self.jsonl_handler, respect_handler_level=True
+        )
+        self._previous_handlers: list = []
+        self._started = False
+        self._finished = False
+
+    def start(self) -> "RunLogging":
+        """
+        Route every record through the queue; replaces the root logger's handlers.
+        """
+        if self._started:
+            return self
+        root = logging.getLogger()
+        self._previous_handlers = root.handlers[:]
+        for handler in self._previous_handlers:
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+        root.setLevel(self.level)
+        self.listener.start()
+        self._started = True
+        return self
+
+    def stop(self) -> None:
+        """
+        Drain the queue, close the JSONL file and restore the previous root handlers.
+        """
+        if not self._started:
+            return
+        self.listener.stop()
+        self.jsonl_handler.close()
+        root = logging.getLogger()
+        root.removeHandler(self.queue_handler)
+        for handler in self._previous_handlers:
+            root.addHandler(handler)
+        self._started = False
+
+    def finish(self, markdown_path: str, full_bodies: Iterable[str] = ("reasoning", "research")) -> Optional[str]:
+        """
+        Stop the pipeline and render the markdown report from the JSONL run log.
+
+        Safe to call more than once (e.g. explicitly and again from atexit); only the first
+        call renders.
+        """
+        if self._finished:
+            return None
+        self._finished = True
+        self.stop()
+        try:
+            render_markdown_report(self.jsonl_path, markdown_path, self.blob_store, full_bodies)
+        except Exception as e:
+            logger.error(f"Failed to render markdown report {markdown_path}: {e}")
+            return None
+        if self.blob_store is not None:
+            logger.info(f"Log blob store stats: {self.blob_store.stats}")
+        print(f"📝 Rendered report {markdown_path} from {self.jsonl_path}")
+        return markdown_path
+
+
+def _iter_entries(jsonl_path: str):
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def render_markdown_report(
+    jsonl_path: str,
+    markdown_path: str,
+    blob_store: Optional[BlobStore] = None,
+    full_bodies: Iterable[str] = ("reasoning", "research"),
+) -> str:
+    """
+    Render the structured run log as the markdown report we used to write while running.
+
+    Args:
+        jsonl_path: Structured run log
+        markdown_path: Report to write
+        blob_store: Store to read bodies from; without it only previews are shown
+        full_bodies: Body names rendered in full (e.g. reasoning); the rest show their preview
+            and blob hash
+
+    Returns:
+        markdown_path
+    """
+    full_bodies = set(full_bodies)
+    with open(markdown_path, "w", encoding="utf-8") as out:
+        for entry in _iter_entries(jsonl_path):
+            out.write(f"## {entry.get('ts', '')}\n{entry.get('logger', '')} - {entry.get('level', '')}\n{entry.get('message', '')}\n")
+            for name, body in (entry.get("bodies") or {}).items():
+                text = None
+                if name in full_bodies and blob_store is not None and body.get("blob"):
+                    text = blob_store.get(body["blob"])
+                if text is not None:
+                    out.write(f"\n**{name}:**\n{text}\n")
+                else:
+                    reference = f", blob {body['blob'][:12]}" if body.get("blob") else ""
+                    out.write(f"\n**{name}** ({body.get('chars', 0)} chars{reference}): {body.get('preview', '')}\n")
+            out.write("\n---\n\n")
+    return markdown_path
+
+
+def setup_run_logging(outputs_dir: str, timestamp: str) -> RunLogging:
+    """
+    Start the run's logging pipeline under outputs_dir.
+
+    Configured by LOG_STORE_BODIES (default true), LOG_MAX_MESSAGE_CHARS (default 2000)
+    and LOG_PREVIEW_CHARS (default 200).
+    """
+    store_bodies = os.getenv('LOG_STORE_BODIES', 'true').lower() == 'true'
+    run_logging = RunLogging(
+        jsonl_path=os.path.join(outputs_dir, f"forecastlog_{timestamp}.jsonl"),
+        blob_dir=os.path.join(outputs_dir, "blobs") if store_bodies else None,
+        max_message_chars=int(os.getenv('LOG_MAX_MESSAGE_CHARS', '2000')),
+        preview_chars=int(os.getenv('LOG_PREVIEW_CHARS', '200')),
+    )
+    return run_logging.start()
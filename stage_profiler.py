@@ -0,0 +1,254 @@
+"""
+Stage-level profiler for the question pipeline.
+Stages are wrapped in spans (`async with profile_span("research"):`); spans nest through a
+context variable, so tasks started inside a span (parallel forecasters, concurrent searches)
+become its children. At the end of the run every question's spans are written as a waterfall
+JSON and as collapsed stacks ("question;research;retrieval 1234") for flame graph tools.
+"""
+
+import itertools
+import json
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Spans started outside any question span are grouped under this key
+RUN_KEY = "run"
+
+
+class Span:
+    """
+    One timed stage. Times are seconds since the profiler started.
+    """
+
+    def __init__(self, span_id: int, name: str, parent: Optional["Span"], question: Optional[str], attrs: Dict[str, Any], start: float):
+        self.span_id = span_id
+        self.name = name
+        self.parent_id = parent.span_id if parent else None
+        self.path: Tuple[str, ...] = (parent.path if parent else ()) + (name,)
+        self.question = question or (parent.question if parent else None) or RUN_KEY
+        self.attrs = attrs
+        self.start = start
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else self.start) - self.start
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('_current_span', default=None)
+
+
+def _question_key(question: Any) -> Optional[str]:
+    if question is None:
+        return None
+    if isinstance(question, str):
+        return question
+    return getattr(question, 'page_url', None) or str(getattr(question, 'id_of_question', None) or question)
+
+
+def _covered(intervals: List[Tuple[float, float]]) -> float:
+    """
+    Total length of the union of intervals (children may run concurrently).
+    """
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+class StageProfiler:
+    """
+    Collects finished spans for the run and renders the per-question reports.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.spans: List[Span] = []
+        self._origin = time.monotonic()
+        self._ids = itertools.count(1)
+
+    def _now(self) -> float:
+        return time.monotonic() - self._origin
+
+    def open(self, name: str, question: Any = None, attrs: Optional[Dict[str, Any]] = None) -> Span:
+        span = Span(next(self._ids), name, _current_span.get(), _question_key(question), attrs or {}, self._now())
+        self.spans.append(span)
+        return span
+
+    def close(self, span: Span, error: Optional[BaseException] = None) -> None:
+        span.end = self._now()
+        if error is not None:
+            span.error = type(error).__name__
+
+    def _self_times(self) -> Dict[int, float]:
+        """
+        Each span's duration minus the time covered by its children.
+        """
+        children: Dict[int, List[Tuple[float, float]]] = {}
+        for span in self.spans:
+            if span.parent_id is not None and span.end is not None:
+                children.setdefault(span.parent_id, []).append((span.start, span.end))
+        return {
+            span.span_id: max(0.0, span.duration - _covered(children.get(span.span_id, [])))
+            for span in self.spans if span.end is not None
+        }
+
+    def waterfall(self) -> Dict[str, Any]:
+        """
+        Per-question waterfall (span offsets relative to the question's first span) and per-stage totals.
+        """
+        self_times = self._self_times()
+        by_question: Dict[str, List[Span]] = {}
+        for span in self.spans:
+            if span.end is not None:
+                by_question.setdefault(span.question, []).append(span)
+
+        questions = []
+        for question, spans in by_question.items():
+            spans.sort(key=lambda s: s.start)
+            origin = spans[0].start
+            questions.append({
+                "question": question,
+                "start": round(origin, 3),
+                "duration": round(max(s.end for s in spans) - origin, 3),
+                "spans": [
+                    {
+                        "name": span.name,
+                        "path": ";".join(span.path),
+                        "depth": len(span.path) - 1,
+                        "start": round(span.start - origin, 3),
+                        "duration": round(span.duration, 3),
+                        "self": round(self_times[span.span_id], 3),
+                        **({"error": span.error} if span.error else {}),
+                        **({"attrs": span.attrs} if span.attrs else {}),
+                    }
+                    for span in spans
+                ],
+            })
+        questions.sort(key=lambda q: q["start"])
+
+        stages: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            if span.end is None:
+                continue
+            stats = stages.setdefault(span.name, {"count": 0, "total": 0.0, "max": 0.0, "errors": 0})
+            stats["count"] += 1
+            stats["total"] += span.duration
+            stats["max"] = max(stats["max"], span.duration)
+            stats["errors"] += span.error is not None
+        for stats in stages.values():
+            stats["mean"] = round(stats["total"] / stats["count"], 3)
+            stats["total"] = round(stats["total"], 3)
+            stats["max"] = round(stats["max"], 3)
+        return {"questions": questions, "stages": stages}
+
+    def collapsed_stacks(self) -> List[str]:
+        """
+        Self time per stack in milliseconds, summed over questions, in flame graph collapsed format.
+
+        Stacks are rooted at the outermost span (e.g. "question"), so identical stages of different
+        questions merge into one frame.
+        """
+        self_times = self._self_times()
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            if span.end is None:
+                continue
+            stack = ";".join(span.path)
+            totals[stack] = totals.get(stack, 0.0) + self_times[span.span_id]
+        return [f"{stack} {round(seconds * 1000)}" for stack, seconds in sorted(totals.items()) if round(seconds * 1000) > 0]
+
+    def write(self, json_path: str, collapsed_path: str) -> None:
+        """
+        Write the waterfall JSON and the collapsed-stack file.
+        """
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.waterfall(), f, indent=2)
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed_stacks()) + "\n")
+
+    def log_summary(self) -> None:
+        """
+        Log total, mean and max time per stage, slowest stages first.
+        """
+        stages = self.waterfall()["stages"]
+        for name, stats in sorted(stages.items(), key=lambda item: -item[1]["total"]):
+            logger.info(
+                f"Stage {name}: {stats['count']} spans, {stats['total']:.1f}s total, "
+                f"{stats['mean']:.1f}s mean, {stats['max']:.1f}s max, {stats['errors']} errors"
+            )
+
+
+class profile_span:
+    """
+    Time a pipeline stage as a child of the current span:
+
+        async with profile_span("research", question=question):
+            research = await self.run_research(question)
+
+    Also usable as a plain (sync) context manager. Pass question on the outermost span of a
+    question; nested spans inherit it.
+    """
+
+    def __init__(self, name: str, question: Any = None, **attrs: Any):
+        self.name = name
+        self.question = question
+        self.attrs = attrs
+        self._span: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self) -> Optional[Span]:
+        profiler = get_stage_profiler()
+        if profiler.enabled:
+            self._span = profiler.open(self.name, self.question, self.attrs)
+            self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._span is not None:
+            get_stage_profiler().close(self._span, exc)
+            _current_span.reset(self._token)
+
+    async def __aenter__(self) -> Optional[Span]:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+
+async def profile_call(name: str, awaitable: Awaitable[T], **attrs: Any) -> T:
+    """
+    Await awaitable inside a span, for one-line stages: `await profile_call("synthesis", llm.invoke(prompt))`.
+    """
+    async with profile_span(name, **attrs):
+        return await awaitable
+
+
+# Global instance for the run
+_stage_profiler_instance: Optional[StageProfiler] = None
+
+
+def get_stage_profiler() -> StageProfiler:
+    """
+    Get or create the global profiler (disabled with STAGE_PROFILER=false).
+    """
+    global _stage_profiler_instance
+    if _stage_profiler_instance is None:
+        _stage_profiler_instance = StageProfiler(enabled=os.getenv('STAGE_PROFILER', 'true').lower() == 'true')
+    return _stage_profiler_instance
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Offline test for ensemble aggregation (no API keys needed).
+"""
+import os
+import sys
+
+import numpy as np
+from forecasting_tools import NumericDistribution, NumericQuestion, Percentile, PredictedOption, PredictedOptionList
+
+from aggregation import (
+    aggregate_binary,
+    aggregate_multiple_choice,
+    aggregate_numeric,
+    get_ensemble_weights,
+    pool,
+)
+
+
+def make_question() -> NumericQuestion:
+    return NumericQuestion(
+        question_text="How many widgets will ship?",
+        id_of_post=1,
+        id_of_question=1,
+        upper_bound=100.0,
+        lower_bound=0.0,
+        open_upper_bound=True,
+        open_lower_bound=True,
+        zero_point=None,
+    )
+
+
+def make_distribution(question: NumericQuestion, values: list) -> NumericDistribution:
+    levels = [0.1, 0.2, 0.4, 0.6, 0.8, 0.9]
+    return NumericDistribution.from_question(
+        [Percentile(percentile=p, value=v) for p, v in zip(levels, values)], question
+    )
+
+
+def test_aggregation():
+    """Exercise every pooling method on binary, multiple choice and numeric ensembles."""
+    print("🧪 TESTING ENSEMBLE AGGREGATION")
+    print("=" * 40)
+
+    matrix = np.array([[0.1, 1.0], [0.2, 2.0], [0.3, 3.0], [0.9, 100.0]])
+    assert np.allclose(pool(matrix, "mean"), [0.375, 26.5])
+    assert np.allclose(pool(matrix, "median"), [0.2, 2.0])
+    assert np.allclose(pool(matrix, "trimmed_mean", trim_fraction=0.25), [0.25, 2.5])
+    assert np.allclose(pool(matrix, "mean", weights=[0, 0, 1, 1]), [0.6, 51.5])
+    assert np.allclose(pool(matrix, "median", weights=[0, 0, 0, 1]), [0.9, 100.0])
+    print("✅ Column-wise mean, median, trimmed mean and weights")
+
+    assert abs(aggregate_binary([0.2, 0.8], "mean") - 0.5) < 1e-9
+    assert abs(aggregate_binary([0.2, 0.8], "geometric_mean_odds") - 0.5) < 1e-9
+    assert aggregate_binary([0.9, 0.9, 0.5], "geometric_mean_odds") > aggregate_binary([0.9, 0.9, 0.5], "mean")
+    assert abs(aggregate_binary([0.1, 0.3, 0.9], "median") - 0.3) < 1e-9
+    print("✅ Binary pooling in probability and log-odds space")
+
+    options = ["Yes", "No", "Maybe later"]
+    predictions = [
+        {"Yes": 0.6, "No": 0.3, "Maybe later": 0.1},
+        {"yes": 0.2, "NO": 0.6, "maybe  later!": 0.2},
+        PredictedOptionList(predicted_options=[
+            PredictedOption(option_name="Yes", probability=0.4),
+            PredictedOption(option_name="No", probability=0.3),
+            PredictedOption(option_name="Maybe later", probability=0.3),
+        ]),
+    ]
+    for method in ("mean", "median", "trimmed_mean", "geometric_mean_odds"):
+        pooled = aggregate_multiple_choice(predictions, options, method)
+        assert set(pooled) == set(options) and abs(sum(pooled.values()) - 1) < 1e-9, (method, pooled)
+    mean = aggregate_multiple_choice(predictions, options, "mean")
+    assert abs(mean["Yes"] - 0.4) < 1e-9 and abs(mean["No"] - 0.4) < 1e-9
+    assert aggregate_multiple_choice([], options) == {option: 1 / 3 for option in options}
+    print("✅ Multiple choice matrix with name normalization and PredictedOptionList members")
+
+    question = make_question()
+    members = [
+        make_distribution(question, [10, 20, 30, 40, 50, 60]),
+        make_distribution(question, [20, 30, 40, 50, 60, 70]),
+    ]
+    pooled = aggregate_numeric(members, question, "mean", space="percentiles")
+    assert [p.value for p in pooled.declared_percentiles] == [15, 25, 35, 45, 55, 65]
+    pooled_cdf = aggregate_numeric(members, question, "mean", space="cdf")
+    values = [p.value for p in pooled_cdf.declared_percentiles]
+    assert values == sorted(values) and 10 < values[0] < 25 and 55 < values[-1] < 75, values
+    assert aggregate_numeric([], question).declared_percentiles[0].value == question.lower_bound
+    print("✅ Numeric pooling by percentile values and by CDF grid")
+
+    os.environ["ENSEMBLE_WEIGHTS"] = "forecaster1=3,forecaster2=bad"
+    assert list(get_ensemble_weights(["forecaster1", "forecaster2"])) == [3.0, 1.0]
+    del os.environ["ENSEMBLE_WEIGHTS"]
+    assert get_ensemble_weights(["forecaster1"]) is None
+    print("✅ Ensemble weights from the environment")
+
+    print("\n🎉 All aggregation tests passed")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_aggregation()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Offline test for the on-disk LLM response cache (no API keys needed).
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from fallback_llm import FallbackLLM
+from llm_cache import LLMCacheMiss, LLMResponseCache
+
+
+async def test_llm_cache():
+    """Exercise hits, misses, TTL expiry, LRU eviction and replay mode."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        print("🧪 TESTING LLM RESPONSE CACHE")
+        print("=" * 40)
+
+        cache = LLMResponseCache(cache_dir=cache_dir, ttl_seconds=3600)
+        assert await cache.get("model-a", 0.5, "What is 7 + 8?") is None
+        await cache.put("model-a", 0.5, "What is 7 + 8?", "15")
+        assert await cache.get("model-a", 0.5, "What is 7 + 8?") == "15"
+        # Different temperature or model is a different key
+        assert await cache.get("model-a", 0.3, "What is 7 + 8?") is None
+        assert await cache.get("model-b", 0.5, "What is 7 + 8?") is None
+        print(f"✅ Hit/miss: {cache.get_stats()}")
+
+        # A fresh instance picks up entries written by a previous run
+        reloaded = LLMResponseCache(cache_dir=cache_dir, ttl_seconds=3600)
+        assert await reloaded.get("model-a", 0.5, "What is 7 + 8?") == "15"
+        print("✅ Entries persist across cache instances")
+
+        expiring = LLMResponseCache(cache_dir=cache_dir, ttl_seconds=0.01)
+        await asyncio.sleep(0.05)
+        assert await expiring.get("model-a", 0.5, "What is 7 + 8?") is None
+        assert expiring.expired == 1
+        print("✅ Expired entries are misses")
+
+        replay = LLMResponseCache(cache_dir=cache_dir, ttl_seconds=0.01, mode="replay")
+        assert await replay.get("model-a", 0.5, "What is 7 + 8?") == "15"
+        await replay.put("model-a", 0.5, "new prompt", "ignored")
+        try:
+            await replay.get("model-a", 0.5, "new prompt")
+            raise AssertionError("replay mode should raise on a miss")
+        except LLMCacheMiss:
+            pass
+        print("✅ Replay mode ignores TTL, never writes and raises on a miss")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        small = LLMResponseCache(cache_dir=cache_dir, ttl_seconds=None, max_size_bytes=1500)
+        for i in range(5):
+            await small.put("model-a", 0.5, f"prompt {i}", "x" * 400)
+            time.sleep(0.01)
+        stats = small.get_stats()
+        assert stats["size_bytes"] <= 1500 and stats["evictions"] > 0
+        assert await small.get("model-a", 0.5, "prompt 0") is None
+        assert await small.get("model-a", 0.5, "prompt 4") is not None
+        print(f"✅ LRU eviction keeps the cache under its size cap: {stats}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        shared = LLMResponseCache(cache_dir=cache_dir)
+        await asyncio.gather(*[
+            shared.put("model-a", 0.5, f"prompt {i % 5}", f"response {i % 5}") for i in range(50)
+        ])
+        results = await asyncio.gather(*[shared.get("model-a", 0.5, f"prompt {i % 5}") for i in range(50)])
+        assert results == [f"response {i % 5}" for i in range(50)]
+        assert len(os.listdir(cache_dir)) > 0
+        print("✅ Concurrent access is consistent")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        shared = LLMResponseCache(cache_dir=cache_dir)
+        answers = {"forecaster1": "Probability: 30%", "forecaster2": "Probability: 45%"}
+        forecasters = []
+        for stage, answer in answers.items():
+            llm = FallbackLLM(["model-a"], api_key="test", stage=stage, cache=shared, hedged=False, streaming=False)
+
+            async def invoke_model(model_name, prompt, answer=answer):
+                return answer
+            llm._invoke_model = invoke_model
+            forecasters.append(llm)
+        assert [await llm.invoke("Will it rain?") for llm in forecasters] == list(answers.values())
+        assert [await llm.invoke("Will it rain?") for llm in forecasters] == list(answers.values())
+        assert shared.writes == 2 and shared.hits == 2
+        print("✅ Forecasters sharing a chain, temperature and prompt keep separate entries")
+
+    print("\n🎉 All LLM cache tests passed")
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_llm_cache())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Offline test for per-attempt LLM telemetry (no API keys needed).
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+import fallback_llm
+from fallback_llm import FallbackLLM
+from llm_telemetry import RATE_LIMITED, SERVER_ERROR, SUCCESS, TIMEOUT, classify_failure, get_llm_telemetry, llm_stage
+
+
+class FakeClient:
+    """Stands in for GeneralLlm: fails with the given error or answers after a delay."""
+
+    def __init__(self, error=None, delay=0.0):
+        self.error = error
+        self.delay = delay
+
+    async def invoke(self, prompt):
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return "Probability: 40%"
+
+
+class FakeStream:
+    """Async iterator of streamed chunks, the last one carrying provider usage."""
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def _chunks(self):
+        for piece in self.pieces:
+            await asyncio.sleep(0.01)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))], usage=None)
+        yield SimpleNamespace(choices=[], usage=SimpleNamespace(prompt_tokens=120, completion_tokens=7))
+
+    async def aclose(self):
+        pass
+
+
+async def test_llm_telemetry():
+    """Record attempts through FallbackLLM and check the summary and the written file."""
+    print("🧪 TESTING LLM TELEMETRY")
+    print("=" * 40)
+
+    class ServerError(Exception):
+        status_code = 503
+
+    assert classify_failure(asyncio.TimeoutError()) == TIMEOUT
+    assert classify_failure(ServerError("upstream down")) == SERVER_ERROR
+    assert classify_failure(Exception("429 Too Many Requests")) == RATE_LIMITED
+    print("✅ Failure classes")
+
+    telemetry = get_llm_telemetry()
+    llm = FallbackLLM(["model-a", "model-b"], api_key="test", stage="forecaster1", cache=None, hedged=False)
+    clients = {"model-a": FakeClient(error=ServerError("upstream down")), "model-b": FakeClient(delay=0.05)}
+    llm._get_client = lambda model_name: clients[model_name]
+    llm.cache = None
+    assert await llm.invoke("Will it rain tomorrow?") == "Probability: 40%"
+
+    failed, succeeded = telemetry.attempts[-2:]
+    assert (failed.model, failed.chain_index, failed.outcome) == ("model-a", 0, SERVER_ERROR)
+    assert (succeeded.model, succeeded.chain_index, succeeded.outcome) == ("model-b", 1, SUCCESS)
+    assert succeeded.stage == "forecaster1" and succeeded.latency >= 0.05 and succeeded.ttfb is None
+    assert succeeded.completion_tokens > 0 and succeeded.tokens_estimated
+    print("✅ One record per attempt with chain position, stage, outcome and latency")
+
+    default_llm = FallbackLLM(["model-d"], api_key="test", stage="default", cache=None, hedged=False)
+    default_llm._get_client = lambda model_name: FakeClient()
+    default_llm.cache = None
+    with llm_stage("research"):
+        await asyncio.gather(default_llm.invoke("Find news"), asyncio.create_task(default_llm.invoke("Rate articles")))
+    assert [a.stage for a in telemetry.attempts[-2:]] == ["research", "research"]
+    assert await default_llm.invoke("Summarize") and telemetry.attempts[-1].stage == "default"
+    print("✅ llm_stage overrides the LLM's own stage inside the block, including tasks started there")
+
+    async def fake_acompletion(**kwargs):
+        return FakeStream(["Probability", ": 35", "%"])
+
+    original_acompletion = fallback_llm.litellm.acompletion
+    fallback_llm.litellm.acompletion = fake_acompletion
+    try:
+        streaming_llm = FallbackLLM(["model-c"], api_key="test", stage="synthesizer", cache=None, streaming=True)
+        streaming_llm._get_client = lambda model_name: SimpleNamespace(
+            model_input_to_message=lambda prompt: [{"role": "user", "content": prompt}], litellm_kwargs={}
+        )
+        streaming_llm.cache = None
+        assert await streaming_llm.invoke_streaming("Synthesize") == "Probability: 35%"
+    finally:
+        fallback_llm.litellm.acompletion = original_acompletion
+    streamed = telemetry.attempts[-1]
+    assert streamed.streamed and 0 < streamed.ttfb <= streamed.latency
+    assert (streamed.prompt_tokens, streamed.completion_tokens, streamed.tokens_estimated) == (120, 7, False)
+    print("✅ Streamed attempts record time to first byte and provider token usage")
+
+    summary = telemetry.summary()
+    assert summary["by_stage"]["forecaster1"]["outcomes"] == {SERVER_ERROR: 1, SUCCESS: 1}
+    assert summary["by_stage"]["research"]["attempts"] == 2
+    assert summary["by_chain_index"]["1"]["attempts"] == 1
+    assert sum(summary["total"]["latency_histogram"].values()) == summary["total"]["outcomes"][SUCCESS]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = telemetry.write(os.path.join(tmp, "telemetry.json"))
+        with open(path, encoding="utf-8") as f:
+            written = json.load(f)
+    assert len(written["attempts"]) == len(telemetry.attempts)
+    assert written["summary"]["by_model"]["model-c"]["completion_tokens"] == 7
+    telemetry.log_summary()
+    print("✅ Per-model, per-stage and per-position histograms written as JSON")
+
+    print("\n🎉 All LLM telemetry tests passed")
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_llm_telemetry())
+    sys.exit(0 if success else 1)
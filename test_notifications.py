@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Offline test for background email notifications against a local SMTP stand-in (no credentials needed).
+"""
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+from notifications import EmailNotifier, Notifier
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: greeting, EHLO, MAIL, RCPT, DATA, NOOP, RSET, QUIT."""
+
+    def reply(self, line: str) -> None:
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 localhost fake smtp")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 localhost")
+            elif command.startswith(("MAIL", "RCPT", "NOOP", "RSET")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if data_line in (b".\r\n", b""):
+                        break
+                    data.append(data_line.decode())
+                if self.server.delay:
+                    time.sleep(self.server.delay)
+                self.server.messages.append("".join(data))
+                self.reply("250 Queued")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Not implemented")
+
+
+def start_server(delay: float = 0.0) -> socketserver.ThreadingTCPServer:
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeSMTPHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.messages = []
+    server.delay = delay
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_notifier(port: int, **kwargs) -> EmailNotifier:
+    return EmailNotifier(
+        "bot@example.com",
+        None,
+        "me@example.com",
+        smtp_server="127.0.0.1",
+        smtp_port=port,
+        use_starttls=False,
+        **kwargs,
+    )
+
+
+def test_notifications():
+    """Check non-blocking sends, batching, connection reuse and fast failure."""
+    print("🧪 TESTING BACKGROUND EMAIL NOTIFICATIONS")
+    print("=" * 40)
+
+    server = start_server(delay=0.3)
+    notifier = make_notifier(server.server_address[1], timeout=5)
+    start = time.monotonic()
+    assert notifier.notify("Bot starting", "Mode: test")
+    assert time.monotonic() - start < 0.1, "notify() blocked on SMTP"
+    assert notifier.flush(5) and len(server.messages) == 1
+    print("✅ notify() returns immediately; flush() waits for delivery")
+
+    notifier.notify("Bot completed", "Questions processed: 3")
+    notifier.flush(5)
+    assert len(server.messages) == 2 and server.connections == 1, (len(server.messages), server.connections)
+    notifier.close()
+    print("✅ One SMTP connection reused across messages")
+
+    server = start_server()
+    notifier = make_notifier(server.server_address[1], batch_window=0.3)
+    for i in range(3):
+        notifier.notify(f"Notice {i}", f"Body {i}")
+    notifier.flush(5)
+    assert len(server.messages) == 1 and notifier.stats["sent_messages"] == 1
+    assert "3 bot notifications" in server.messages[0] and "Body 2" in server.messages[0]
+    notifier.close()
+    print("✅ Notices within the batch window share one message")
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        closed_port = probe.getsockname()[1]
+    notifier = make_notifier(closed_port, timeout=1)
+    notifier.notify("Unreachable", "No server listening")
+    start = time.monotonic()
+    assert notifier.flush(5) and time.monotonic() - start < 3
+    assert notifier.stats["failed_messages"] == 1
+    notifier.close()
+    print("✅ Unreachable server fails fast without raising")
+
+    server = start_server()
+    channel = make_notifier(server.server_address[1])
+    facade = Notifier([channel, None])
+    assert facade.notify("Facade", "Through every channel", status="success", priority=2)
+    assert facade.flush(5) and len(server.messages) == 1
+    facade.close()
+    assert not channel.notify("Late", "After close")
+    print("✅ Notifier facade fans out, flushes and closes channels")
+
+    print("\n🎉 All notification tests passed")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_notifications()
+    sys.exit(0 if success else 1)
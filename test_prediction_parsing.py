@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Offline test for the local prediction parser (no API keys needed).
+"""
+import sys
+
+from forecasting_tools import BinaryPrediction, Percentile, PredictedOptionList
+
+from prediction_parsing import (
+    parse_binary_prediction,
+    parse_number,
+    parse_option_list,
+    parse_percentile_list,
+    parse_prediction,
+)
+
+
+def test_prediction_parsing():
+    """Exercise probabilities, option lists, percentiles and the ambiguity checks."""
+    print("🧪 TESTING LOCAL PREDICTION PARSING")
+    print("=" * 40)
+
+    parsed = parse_binary_prediction("Draft: Probability: 20%\n...\nProbability: 35%")
+    assert parsed.value.prediction_in_decimal == 0.35 and parsed.is_confident()
+    assert parse_binary_prediction("Probability: **0.27**").value.prediction_in_decimal == 0.27
+    assert not parse_binary_prediction("somewhere between 30% and 40%").is_confident()
+    assert parse_binary_prediction("no numbers here").value is None
+    print("✅ Binary probabilities")
+
+    options = ["Yes, before 2026", "No", "Other"]
+    parsed = parse_option_list("- **Yes, before 2026**: 45%\nOption No: 35%\nOther: 20%", options)
+    assert parsed.is_confident()
+    assert [round(o.probability, 2) for o in parsed.value.predicted_options] == [0.45, 0.35, 0.2]
+    assert parse_option_list("Yes, before 2026: 0.5\nNo: 0.3", options).value is None
+    assert not parse_option_list("Yes, before 2026: 0.7\nNo: 0.6\nOther: 0.5", options).is_confident()
+    print("✅ Multiple choice distributions")
+
+    assert parse_number("$3.5M") == 3.5e6
+    assert parse_number("1,250") == 1250
+    assert parse_number("-2.1 billion") == -2.1e9
+    assert parse_number("40k") == 40000
+    assert parse_number("5 months") == 5
+    assert parse_number("10 m") == 10 and parse_number("3 t") == 3 and parse_number("8 b") == 8
+    assert parse_number("2.5 Million") == 2.5e6 and parse_number("1.2 bn") == 1.2e9
+    metres = parse_percentile_list("\n".join(f"Percentile {p}: {p} m" for p in (10, 20, 40, 60, 80, 90)))
+    assert [p.value for p in metres.value] == [10, 20, 40, 60, 80, 90], metres.value
+    parsed = parse_percentile_list(
+        "10th percentile: 1,000\nPercentile 20: 2k\nPercentile 40: 3,500\n"
+        "Percentile 60: 4.2k\nPercentile 80: 6k\nPercentile 90 - 1M"
+    )
+    assert parsed.is_confident()
+    assert [p.value for p in parsed.value] == [1000, 2000, 3500, 4200, 6000, 1e6]
+    assert [p.percentile for p in parsed.value] == [0.1, 0.2, 0.4, 0.6, 0.8, 0.9]
+    decreasing = parse_percentile_list("\n".join(f"Percentile {p}: {100 - p}" for p in (10, 20, 40, 60, 80, 90)))
+    assert not decreasing.is_confident() and decreasing.value[0].value == 10
+    assert parse_percentile_list("Percentile 10: 5\nPercentile 20: 1").value is None
+    print("✅ Percentile lists with units, separators and suffixes")
+
+    assert parse_prediction("Probability: 3%", BinaryPrediction).is_confident()
+    assert parse_prediction("No: 100%", PredictedOptionList, ["No"]).is_confident()
+    percentiles = "\n".join(f"Percentile {p}: {p}" for p in (10, 20, 40, 60, 80, 90))
+    assert parse_prediction(percentiles, list[Percentile]).is_confident()
+    print("✅ Dispatch by structure_output type")
+
+    print("\n🎉 All prediction parsing tests passed")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_prediction_parsing()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Offline test for the structured run log, blob store and markdown report (no API keys needed).
+"""
+import json
+import logging
+import os
+import sys
+import tempfile
+
+from run_logging import RunLogging, structured
+
+
+def test_run_logging():
+    """Log through the queue pipeline, then check the JSONL, the blobs and the rendered report."""
+    print("🧪 TESTING STRUCTURED RUN LOGGING")
+    print("=" * 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = os.path.join(tmp, "run.jsonl")
+        report_path = os.path.join(tmp, "report.md")
+        run_logging = RunLogging(jsonl_path, os.path.join(tmp, "blobs"), max_message_chars=50, preview_chars=20)
+        previous_handlers = logging.getLogger().handlers[:]
+        run_logging.start()
+
+        log = logging.getLogger("test_run_logging")
+        prompt = "Forecast this question. " * 500
+        log.info("Invoking chain", extra=structured("llm_prompt", {"prompt": prompt}, model_chain=["a", "b"]))
+        log.info("Invoking chain again", extra=structured("llm_prompt", {"prompt": prompt}))
+        log.info("Reasoning from forecaster1", extra=structured("forecaster_reasoning", {"reasoning": "Base rates say 30%."}))
+        log.warning("x" * 500)
+        log.info("Plain extra", extra={"question_id": 42})
+
+        run_logging.finish(report_path)
+        assert logging.getLogger().handlers == previous_handlers
+        print("✅ Records drained and root handlers restored")
+
+        with open(jsonl_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        assert [e["message"][:14] for e in entries[:2]] == ["Invoking chain"] * 2
+        first = entries[0]
+        assert first["event"] == "llm_prompt" and first["fields"]["model_chain"] == ["a", "b"]
+        assert first["bodies"]["prompt"]["chars"] == len(prompt)
+        assert "Forecast this" in first["bodies"]["prompt"]["preview"] and len(first["bodies"]["prompt"]["preview"]) < 60
+        assert len(json.dumps(first)) < 600, "prompt body leaked into the JSONL"
+        assert entries[3]["message"].endswith("[truncated 450 chars]")
+        assert entries[4]["fields"] == {"question_id": 42}
+        print("✅ JSONL records carry fields, body references and truncated messages")
+
+        blob = first["bodies"]["prompt"]["blob"]
+        assert entries[1]["bodies"]["prompt"]["blob"] == blob
+        assert run_logging.blob_store.get(blob) == prompt
+        stats = run_logging.blob_store.stats
+        assert stats["stored"] == 2 and stats["deduplicated"] == 1 and stats["stored_bytes"] < stats["raw_bytes"] / 10
+        print("✅ Bodies stored once, compressed and content-addressed")
+
+        with open(report_path, encoding="utf-8") as f:
+            report = f.read()
+        assert report.count("\n---\n") == len(entries)
+        assert "**reasoning:**\nBase rates say 30%." in report
+        assert f"blob {blob[:12]}" in report and prompt not in report
+        print("✅ Markdown report rendered from the structured log")
+
+    print("\n🎉 All run logging tests passed")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_run_logging()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Offline test for the stage profiler's spans, waterfall and collapsed stacks (no API keys needed).
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+import stage_profiler
+from stage_profiler import StageProfiler, profile_call, profile_span
+
+
+async def fake_question(url: str) -> None:
+    async with profile_span("question", question=url):
+        async with profile_span("research"):
+            await profile_call("retrieval", asyncio.sleep(0.05))
+            await profile_call("summarization", asyncio.sleep(0.02))
+
+        async def forecaster(key: str, seconds: float) -> None:
+            async with profile_span(key):
+                await asyncio.sleep(seconds)
+
+        # Parallel forecasters overlap; their parent's self time must not go negative
+        await asyncio.gather(forecaster("forecaster1", 0.06), forecaster("forecaster2", 0.04))
+        await profile_call("synthesis", asyncio.sleep(0.02))
+        try:
+            with profile_span("parsing"):
+                raise ValueError("unparseable")
+        except ValueError:
+            pass
+
+
+async def test_stage_profiler():
+    """Profile two concurrent fake questions and check the reports."""
+    print("🧪 TESTING STAGE PROFILER")
+    print("=" * 40)
+
+    profiler = StageProfiler()
+    stage_profiler._stage_profiler_instance = profiler
+    await asyncio.gather(fake_question("q/1"), fake_question("q/2"))
+
+    waterfall = profiler.waterfall()
+    assert [q["question"] for q in waterfall["questions"]] == ["q/1", "q/2"]
+    spans = {s["path"]: s for s in waterfall["questions"][0]["spans"]}
+    assert set(spans) == {
+        "question", "question;research", "question;research;retrieval", "question;research;summarization",
+        "question;forecaster1", "question;forecaster2", "question;synthesis", "question;parsing",
+    }
+    assert spans["question"]["start"] == 0 and spans["question;research;retrieval"]["depth"] == 2
+    assert spans["question;forecaster1"]["start"] == spans["question;forecaster2"]["start"]
+    assert spans["question;parsing"]["error"] == "ValueError"
+    assert spans["question"]["duration"] >= 0.15 and spans["question"]["self"] < 0.02
+    assert spans["question;research"]["self"] < 0.01
+    print("✅ Spans nest across tasks and are attributed to their question")
+
+    stages = waterfall["stages"]
+    assert stages["forecaster1"]["count"] == 2 and stages["parsing"]["errors"] == 2
+    assert stages["retrieval"]["mean"] >= 0.05
+    print("✅ Per-stage totals")
+
+    stacks = dict(line.rsplit(" ", 1) for line in profiler.collapsed_stacks())
+    assert 90 <= int(stacks["question;research;retrieval"]) <= 150, stacks
+    assert "question;forecaster1" in stacks and all(int(ms) > 0 for ms in stacks.values())
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler.write(os.path.join(tmp, "profile.json"), os.path.join(tmp, "profile.collapsed"))
+        with open(os.path.join(tmp, "profile.json"), encoding="utf-8") as f:
+            assert len(json.load(f)["questions"]) == 2
+    print("✅ Collapsed stacks merge questions, weighted by self time in ms")
+
+    disabled = StageProfiler(enabled=False)
+    stage_profiler._stage_profiler_instance = disabled
+    async with profile_span("question", question="q/3"):
+        pass
+    assert disabled.spans == []
+    print("✅ Disabled profiler records nothing")
+
+    print("\n🎉 All stage profiler tests passed")
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_stage_profiler())
+    sys.exit(0 if success else 1)
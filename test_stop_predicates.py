@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Offline test for the scratchpad stop predicates used when streaming forecasts (no API keys needed).
+"""
+import sys
+
+from optimized_reasoning import all_percentiles_seen, final_probability_seen, option_probabilities_seen
+
+
+def test_stop_predicates():
+    """Stop only once the final step's answer is out, never at the initial estimate."""
+    print("🧪 TESTING STREAMING STOP PREDICATES")
+    print("=" * 40)
+
+    early = (
+        "1. The question asks whether...\n"
+        "4. Aggregating before the final prediction, the base rate dominates.\n"
+        "5. Initial probability: *0.40*\n"
+    )
+    assert not final_probability_seen(early)
+    assert not final_probability_seen(early + "6. Slightly overconfident; the final answer should be lower.\n")
+    assert final_probability_seen(early + "6. Slightly overconfident.\n7. Final prediction: *0.35*")
+    assert final_probability_seen(early + "**Step 6:** Slightly overconfident.\n**Step 7:** *0.35*")
+    print("✅ Binary: earlier mentions of the final prediction and the initial estimate don't stop the stream")
+
+    options = option_probabilities_seen(7)
+    relisted = "".join(f"{n}. Option {n}\n" for n in range(1, 8))
+    initial = "5. Initial: " + " ".join(["*0.14*"] * 7) + "\n"
+    assert not options("2. Reasons per option:\n" + relisted + initial)
+    assert not options("2. Options:\n" + relisted + initial + "6. Looks fine.\n7. Final: *0.2* *0.1*")
+    assert options("2. Options:\n" + relisted + initial + "6. Looks fine.\n7. Final: " + " ".join(["*0.14*"] * 7))
+    print("✅ Multiple choice: re-listed options 1-7 don't count as the final step")
+
+    numeric = "6. Aggregate.\n7. Initial percentiles: *10* *20* *30* *40* *50* *60*\n"
+    assert not all_percentiles_seen(numeric)
+    assert not all_percentiles_seen(numeric + "8. Widen.\n9. Final: *5* *15*")
+    assert all_percentiles_seen(numeric + "8. Widen.\n9. Final: *5* *15* *30* *45* *60* *80*")
+    print("✅ Numeric: only the step 9 percentiles stop the stream")
+
+    print("\n🎉 All stop predicate tests passed")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_stop_predicates()
+    sys.exit(0 if success else 1)